@@ -0,0 +1,396 @@
+# fixtures.py
+"""
+NHL API fixtures for the benchmarks.
+
+Fixtures are generated deterministically (same seed, same data) in the shape of
+the API's responses: /game/<id>/feed/live, /game/<id>/boxscore, /schedule,
+rosters (/teams/<id>/roster and /teams?expand=team.roster) and player stats. A league season of
+any size can be generated; the plays of a game follow the NHL's per-game event
+rates. Recorded responses can be used instead by saving them to a directory
+(see Fixtures.load):
+
+    feeds/<gamePk>.json[.gz]    full /feed/live responses
+    schedule.json[.gz]          a /schedule response
+
+Anything not recorded (box scores, rosters) is derived from the feeds and the
+schedule.
+
+    python benchmarks/fixtures.py --games 82 --out benchmarks/data
+"""
+import argparse
+import datetime
+import glob
+import gzip
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from nhl import registry  # noqa: E402
+
+SEASON = '20192020'
+
+# (eventTypeId, event, weight): roughly the average number of each per game
+PLAY_TYPES = [
+    ('FACEOFF', 'Faceoff', 60), ('SHOT', 'Shot', 60), ('MISSED_SHOT', 'Missed Shot', 26),
+    ('BLOCKED_SHOT', 'Blocked Shot', 28), ('GOAL', 'Goal', 6), ('HIT', 'Hit', 45),
+    ('GIVEAWAY', 'Giveaway', 18), ('TAKEAWAY', 'Takeaway', 14), ('PENALTY', 'Penalty', 8),
+    ('STOPPAGE', 'Stoppage', 80),
+]
+
+# role of the first (and second) player of each event; the first is of the
+# play's team, so as in the real feeds a blocked shot is the blocking team's
+ROLES = {'FACEOFF': ('Winner', 'Loser'), 'SHOT': ('Shooter', 'Goalie'),
+         'MISSED_SHOT': ('Shooter', None), 'BLOCKED_SHOT': ('Blocker', 'Shooter'),
+         'GOAL': ('Scorer', 'Goalie'), 'HIT': ('Hitter', 'Hittee'),
+         'GIVEAWAY': ('PlayerID', None), 'TAKEAWAY': ('PlayerID', None),
+         'PENALTY': ('PenaltyOn', 'DrewBy')}
+
+SHOT_TYPES = ['Wrist Shot', 'Slap Shot', 'Snap Shot', 'Backhand', 'Tip-In', 'Deflected',
+              'Wrap-around']
+PENALTIES = ['Tripping', 'Hooking', 'Slashing', 'Interference', 'Roughing', 'Holding']
+
+PLAYERS_PER_TEAM = 23
+
+
+def _team(team_id):
+    record = registry.get(team_id)
+    return {'id': record['id'], 'name': record['name'], 'link': f'/api/v1/teams/{team_id}',
+            'triCode': record['abbreviation']}
+
+
+def _player(team_id, k):
+    player_id = 8470000 + team_id * 100 + k
+    return {'id': player_id, 'fullName': f'Player {team_id}-{k}',
+            'link': f'/api/v1/people/{player_id}'}
+
+
+def _clock(seconds):
+    return f'{seconds // 60:02d}:{seconds % 60:02d}'
+
+
+def make_feed(game_id, home_id, away_id, date, n_plays=350, seed=0):
+    """
+    Returns a (final) /feed/live response with `n_plays` plays.
+    """
+    rnd = random.Random(seed)
+    home, away = _team(home_id), _team(away_id)
+    types = [t for t, _, _ in PLAY_TYPES]
+    names = {t: name for t, name, _ in PLAY_TYPES}
+    weights = [w for _, _, w in PLAY_TYPES]
+
+    plays = []
+    goals = {'home': 0, 'away': 0}
+    scoring, penalties = [], []
+    minutes = {'home': 0, 'away': 0}
+    for i in range(n_plays):
+        type_id = rnd.choices(types, weights)[0]
+        period = min(3, 1 + 3 * i // n_plays)
+        elapsed = (i * 3600 // n_plays) % 1200
+        play = {
+            'result': {'event': names[type_id], 'eventCode': f'X{i}', 'eventTypeId': type_id,
+                       'description': f'{names[type_id]} {i}'},
+            'about': {'eventIdx': i, 'eventId': i + 1, 'period': period, 'periodType': 'REGULAR',
+                      'ordinalNum': f'{period}', 'periodTime': _clock(elapsed),
+                      'periodTimeRemaining': _clock(1200 - elapsed),
+                      'dateTime': f'{date}T23:{i * 60 // n_plays:02d}:00Z',
+                      'goals': dict(goals)},
+            'coordinates': {},
+        }
+        if type_id == 'STOPPAGE':
+            plays.append(play)
+            continue
+
+        side = rnd.choice(['home', 'away'])
+        team, other = (home, away) if side == 'home' else (away, home)
+        play['team'] = team
+        x = float(rnd.randint(-99, 99))
+        play['coordinates'] = {'x': x, 'y': float(rnd.randint(-42, 42))}
+
+        first, second = ROLES[type_id]
+        players = [{'player': _player(team['id'], rnd.randrange(PLAYERS_PER_TEAM)),
+                    'playerType': first}]
+        if second is not None:
+            players.append({'player': _player(other['id'], rnd.randrange(PLAYERS_PER_TEAM)),
+                            'playerType': second})
+        play['players'] = players
+
+        if type_id in ('SHOT', 'MISSED_SHOT', 'BLOCKED_SHOT', 'GOAL'):
+            play['result']['secondaryType'] = rnd.choice(SHOT_TYPES)
+        if type_id == 'PENALTY':
+            play['result'].update({'secondaryType': rnd.choice(PENALTIES),
+                                   'penaltySeverity': 'Minor', 'penaltyMinutes': 2})
+            penalties.append(i)
+            minutes[side] += 2
+        if type_id == 'GOAL':
+            goals[side] += 1
+            play['about']['goals'] = dict(goals)
+            play['result'].update({'emptyNet': False, 'gameWinningGoal': False,
+                                   'strength': {'code': 'EVEN', 'name': 'Even Strength'}})
+            scoring.append(i)
+
+        plays.append(play)
+
+    # a few plays come without coordinates, as in the real feeds
+    for play in plays[::37]:
+        play.pop('coordinates', None)
+
+    def team_stats(side):
+        return {'goals': goals[side], 'pim': minutes[side], 'shots': rnd.randint(20, 40),
+                'powerPlayPercentage': '0.0', 'powerPlayGoals': 0.0,
+                'powerPlayOpportunities': float(rnd.randint(0, 5)),
+                'faceOffWinPercentage': str(round(rnd.uniform(40, 60), 1)),
+                'blocked': rnd.randint(5, 25), 'takeaways': rnd.randint(2, 12),
+                'giveaways': rnd.randint(2, 15), 'hits': rnd.randint(10, 40)}
+
+    boxscore = {'teams': {side: {'team': team, 'teamStats': {'teamSkaterStats': team_stats(side)}}
+                          for side, team in [('home', home), ('away', away)]}}
+
+    status = {'abstractGameState': 'Final', 'codedGameState': '7', 'detailedState': 'Final',
+              'statusCode': '7'}
+    return {
+        'gamePk': game_id,
+        'link': f'/api/v1/game/{game_id}/feed/live',
+        'metaData': {'wait': 10, 'timeStamp': date.replace('-', '') + '_230000'},
+        'gameData': {'game': {'pk': game_id, 'season': SEASON, 'type': 'R'},
+                     'datetime': {'dateTime': f'{date}T23:00:00Z'},
+                     'status': status, 'teams': {'home': home, 'away': away}},
+        'liveData': {
+            'plays': {'allPlays': plays, 'scoringPlays': scoring, 'penaltyPlays': penalties,
+                      'playsByPeriod': [], 'currentPlay': plays[-1]},
+            'linescore': {'currentPeriod': 3,
+                          'teams': {side: {'team': team, 'goals': goals[side]}
+                                    for side, team in [('home', home), ('away', away)]}},
+            'boxscore': boxscore,
+            'decisions': {},
+        },
+    }
+
+
+def make_schedule(team_ids, n_games, season=SEASON, seed=0):
+    """
+    Returns a /schedule response with `n_games` (final) games between
+    `team_ids`, every team playing at most once a day.
+    """
+    rnd = random.Random(seed)
+    start = datetime.date(int(season[:4]), 10, 2)
+
+    dates = []
+    k = 0
+    day = 0
+    while k < n_games:
+        teams = list(team_ids)
+        rnd.shuffle(teams)
+        games = []
+        for home, away in zip(teams[::2], teams[1::2]):
+            if k >= n_games:
+                break
+            game_id = int(season[:4]) * 1000000 + 20000 + k + 1
+            games.append({
+                'gamePk': game_id, 'link': f'/api/v1/game/{game_id}/feed/live',
+                'gameType': 'R', 'season': season,
+                'gameDate': f'{start + datetime.timedelta(days=day)}T23:00:00Z',
+                'status': {'abstractGameState': 'Final', 'codedGameState': '7',
+                           'detailedState': 'Final', 'statusCode': '7'},
+                'teams': {'home': {'team': _team(home), 'score': rnd.randint(0, 6)},
+                          'away': {'team': _team(away), 'score': rnd.randint(0, 6)}}})
+            k += 1
+        date = str(start + datetime.timedelta(days=day))
+        dates.append({'date': date, 'totalGames': len(games), 'games': games})
+        day += 1
+
+    return {'totalGames': n_games, 'dates': dates}
+
+
+def make_roster(team_id):
+    """
+    Returns the roster (list of entries, as in /teams/<id>/roster) of a team.
+    """
+    positions = ['C'] * 4 + ['L'] * 4 + ['R'] * 4 + ['D'] * 8 + ['G'] * 3
+    types = {'C': 'Forward', 'L': 'Forward', 'R': 'Forward', 'D': 'Defenseman', 'G': 'Goalie'}
+    return [{'person': _player(team_id, k), 'jerseyNumber': str(k + 2),
+             'position': {'code': code, 'name': code, 'type': types[code],
+                          'abbreviation': code}}
+            for k, code in enumerate(positions)]
+
+
+def make_player_stats(player_id, season=SEASON, report_type='statsSingleSeason'):
+    """
+    Returns a /people/<id>/stats response with one (season) split.
+    """
+    rnd = random.Random(player_id)
+    games = rnd.randint(10, 82)
+    goals, assists = rnd.randint(0, 40), rnd.randint(0, 50)
+    stat = {'games': games, 'goals': goals, 'assists': assists, 'points': goals + assists,
+            'shots': rnd.randint(goals, 300), 'hits': rnd.randint(0, 250),
+            'pim': 2 * rnd.randint(0, 40), 'plusMinus': rnd.randint(-30, 30),
+            'timeOnIce': f'{games * rnd.randint(8, 25)}:{rnd.randint(0, 59):02d}'}
+
+    return {'stats': [{'type': {'displayName': report_type},
+                       'splits': [{'season': season, 'stat': stat}]}]}
+
+
+class Fixtures:
+
+    def __init__(self, schedule, feeds, pool=None):
+        """
+        A league season's worth of API responses.
+
+        Parameters
+        ----------
+        schedule : dict
+            /schedule response.
+
+        feeds : dict
+            Maps gamePk to the game's /feed/live response. If `pool` is given,
+            games without a feed of their own reuse one of the pool's plays.
+
+        pool : list(dicts) (default : None)
+            Feeds whose plays are shared by the games not in `feeds`; keeps a
+            synthetic league season from holding a thousand distinct feeds in
+            memory.
+        """
+        self.schedule = schedule
+        self.games = [game for date in schedule['dates'] for game in date['games']]
+        self._by_id = {game['gamePk']: game for game in self.games}
+        self._feeds = feeds
+        self._pool = pool or []
+
+    @property
+    def game_ids(self):
+        return [game['gamePk'] for game in self.games]
+
+    @property
+    def team_ids(self):
+        return sorted({game['teams'][side]['team']['id'] for game in self.games
+                       for side in ['home', 'away']})
+
+    def feed(self, game_id):
+        """
+        Returns the /feed/live response of `game_id`.
+        """
+        game_id = int(game_id)
+        feed = self._feeds.get(game_id)
+        if feed is not None:
+            return feed
+
+        game = self._by_id[game_id]
+        base = self._pool[game_id % len(self._pool)]
+        teams = {side: game['teams'][side]['team'] for side in ['home', 'away']}
+        live = base['liveData']
+        boxscore = {'teams': {side: {**live['boxscore']['teams'][side], 'team': team}
+                              for side, team in teams.items()}}
+
+        return {**base, 'gamePk': game_id,
+                'gameData': {**base['gameData'], 'game': {**base['gameData']['game'], 'pk': game_id},
+                             'teams': teams},
+                'liveData': {**live, 'boxscore': boxscore}}
+
+    def boxscore(self, game_id):
+        """
+        Returns the /game/<id>/boxscore response of `game_id`.
+        """
+        return self.feed(game_id)['liveData']['boxscore']
+
+    def roster(self, team_id):
+        return make_roster(int(team_id))
+
+    def rosters(self):
+        """
+        Returns the /teams?expand=team.roster response.
+        """
+        return {'teams': [{**_team(team_id), 'roster': {'roster': make_roster(team_id)}}
+                          for team_id in self.team_ids]}
+
+    @classmethod
+    def generate(cls, n_games=1, n_teams=31, n_plays=350, pool=20, season=SEASON, seed=0):
+        """
+        Generates a season of `n_games` games between `n_teams` teams; only
+        `pool` distinct feeds are generated and shared by the games.
+        """
+        team_ids = [team['id'] for team in registry.teams(season=season)][:n_teams]
+        schedule = make_schedule(team_ids, n_games, season=season, seed=seed)
+        games = [game for date in schedule['dates'] for game in date['games']]
+
+        feeds = {}
+        for k, game in enumerate(games[:pool]):
+            date = game['gameDate'][:10]
+            feeds[game['gamePk']] = make_feed(game['gamePk'], game['teams']['home']['team']['id'],
+                                              game['teams']['away']['team']['id'], date,
+                                              n_plays=n_plays, seed=seed + k)
+
+        return cls(schedule, feeds, pool=list(feeds.values()))
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads recorded fixtures from directory `path` (see the module docstring).
+        """
+        feeds = {}
+        for file in sorted(glob.glob(os.path.join(path, 'feeds', '*.json*'))):
+            feed = _read_json(file)
+            feeds[int(feed['gamePk'])] = feed
+
+        schedule_file = next(iter(glob.glob(os.path.join(path, 'schedule.json*'))), None)
+        if schedule_file is not None:
+            schedule = _read_json(schedule_file)
+        else:
+            # a schedule of just the recorded games
+            dates = {}
+            for game_id, feed in feeds.items():
+                date = feed['gameData']['datetime']['dateTime'][:10]
+                teams = {side: {'team': feed['gameData']['teams'][side],
+                                'score': feed['liveData']['linescore']['teams'][side]['goals']}
+                         for side in ['home', 'away']}
+                dates.setdefault(date, []).append({
+                    'gamePk': game_id, 'gameType': feed['gameData']['game'].get('type', 'R'),
+                    'season': feed['gameData']['game'].get('season'),
+                    'gameDate': feed['gameData']['datetime']['dateTime'],
+                    'status': feed['gameData']['status'], 'teams': teams})
+            schedule = {'dates': [{'date': date, 'games': games}
+                                  for date, games in sorted(dates.items())]}
+
+        return cls(schedule, feeds, pool=list(feeds.values()))
+
+    def save(self, path, n_feeds=None):
+        """
+        Writes the schedule and (up to `n_feeds` of) the feeds to directory
+        `path`, gzipped, in the layout load reads.
+        """
+        os.makedirs(os.path.join(path, 'feeds'), exist_ok=True)
+        _write_json(os.path.join(path, 'schedule.json.gz'), self.schedule)
+        for game_id in self.game_ids[:n_feeds]:
+            _write_json(os.path.join(path, 'feeds', f'{game_id}.json.gz'), self.feed(game_id))
+
+
+def _read_json(file):
+    opener = gzip.open if file.endswith('.gz') else open
+    with opener(file, 'rt') as f:
+        return json.load(f)
+
+
+def _write_json(file, data):
+    with gzip.open(file + '.tmp', 'wt') as f:
+        json.dump(data, f)
+    os.replace(file + '.tmp', file)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Writes generated fixtures to a directory.')
+    parser.add_argument('--games', type=int, default=82)
+    parser.add_argument('--teams', type=int, default=31)
+    parser.add_argument('--plays', type=int, default=350)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', required=True)
+    args = parser.parse_args(argv)
+
+    fixtures = Fixtures.generate(args.games, n_teams=args.teams, n_plays=args.plays,
+                                 pool=args.games, seed=args.seed)
+    fixtures.save(args.out)
+    print(f'wrote {len(fixtures.game_ids)} games to {args.out}')
+
+
+if __name__ == '__main__':
+    main()
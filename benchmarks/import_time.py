@@ -0,0 +1,94 @@
+# import_time.py
+"""
+Import time regression check.
+
+Imports each module in a fresh interpreter (several times) and fails if the best
+cumulative import time, as reported by `python -X importtime`, exceeds its
+budget, or if the import pulls in any of the heavy dependencies that should
+only be loaded by the code paths that need them.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --runs 10 --budget nhl=20
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+
+# module -> budget (ms) for its cumulative import time
+BUDGETS = {
+    'nhl': 25,
+    'nhl.registry': 25,
+    'nhl.api': 60,
+}
+
+# modules importing `nhl` (or the light submodules above) must not load
+HEAVY = ['requests', 'numpy', 'pandas', 'pyarrow']
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)')
+
+
+def measure(module):
+    """
+    Imports `module` in a fresh interpreter; returns (cumulative import time in
+    ms, heavy modules that were loaded).
+    """
+    code = (f'import sys, {module}\n'
+            f'print(",".join(m for m in {HEAVY!r} if m in sys.modules))')
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', code],
+                            capture_output=True, text=True, cwd=ROOT, check=True)
+
+    cumulative = 0
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        # the top level module's line (the last one for it) has the total
+        if match and match.group(4) == module:
+            cumulative = int(match.group(2))
+    loaded = [m for m in result.stdout.strip().split(',') if m]
+
+    return cumulative / 1000, loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--runs', type=int, default=5,
+                        help='fresh interpreters per module; the best run counts')
+    parser.add_argument('--budget', action='append', default=[], metavar='MODULE=MS',
+                        help='override (or add) the budget of a module')
+    parser.add_argument('--json', action='store_true', help='print the results as json')
+    args = parser.parse_args(argv)
+
+    budgets = dict(BUDGETS)
+    for item in args.budget:
+        module, _, ms = item.partition('=')
+        budgets[module] = float(ms)
+
+    results = {}
+    failed = False
+    for module, budget in budgets.items():
+        runs = [measure(module) for _ in range(args.runs)]
+        best = min(ms for ms, _ in runs)
+        loaded = sorted(set(m for _, heavy in runs for m in heavy))
+        ok = best <= budget and not loaded
+        failed |= not ok
+        results[module] = {'best_ms': round(best, 2), 'budget_ms': budget,
+                           'heavy_modules': loaded, 'ok': ok}
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        for module, result in results.items():
+            status = 'ok' if result['ok'] else 'FAIL'
+            heavy = f"  (loads {', '.join(result['heavy_modules'])})" if result['heavy_modules'] else ''
+            print(f"{status:4}  {module:15} {result['best_ms']:8.2f} ms"
+                  f"  / {result['budget_ms']} ms{heavy}")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,276 @@
+# load.py
+"""
+Load generator for the NHL API client, against a local replay server.
+
+Serves a (generated or recorded, see fixtures.py) league season from an
+nhl.replay.ReplayServer, with the configured latency, jitter, server errors and
+rate limiting, and pulls the whole season through it over HTTP, the way a
+full refresh does: schedule, rosters, every game's feed and box score and every
+rostered player's stats (and, with --store, an ingestion into an EventStore).
+Reports the throughput of each stage, the latency percentiles and status codes
+of the responses and the number of retries the client made:
+
+    python benchmarks/load.py --games 1271 --concurrency 16 --latency 0.02
+    python benchmarks/load.py --error-rate 0.02 --throttle-rate 0.05 --retries 3
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+import requests
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fixtures import Fixtures, make_player_stats, make_roster  # noqa: E402
+from nhl import api  # noqa: E402
+from nhl.client import NhlClient  # noqa: E402
+from nhl.replay import ReplayServer  # noqa: E402
+
+PERCENTILES = [50, 90, 99]
+
+
+def _clear_caches():
+    # the in-memory schedule/roster/stats caches, so every pull reaches the
+    # server
+    from nhl import player
+
+    api._schedules.clear()
+    api._rosters.clear()
+    player._past_splits.clear()
+
+
+def _percentile(values, q):
+    # nearest rank percentile of sorted `values`
+    if not values:
+        return None
+    k = max(0, min(len(values) - 1, round(q / 100 * len(values)) - 1))
+
+    return values[k]
+
+
+def responses(fixtures, season):
+    """
+    Returns the recorded responses (see ReplayServer) of `fixtures`: their
+    schedule, every team's roster and every rostered player's stats.
+    """
+    recorded = {f'/schedule?season={season}': fixtures.schedule}
+    for team_id in fixtures.team_ids:
+        roster = make_roster(team_id)
+        recorded[f'/teams/{team_id}/roster'] = {'roster': roster}
+        for entry in roster:
+            player_id = entry['person']['id']
+            recorded[f'/people/{player_id}/stats'] = make_player_stats(player_id, season)
+
+    return recorded
+
+
+# every stage takes (client, fixtures, season, args) and returns (items,
+# failed items)
+
+def schedule(client, fixtures, season, args):
+    try:
+        index = api.getLeagueSchedule(season, client=client, refresh=True)
+    except requests.RequestException:
+        return len(fixtures.game_ids), len(fixtures.game_ids)
+
+    return len(fixtures.game_ids), len(fixtures.game_ids) - len(index)
+
+
+def rosters(client, fixtures, season, args):
+    try:
+        rosters = api.getLeagueRosters(season, client=client, refresh=True)
+    except requests.RequestException:
+        return len(fixtures.team_ids), len(fixtures.team_ids)
+
+    # only the fixtures' teams are recorded; the league has more
+    return (len(fixtures.team_ids),
+            sum(not rosters.get(team_id) for team_id in fixtures.team_ids))
+
+
+def feeds(client, fixtures, season, args):
+    n = failed = 0
+    for _, live_data in api.iter_live_data_many(fixtures.game_ids, concurrency=args.concurrency,
+                                                client=client, return_exceptions=True):
+        n += 1
+        failed += isinstance(live_data, Exception)
+
+    return n, failed
+
+
+def boxscores(client, fixtures, season, args):
+    endpoints = [f'/game/{game_id}/boxscore' for game_id in fixtures.game_ids]
+    n = failed = 0
+    for _, data in api.iter_json_many(endpoints, concurrency=args.concurrency, client=client,
+                                      return_exceptions=True):
+        n += 1
+        failed += isinstance(data, Exception) or 'teams' not in data
+
+    return n, failed
+
+
+def player_stats(client, fixtures, season, args):
+    from nhl.player import get_player_stats_many
+
+    player_ids = [entry['person']['id'] for team_id in fixtures.team_ids
+                  for entry in make_roster(team_id)]
+    stats = get_player_stats_many(player_ids, seasons=[season], concurrency=args.concurrency,
+                                  client=client, errors='ignore')
+    found = stats['statsSingleSeason']
+    found = found['player_id'].nunique() if len(found) else 0
+
+    return len(player_ids), len(player_ids) - found
+
+
+def ingest(client, fixtures, season, args):
+    from nhl.ingest import ingest_season
+    from nhl.store import EventStore
+
+    with tempfile.TemporaryDirectory(dir=args.store) as root:
+        summary = ingest_season(EventStore(root), season, concurrency=args.concurrency,
+                                client=client)
+
+    return len(fixtures.game_ids), len(summary['failed'])
+
+
+STAGES = {
+    'schedule': schedule,
+    'rosters': rosters,
+    'feeds': feeds,
+    'boxscores': boxscores,
+    'player_stats': player_stats,
+    'ingest': ingest,
+}
+
+
+class Recorder:
+
+    def __init__(self):
+        """
+        Records the latency and status of every response a session receives
+        (as a response hook).
+        """
+        self.latencies = []
+        self.statuses = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, response, *args, **kwargs):
+        with self._lock:
+            self.latencies.append(response.elapsed.total_seconds())
+            self.statuses[response.status_code] = self.statuses.get(response.status_code, 0) + 1
+
+    def summary(self):
+        latencies = sorted(self.latencies)
+        ms = {f'p{q}': 1000 * _percentile(latencies, q) for q in PERCENTILES if latencies}
+        if latencies:
+            ms['mean'] = 1000 * sum(latencies) / len(latencies)
+            ms['max'] = 1000 * latencies[-1]
+
+        return {'responses': len(latencies), 'latency_ms': ms,
+                'statuses': {str(status): n for status, n in sorted(self.statuses.items())}}
+
+
+def run(fixtures, args):
+    """
+    Pulls the season of `fixtures` through a replay server; returns the results.
+    """
+    season = str(fixtures.games[0]['season'])
+    feeds = [fixtures.feed(game_id) for game_id in fixtures.game_ids]
+    server = ReplayServer(feeds, live=False, responses=responses(fixtures, season),
+                          latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                          throttle_rate=args.throttle_rate, retry_after=args.retry_after,
+                          seed=args.seed)
+
+    stages = args.only or [stage for stage in STAGES if stage != 'ingest' or args.store]
+    results = {'games': len(fixtures.game_ids), 'season': season,
+               'concurrency': args.concurrency, 'retries': args.retries,
+               'server': {'latency': args.latency, 'jitter': args.jitter,
+                          'error_rate': args.error_rate, 'throttle_rate': args.throttle_rate},
+               'stages': {}}
+
+    recorder = Recorder()
+    with server:
+        client = NhlClient(base_url=server.base_url, pool_size=args.concurrency,
+                           retries=args.retries, backoff=args.backoff)
+        client.session.hooks['response'].append(recorder)
+        _clear_caches()
+
+        start = time.perf_counter()
+        for name in stages:
+            sent = client.requests
+            stage_start = time.perf_counter()
+            items, failed = STAGES[name](client, fixtures, season, args)
+            seconds = time.perf_counter() - stage_start
+            n = client.requests - sent
+            results['stages'][name] = {'seconds': seconds, 'items': items, 'failed': failed,
+                                       'requests': n, 'requests_per_s': n / seconds}
+            print(f'{name:14} {seconds:8.2f} s  {n:6d} requests  {n / seconds:8.1f} req/s'
+                  f'  {failed} of {items} failed', file=sys.stderr)
+        seconds = time.perf_counter() - start
+        client.close()
+
+    results['total'] = {'seconds': seconds, 'requests': client.requests,
+                        'requests_per_s': client.requests / seconds,
+                        'retries': client.retried, **recorder.summary()}
+    results['server']['requests'] = server.requests
+    results['server']['faults'] = {str(status): n for status, n in sorted(server.faults.items())}
+
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--games', type=int, default=1271, help='games in the season')
+    parser.add_argument('--teams', type=int, default=31)
+    parser.add_argument('--plays', type=int, default=350, help='plays per generated game')
+    parser.add_argument('--fixtures', help='directory of recorded fixtures (see fixtures.py)')
+    parser.add_argument('--only', nargs='+', choices=list(STAGES), help='stages to run')
+    parser.add_argument('--store', help='directory to ingest into (a temporary subdirectory, '
+                                        'removed afterwards); enables the ingest stage')
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--retries', type=int, default=3, help='retries per request')
+    parser.add_argument('--backoff', type=float, default=0.1, help='first retry delay (s)')
+    parser.add_argument('--latency', type=float, default=0.0, help='server latency (s)')
+    parser.add_argument('--jitter', type=float, default=0.0, help='server latency jitter (s)')
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help='fraction of requests failing with a 5xx')
+    parser.add_argument('--throttle-rate', type=float, default=0.0,
+                        help='fraction of requests answered with a 429')
+    parser.add_argument('--retry-after', type=float, default=0.1,
+                        help='Retry-After (s) of the 429 responses')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', help='file to write the json results to (default: stdout)')
+    args = parser.parse_args(argv)
+
+    if args.fixtures:
+        fixtures = Fixtures.load(args.fixtures)
+    else:
+        fixtures = Fixtures.generate(args.games, n_teams=args.teams, n_plays=args.plays,
+                                     seed=args.seed)
+
+    results = run(fixtures, args)
+
+    total = results['total']
+    latency = total['latency_ms']
+    print(f"total          {total['seconds']:8.2f} s  {total['requests']:6d} requests"
+          f"  {total['requests_per_s']:8.1f} req/s  {total['retries']} retries", file=sys.stderr)
+    if latency:
+        print('latency (ms)   ' + '  '.join(f'{name} {value:.1f}' for name, value in latency.items()),
+              file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    else:
+        print(output)
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,286 @@
+# run.py
+"""
+Benchmarks of the parse and time series paths, fully offline.
+
+Every benchmark runs over generated (or recorded, see fixtures.py) NHL API
+fixtures, with requests served by a mocked transport (see transport.py). Each
+is timed over several repeats, and its peak memory (Python allocations) is
+measured in a separate, traced run. Results are written as json, and can be
+compared against an earlier run (e.g. from another commit):
+
+    python benchmarks/run.py --scale team --output before.json
+    ... change things ...
+    python benchmarks/run.py --scale team --compare before.json
+
+Scales: 'game' (a single game), 'team' (82 games, one team's season worth) and
+'league' (a full league season); --games overrides the number of games.
+"""
+import argparse
+import datetime
+import glob
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from fixtures import Fixtures  # noqa: E402
+from transport import mock_client  # noqa: E402
+
+SCALES = {'game': 1, 'team': 82, 'league': 1271}
+
+BY_TEAM = os.path.join(ROOT, 'data', 'by_team')
+
+
+def _clear_caches():
+    # the in-memory league schedule/series/box score caches, so every run
+    # starts cold
+    from nhl import api
+    from nhl.analysis import time_series
+
+    api._schedules.clear()
+    time_series._league_series.clear()
+    time_series._league_box_scores.clear()
+
+
+# every benchmark takes (fixtures, args) and returns (run, n): a callable doing
+# the work once, and the number of items (games, teams, files) it covers
+
+def game_init(fixtures, args):
+    from nhl.game import Game
+
+    feeds = [(game_id, fixtures.feed(game_id)['liveData']) for game_id in fixtures.game_ids]
+
+    def run():
+        for game_id, live_data in feeds:
+            # the summary is parsed lazily; force it, as the old __init__ did
+            game = Game(game_id, live_data=live_data)
+            game.home, game.winner, game.date
+
+    return run, len(feeds)
+
+
+def game_shot_data(fixtures, args):
+    from nhl.game import Game
+
+    feeds = [(game_id, fixtures.feed(game_id)['liveData']) for game_id in fixtures.game_ids]
+
+    def run():
+        for game_id, live_data in feeds:
+            Game(game_id, live_data=live_data).shotData()
+
+    return run, len(feeds)
+
+
+def game_make_data_frames(fixtures, args):
+    from nhl.game import Game
+
+    feeds = [(game_id, fixtures.feed(game_id)['liveData']) for game_id in fixtures.game_ids]
+
+    def run():
+        for game_id, live_data in feeds:
+            Game(game_id, live_data=live_data).makeDataFrames()
+
+    return run, len(feeds)
+
+
+def game_tables(fixtures, args):
+    from nhl.game import Game
+
+    feeds = [(game_id, fixtures.feed(game_id)['liveData']) for game_id in fixtures.game_ids]
+
+    def run():
+        for game_id, live_data in feeds:
+            game = Game(game_id, live_data=live_data)
+            game.shot_data, game.hit_data, game.penalty_data, game.turnover_data
+            game.agg_stats
+
+    return run, len(feeds)
+
+
+def team_box_scores(fixtures, args):
+    from nhl.analysis.time_series import getTeamBoxScores
+
+    client = mock_client(fixtures)
+    team_id = fixtures.team_ids[0]
+    season = fixtures.games[0]['season']
+
+    def run():
+        _clear_caches()
+        getTeamBoxScores(team_id, season=season, client=client, concurrency=args.concurrency)
+
+    return run, len(fixtures.game_ids)
+
+
+def team_time_series(fixtures, args):
+    from nhl.analysis.time_series import goalDiff, goalsAgainst, goalsFor
+
+    client = mock_client(fixtures)
+    season = fixtures.games[0]['season']
+
+    def run():
+        _clear_caches()
+        for team_id in fixtures.team_ids:
+            goalsFor(team_id, season=season, client=client, cumulative=True)
+            goalsAgainst(team_id, season=season, client=client, average=True)
+            goalDiff(team_id, season=season, client=client, window=10)
+
+    return run, len(fixtures.team_ids)
+
+
+def csv_by_team(fixtures, args):
+    from nhl import schema
+
+    teams = sorted(os.listdir(BY_TEAM)) if os.path.isdir(BY_TEAM) else []
+    # one team's tables, except for a league season
+    teams = teams if len(fixtures.game_ids) >= SCALES['league'] else teams[:1]
+    files = [file for team in teams for file in sorted(glob.glob(os.path.join(BY_TEAM, team, '*.csv')))]
+    if not files:
+        return None, 0
+
+    def run():
+        for file in files:
+            schema.read_legacy_csv(file)
+
+    return run, len(files)
+
+
+BENCHMARKS = {
+    'game_init': game_init,
+    'game_shot_data': game_shot_data,
+    'game_make_data_frames': game_make_data_frames,
+    'game_tables': game_tables,
+    'team_box_scores': team_box_scores,
+    'team_time_series': team_time_series,
+    'csv_by_team': csv_by_team,
+}
+
+
+def measure(run, repeat, memory=True):
+    """
+    Runs `run` (once to warm up, then `repeat` times); returns the timings and,
+    if `memory`, the peak traced memory of one more run.
+    """
+    run()
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - start)
+
+    result = {'min_s': min(times), 'median_s': statistics.median(times), 'times_s': times}
+
+    if memory:
+        tracemalloc.start()
+        try:
+            run()
+            result['peak_mb'] = tracemalloc.get_traced_memory()[1] / 2 ** 20
+        finally:
+            tracemalloc.stop()
+
+    return result
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results, baseline, threshold):
+    """
+    Prints the change of every benchmark's median time against `baseline`;
+    returns the names of those slower by more than `threshold` (a ratio).
+    """
+    if baseline.get('games') != results['games']:
+        raise SystemExit(f"can't compare runs over {baseline.get('games')} and "
+                         f"{results['games']} games; use the same --scale/--games")
+
+    regressions = []
+    print(f"{'benchmark':24} {'before':>10} {'after':>10} {'ratio':>7}")
+    for name, result in results['benchmarks'].items():
+        before = baseline['benchmarks'].get(name)
+        if before is None:
+            continue
+        ratio = result['median_s'] / before['median_s'] if before['median_s'] else float('inf')
+        flag = ''
+        if ratio > threshold:
+            regressions.append(name)
+            flag = '  REGRESSION'
+        print(f"{name:24} {before['median_s']:10.4f} {result['median_s']:10.4f} {ratio:7.2f}{flag}")
+
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--scale', choices=list(SCALES), default='team')
+    parser.add_argument('--games', type=int, help='number of games (overrides --scale)')
+    parser.add_argument('--plays', type=int, default=350, help='plays per generated game')
+    parser.add_argument('--fixtures', help='directory of recorded fixtures (see fixtures.py)')
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS), help='benchmarks to run')
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--no-memory', action='store_true', help='skip the memory runs')
+    parser.add_argument('--output', help='file to write the json results to (default: stdout)')
+    parser.add_argument('--compare', help='json results of an earlier run to compare against')
+    parser.add_argument('--threshold', type=float, default=1.25,
+                        help='slowdown ratio counted as a regression (default: 1.25)')
+    args = parser.parse_args(argv)
+
+    if args.fixtures:
+        fixtures = Fixtures.load(args.fixtures)
+    else:
+        n_games = args.games or SCALES[args.scale]
+        fixtures = Fixtures.generate(n_games, n_plays=args.plays)
+
+    results = {
+        'commit': _commit(),
+        'date': datetime.datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'games': len(fixtures.game_ids),
+        'teams': len(fixtures.team_ids),
+        'repeat': args.repeat,
+        'benchmarks': {},
+    }
+
+    for name in args.only or BENCHMARKS:
+        run, n = BENCHMARKS[name](fixtures, args)
+        if run is None:
+            print(f'skipping {name}: nothing to run', file=sys.stderr)
+            continue
+        result = measure(run, args.repeat, memory=not args.no_memory)
+        result['items'] = n
+        result['per_item_ms'] = 1000 * result['median_s'] / max(n, 1)
+        results['benchmarks'][name] = result
+        print(f"{name:24} {result['median_s']:9.4f} s  ({result['per_item_ms']:.2f} ms x {n})"
+              + (f"  peak {result['peak_mb']:.1f} MB" if 'peak_mb' in result else ''),
+              file=sys.stderr)
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+    elif not args.compare:
+        print(output)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+# transport.py
+"""
+Mocked transport serving benchmark fixtures.
+
+FixtureAdapter is a requests transport adapter answering NHL API requests from a
+fixtures.Fixtures object, without any network; mounting it on the session of
+an NhlClient exercises the whole client (url building, caching, json decoding)
+but nothing outside of the process:
+
+    client = mock_client(Fixtures.generate(82))
+    getTeamBoxScores(10, season='20192020', client=client)
+"""
+import json
+import re
+import threading
+from urllib.parse import parse_qs, urlsplit
+
+import requests
+from requests.adapters import BaseAdapter
+from requests.models import Response
+
+from nhl.client import NhlClient
+
+BASE_URL = 'http://fixtures/api/v1'
+
+
+class FixtureAdapter(BaseAdapter):
+
+    def __init__(self, fixtures, latency=0.0):
+        """
+        Transport adapter answering requests from `fixtures`.
+
+        Parameters
+        ----------
+        fixtures : fixtures.Fixtures
+
+        latency : float (default : 0.0)
+            Seconds to wait before each response (e.g. to model the network).
+
+        Attributes
+        ----------
+        requests : dict
+            Number of requests served per route.
+        """
+        super().__init__()
+        self.fixtures = fixtures
+        self.latency = latency
+        self.requests = {}
+        self._lock = threading.Lock()
+
+        self.routes = [
+            ('feed', re.compile(r'/game/(\d+)/feed/live'), lambda m, q: fixtures.feed(m.group(1))),
+            ('boxscore', re.compile(r'/game/(\d+)/boxscore'),
+             lambda m, q: fixtures.boxscore(m.group(1))),
+            ('schedule', re.compile(r'/schedule'), lambda m, q: fixtures.schedule),
+            ('roster', re.compile(r'/teams/(\d+)/roster'),
+             lambda m, q: {'roster': fixtures.roster(m.group(1))}),
+            ('rosters', re.compile(r'/teams'), lambda m, q: fixtures.rosters()),
+            ('season', re.compile(r'/seasons/current'),
+             lambda m, q: {'seasons': [{'seasonId': fixtures.games[0]['season']}]}),
+        ]
+
+    def send(self, request, **kwargs):
+        if self.latency:
+            threading.Event().wait(self.latency)
+
+        url = urlsplit(request.url)
+        path = url.path[len(urlsplit(BASE_URL).path):]
+        status, body = 404, {'message': 'Object not found'}
+        for name, pattern, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if match:
+                with self._lock:
+                    self.requests[name] = self.requests.get(name, 0) + 1
+                try:
+                    status, body = 200, handler(match, parse_qs(url.query))
+                except KeyError:
+                    pass
+                break
+
+        response = Response()
+        response.status_code = status
+        response._content = json.dumps(body).encode('utf-8')
+        response.headers['Content-Type'] = 'application/json'
+        response.url = request.url
+        response.request = request
+
+        return response
+
+    def close(self):
+        pass
+
+
+def mock_client(fixtures, latency=0.0, cache=None):
+    """
+    Returns an NhlClient whose requests are served by a FixtureAdapter (its
+    `adapter` attribute).
+    """
+    session = requests.Session()
+    adapter = FixtureAdapter(fixtures, latency=latency)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+
+    client = NhlClient(base_url=BASE_URL, session=session, cache=cache)
+    client.adapter = adapter
+
+    return client
@@ -5,8 +5,33 @@ Package designed to facilitate interacting with the NHL API to pull and visiuali
 # Structure
 # ---------
 # nhl.api : provides api high-level interaction with the NHL API
-import nhl.api
-import nhl.team
-# import nhl.game
-# import nhl.player
-import nhl.analysis
+# nhl.client : pooled HTTP client shared by all NHL API requests
+# nhl.cache : on-disk cache for NHL API responses
+# nhl.seasons : process-wide (optionally offline) current season resolution
+# nhl.registry : offline team reference data, resolving any team identifier
+# nhl.schedule : in-memory index over a league-wide schedule
+# nhl.parse : columnar extraction of play-by-play data from live feeds
+# nhl.schema : compact typed schema for the event tables
+# nhl.store : partitioned columnar (parquet) store for event and game tables
+# nhl.ingest : incremental ingestion of newly final games into the store
+# nhl.index : player-centric inverted index over the event tables
+# nhl.evolving : catalog, cached loader and memory-mapped std matrices for the evolving-hockey csv files
+# nhl.live : incremental (diff based) tracking of games in progress
+# nhl.replay : local server replaying recorded NHL API data, for testing and load generation
+import importlib
+
+# submodules are imported on first access (nhl.api, nhl.team, ...), so that
+# `import nhl` doesn't pull in requests, numpy and pandas (PEP 562)
+_SUBMODULES = ['analysis', 'api', 'cache', 'client', 'evolving', 'game', 'index',
+               'ingest', 'live', 'parse', 'player', 'registry', 'replay', 'schedule',
+               'schema', 'seasons', 'store', 'team']
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
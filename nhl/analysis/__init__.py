@@ -1,3 +1,15 @@
 # __init__.py
+import importlib
 
-import nhl.analysis.time_series
+# submodules are imported on first access (see nhl/__init__.py)
+_SUBMODULES = ['format_data', 'spatial', 'streaming', 'time_series']
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'{__name__}.{name}')
+    raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_SUBMODULES))
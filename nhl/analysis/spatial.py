@@ -0,0 +1,451 @@
+# spatial.py
+"""
+Spatial index over shot events.
+
+ShotIndex takes a shots table (e.g. EventStore.read('shots'), or Game.shot_data
+of many games) and, once,
+
+    - normalizes every shot to one attacking direction: towards the goal on the
+      left of the rink (x = -89), as the notebooks plot them. The side a team
+      attacks in a period is taken from where most of its shots came from;
+    - bins the shots on a square grid and on a hexagonal grid;
+    - assigns each shot a rink region (slot, circles, point, ...);
+    - precomputes (sparse) binned counts for every team, player, shot type and
+      result, for every season.
+
+A team's or player's shot map for a season is then a lookup into those counts,
+not a scan over the shot table:
+
+    index = ShotIndex(store.read('shots'))
+    counts = index.grid('team', 'TOR', season='20192020')   # (ny, nx) array
+    density = index.density(counts)
+    regions = index.regions(team='TOR', season='20192020')
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# rink extent (feet), center ice at (0, 0)
+X_RANGE = (-100.0, 100.0)
+Y_RANGE = (-42.5, 42.5)
+
+# the goal shots are normalized towards
+GOAL = (-89.0, 0.0)
+
+# dimensions counts are precomputed for
+DIMENSIONS = ['team', 'player', 'shot_type', 'result']
+
+# regions in order of precedence (a shot is in the first one it fits)
+REGIONS = ['crease', 'slot', 'circles', 'point', 'behind_net', 'perimeter',
+           'neutral_zone', 'defensive_zone']
+
+_SHOOTERS = ['Shooter', 'Scorer']
+
+
+def normalize(shots):
+    """
+    Returns the coordinates (x, y) of `shots`, flipped so that every shot
+    attacks the goal on the left of the rink.
+
+    The side attacked by a team in a period is the side most of its shots in
+    that period were taken from (i.e. the sign of their median x); this is much
+    more robust than flipping each shot on its own, which misplaces shots from
+    the team's own half.
+
+    Parameters
+    ----------
+    shots : pd.DataFrame
+        Shots table with x, y, period, game_id and team columns.
+
+    Returns
+    -------
+    x, y : np.ndarray (float32)
+    """
+    x = shots['x'].to_numpy(dtype=np.float64)
+    y = shots['y'].to_numpy(dtype=np.float64)
+
+    keys = [shots['game_id'].to_numpy(), shots['period'].to_numpy(),
+            shots['team'].astype(object).to_numpy()]
+    median = pd.Series(x).groupby(keys, dropna=False).transform('median').to_numpy()
+
+    # attacking to the right (median x > 0): flip to the left
+    side = np.sign(median)
+    side = np.where(side == 0, np.sign(x), side)
+    flip = side > 0
+
+    return (np.where(flip, -x, x).astype(np.float32),
+            np.where(flip, -y, y).astype(np.float32))
+
+
+def regions_of(x, y):
+    """
+    Returns the region (index into REGIONS) of each normalized (x, y); -1 where
+    the coordinates are missing.
+    """
+    gx, gy = GOAL
+    distance = np.hypot(x - gx, y - gy)
+    in_front = x >= gx
+    circle = np.minimum(np.hypot(x - (gx + 20), y - 22), np.hypot(x - (gx + 20), y + 22))
+
+    conditions = [
+        in_front & (distance <= 6),                             # crease
+        in_front & (x <= gx + 35) & (np.abs(y) <= 9),           # slot (to the top of the circles)
+        in_front & (circle <= 15),                              # faceoff circles
+        (x >= -35) & (x <= -25),                                # point (inside the blue line)
+        ~in_front & (x >= X_RANGE[0]),                          # behind the net
+        x < -25,                                                # rest of the offensive zone
+        (x >= -25) & (x <= 25),                                 # neutral zone
+        x > 25,                                                 # defensive zone
+    ]
+    region = np.select(conditions, np.arange(len(REGIONS)), default=-1)
+
+    return np.where(np.isnan(x) | np.isnan(y), -1, region)
+
+
+class ShotIndex:
+
+    def __init__(self, shots, cell=2.0, hex_size=3.0):
+        """
+        Spatial index over a shots table.
+
+        Parameters
+        ----------
+        shots : pd.DataFrame
+            Shots table (see Game.shot_data), with at least event,
+            secondary_type, x, y, period, player_one/two_role, player_one/two_id,
+            player_one/two_team and game_id.
+
+        cell : float (default : 2.0)
+            Side (feet) of the square grid cells.
+
+        hex_size : float (default : 3.0)
+            Size (center to corner, feet) of the hexagonal cells.
+
+        Attributes
+        ----------
+        x, y : np.ndarray (float32)
+            Normalized coordinates of every shot (NaN if missing).
+
+        values : dict
+            Maps each of DIMENSIONS (and 'season') to the values it takes;
+            codes[dimension] index into these.
+
+        codes : dict
+            Maps each of DIMENSIONS and 'season' to the code of every shot
+            (-1 where missing).
+        """
+        self.cell = float(cell)
+        self.hex_size = float(hex_size)
+        self._setup_grids()
+
+        if shots is None:
+            # filled in by load
+            return
+
+        shots = self._columns(shots)
+        self.x, self.y = normalize(shots)
+
+        self.values = {}
+        self.codes = {}
+        for dimension in DIMENSIONS + ['season']:
+            codes, values = pd.factorize(shots[dimension], sort=True)
+            self.values[dimension] = list(values)
+            self.codes[dimension] = codes.astype(np.int32)
+
+        self.grid_cells = self._grid_cells(self.x, self.y)
+        self.hex_cells = self._hex_cells(self.x, self.y)
+        self.region = regions_of(self.x, self.y).astype(np.int8)
+
+        self._precompute()
+
+    @staticmethod
+    def _columns(shots):
+        # one row per shot with the shooter's team/id, season, type and result
+        role_one = shots['player_one_role'].astype(object).to_numpy()
+        role_two = shots['player_two_role'].astype(object).to_numpy()
+        id_one = shots['player_one_id'].to_numpy(dtype=np.float64, na_value=np.nan)
+        id_two = shots['player_two_id'].to_numpy(dtype=np.float64, na_value=np.nan)
+        one, two = np.isin(role_one, _SHOOTERS), np.isin(role_two, _SHOOTERS)
+        shooter = np.where(one, id_one, np.where(two, id_two, np.nan))
+
+        # the shooter's team, picked the same way; without a Shooter/Scorer it
+        # is the shooting team all the same: the play's team, except on
+        # blocked shots (whose play team is the blocking team)
+        event = shots['event'].astype(object).to_numpy()
+        team_one = shots['player_one_team'].astype(object).to_numpy()
+        team_two = shots['player_two_team'].astype(object).to_numpy()
+        team = np.where(one, team_one,
+                        np.where(two | (event == 'blocked_shot'), team_two, team_one))
+
+        year = shots['game_id'].to_numpy(dtype=np.int64) // 1000000
+
+        return pd.DataFrame({
+            'x': shots['x'].to_numpy(dtype=np.float64),
+            'y': shots['y'].to_numpy(dtype=np.float64),
+            'period': shots['period'].to_numpy(),
+            'game_id': shots['game_id'].to_numpy(),
+            'team': team,
+            'player': pd.array(shooter, dtype='Int64'),
+            'shot_type': shots['secondary_type'].astype(object).to_numpy(),
+            'result': event,
+            'season': [f'{y}{y + 1}' for y in year]})
+
+    def _setup_grids(self):
+        # square grid
+        self.nx = int(np.ceil((X_RANGE[1] - X_RANGE[0]) / self.cell))
+        self.ny = int(np.ceil((Y_RANGE[1] - Y_RANGE[0]) / self.cell))
+
+        # hexagonal (pointy top) grid in axial coordinates (q, r)
+        size = self.hex_size
+        r_max = int(np.ceil(Y_RANGE[1] / (1.5 * size))) + 1
+        q_max = int(np.ceil(X_RANGE[1] / (np.sqrt(3) * size))) + r_max + 1
+        self._hex_r = (-r_max, r_max)
+        self._hex_q = (-q_max, q_max)
+        self.n_hex = (2 * q_max + 1) * (2 * r_max + 1)
+
+    def _grid_cells(self, x, y):
+        # cell id (row major, y then x) of each point; -1 if off the rink
+        i = np.floor((x - X_RANGE[0]) / self.cell)
+        j = np.floor((y - Y_RANGE[0]) / self.cell)
+        valid = (i >= 0) & (i < self.nx) & (j >= 0) & (j < self.ny)
+
+        return np.where(valid, np.nan_to_num(j) * self.nx + np.nan_to_num(i), -1).astype(np.int32)
+
+    def _hex_cells(self, x, y):
+        # hex id of each point (cube rounding of the axial coordinates)
+        size = self.hex_size
+        q = (np.sqrt(3) / 3 * x - y / 3) / size
+        r = (2 / 3 * y) / size
+        s = -q - r
+
+        rq, rr, rs = np.round(q), np.round(r), np.round(s)
+        dq, dr, ds = np.abs(rq - q), np.abs(rr - r), np.abs(rs - s)
+        fix_q = (dq > dr) & (dq > ds)
+        fix_r = ~fix_q & (dr > ds)
+        rq = np.where(fix_q, -rr - rs, rq)
+        rr = np.where(fix_r, -rq - rs, rr)
+
+        nq = self._hex_q[1] - self._hex_q[0] + 1
+        valid = ~(np.isnan(x) | np.isnan(y))
+        cells = (np.nan_to_num(rr) - self._hex_r[0]) * nq + (np.nan_to_num(rq) - self._hex_q[0])
+
+        return np.where(valid, cells, -1).astype(np.int32)
+
+    def hex_centers(self):
+        """
+        Returns the (x, y) center of every hex cell (index = hex id).
+        """
+        nq = self._hex_q[1] - self._hex_q[0] + 1
+        ids = np.arange(self.n_hex)
+        q = ids % nq + self._hex_q[0]
+        r = ids // nq + self._hex_r[0]
+        x = self.hex_size * np.sqrt(3) * (q + r / 2)
+        y = self.hex_size * 1.5 * r
+
+        return x, y
+
+    @property
+    def extent(self):
+        """
+        [x min, x max, y min, y max] of the grid, e.g. for plt.imshow.
+        """
+        return [X_RANGE[0], X_RANGE[0] + self.nx * self.cell,
+                Y_RANGE[0], Y_RANGE[0] + self.ny * self.cell]
+
+    def _precompute(self):
+        # for each dimension, sparse counts of every (value, season, cell): the
+        # (value, season) runs are found with a binary search
+        self._counts = {}
+        n_seasons = len(self.values['season'])
+        for dimension in DIMENSIONS:
+            codes = self.codes[dimension]
+            for kind, cells, n_cells in [('grid', self.grid_cells, self.nx * self.ny),
+                                         ('hex', self.hex_cells, self.n_hex)]:
+                valid = (codes >= 0) & (cells >= 0)
+                key = ((codes[valid].astype(np.int64) * n_seasons
+                        + self.codes['season'][valid]) * n_cells + cells[valid])
+                keys, counts = np.unique(key, return_counts=True)
+                self._counts[(dimension, kind)] = (keys, counts.astype(np.int32))
+
+    def _code(self, dimension, value):
+        try:
+            return self.values[dimension].index(value)
+        except ValueError:
+            return None
+
+    def counts(self, dimension, value, season=None, kind='grid'):
+        """
+        Binned shot counts of one team/player/shot type/result.
+
+        Parameters
+        ----------
+        dimension : str
+            One of DIMENSIONS ('team', 'player', 'shot_type', 'result').
+
+        value : str or int
+            e.g. 'TOR', a player id, 'Wrist Shot' or 'goal'.
+
+        season : str or list(str) (default : None)
+            Season(s) ('YYYYYYYY'); None for every season.
+
+        kind : str (default : 'grid')
+            'grid' or 'hex'.
+
+        Returns
+        -------
+        counts : np.ndarray (int32)
+            One count per cell (grid cells in row major order; see grid).
+        """
+        n_cells = self.nx * self.ny if kind == 'grid' else self.n_hex
+        total = np.zeros(n_cells, dtype=np.int32)
+
+        code = self._code(dimension, value)
+        if code is None:
+            return total
+
+        seasons = self.values['season'] if season is None else np.atleast_1d(season)
+        keys, counts = self._counts[(dimension, kind)]
+        n_seasons = len(self.values['season'])
+        for s in seasons:
+            s = self._code('season', str(s))
+            if s is None:
+                continue
+            start = (code * n_seasons + s) * n_cells
+            lo, hi = np.searchsorted(keys, [start, start + n_cells])
+            total[keys[lo:hi] - start] += counts[lo:hi]
+
+        return total
+
+    def grid(self, dimension, value, season=None):
+        """
+        Square grid counts as a (ny, nx) array (see extent), ready to plot.
+        """
+        return self.counts(dimension, value, season=season).reshape(self.ny, self.nx)
+
+    def rows(self, team=None, player=None, shot_type=None, result=None, season=None):
+        """
+        Returns the positions of the shots matching every given filter (a
+        value or list of values; None matches anything).
+        """
+        mask = np.ones(len(self.x), dtype=bool)
+        filters = {'team': team, 'player': player, 'shot_type': shot_type,
+                   'result': result, 'season': season}
+        for dimension, values in filters.items():
+            if values is None:
+                continue
+            values = [values] if np.isscalar(values) else values
+            codes = [self._code(dimension, v) for v in values]
+            mask &= np.isin(self.codes[dimension], [c for c in codes if c is not None])
+
+        return np.flatnonzero(mask)
+
+    def query(self, kind='grid', **filters):
+        """
+        Binned counts of the shots matching several filters at once (see rows),
+        e.g. query(team='TOR', result='goal', season='20192020'). Counts of a
+        single team/player/shot type/result come precomputed from counts.
+        """
+        cells = self.grid_cells if kind == 'grid' else self.hex_cells
+        n_cells = self.nx * self.ny if kind == 'grid' else self.n_hex
+
+        cells = cells[self.rows(**filters)]
+        counts = np.bincount(cells[cells >= 0], minlength=n_cells).astype(np.int32)
+
+        return counts.reshape(self.ny, self.nx) if kind == 'grid' else counts
+
+    def density(self, counts, bandwidth=4.0, normalize=True):
+        """
+        Gaussian smoothed density of grid counts.
+
+        Parameters
+        ----------
+        counts : np.ndarray
+            (ny, nx) grid counts (see grid and query).
+
+        bandwidth : float (default : 4.0)
+            Standard deviation of the Gaussian kernel, in feet.
+
+        normalize : bool (default : True)
+            If True, the density sums to 1 (if there are any shots).
+
+        Returns
+        -------
+        density : np.ndarray
+            (ny, nx) float array.
+        """
+        sigma = bandwidth / self.cell
+        radius = max(int(np.ceil(3 * sigma)), 1)
+        kernel = np.exp(-0.5 * (np.arange(-radius, radius + 1) / sigma) ** 2)
+        kernel /= kernel.sum()
+
+        def smooth(line):
+            # the full convolution, cut back to the line's cells (mode='same'
+            # would return the kernel's length if it is the longer of the two)
+            return np.convolve(line, kernel)[radius:radius + len(line)]
+
+        # separable: smooth the rows, then the columns
+        smoothed = np.asarray(counts, dtype=np.float64)
+        smoothed = np.apply_along_axis(smooth, 1, smoothed)
+        smoothed = np.apply_along_axis(smooth, 0, smoothed)
+
+        total = smoothed.sum()
+        if normalize and total > 0:
+            smoothed /= total
+
+        return smoothed
+
+    def regions(self, **filters):
+        """
+        Number of shots in each rink region (see REGIONS) among the shots
+        matching `filters` (see rows).
+
+        Returns
+        -------
+        counts : pd.Series
+        """
+        region = self.region[self.rows(**filters)]
+        counts = np.bincount(region[region >= 0], minlength=len(REGIONS))
+
+        return pd.Series(counts, index=REGIONS)
+
+    _ARRAYS = ['x', 'y', 'grid_cells', 'hex_cells', 'region']
+
+    def save(self, path):
+        """
+        Saves the index (including its precomputed counts) to `path` (.npz).
+        """
+        arrays = {name: getattr(self, name) for name in self._ARRAYS}
+        for dimension, codes in self.codes.items():
+            arrays[f'codes_{dimension}'] = codes
+        for (dimension, kind), (keys, counts) in self._counts.items():
+            arrays[f'keys_{dimension}_{kind}'] = keys
+            arrays[f'counts_{dimension}_{kind}'] = counts
+
+        values = {d: [v.item() if isinstance(v, np.generic) else v for v in vs]
+                  for d, vs in self.values.items()}
+        config = {'cell': self.cell, 'hex_size': self.hex_size, 'values': values}
+
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez(f, config=np.array(json.dumps(config)), **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Loads an index saved with save.
+        """
+        with np.load(path) as data:
+            config = json.loads(str(data['config']))
+            index = cls(None, cell=config['cell'], hex_size=config['hex_size'])
+            index.values = config['values']
+
+            for name in cls._ARRAYS:
+                setattr(index, name, data[name])
+            index.codes = {d: data[f'codes_{d}'] for d in index.values}
+            index._counts = {(d, kind): (data[f'keys_{d}_{kind}'], data[f'counts_{d}_{kind}'])
+                             for d in DIMENSIONS for kind in ['grid', 'hex']}
+
+        return index
@@ -0,0 +1,313 @@
+# streaming.py
+"""
+Streaming (incremental) statistics over team game logs.
+
+StreamingStats keeps, for every team and stat, the running state needed for
+
+    cumulative      -   count, sum, mean and variance (Welford)
+    rolling         -   sum, mean and variance over the last `window` games
+    ewm             -   exponentially weighted mean and variance
+
+so adding a game row costs O(1) per stat, no matter how far into the season we
+are. Rows are Game.agg_stats-style (a team column plus one column per stat),
+e.g. the games table of nhl.store.EventStore or LeagueBoxScores.agg_stats.
+The whole state can be checkpointed to disk and restored, so a dashboard only
+has to feed in the latest game night:
+
+    stats = StreamingStats.restore('state.npz')
+    stats.update_frame(new_rows)
+    stats.checkpoint('state.npz')
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+
+class StreamingStats:
+
+    def __init__(self, stats, window=10, alpha=None, halflife=None, teams=()):
+        """
+        Running statistics for every team and stat.
+
+        Parameters
+        ----------
+        stats : list(str)
+            Stats (columns of the game rows) to keep track of.
+
+        window : int (default : 10)
+            Number of games in the rolling window.
+
+        alpha : float (default : None)
+            Smoothing factor of the exponentially weighted statistics, in (0, 1];
+            defaults to 2/(window + 1).
+
+        halflife : float (default : None)
+            Alternatively, the number of games for a weight to halve; overrides
+            alpha.
+
+        teams : list (default : ())
+            Teams to allocate state for up front; others are added as seen.
+
+        Attributes
+        ----------
+        teams : list
+            Teams, in the order of the rows of every state array.
+        """
+        if halflife is not None:
+            alpha = 1 - np.exp(np.log(0.5) / halflife)
+        elif alpha is None:
+            alpha = 2 / (window + 1)
+
+        self.stats = list(stats)
+        self.window = int(window)
+        self.alpha = float(alpha)
+
+        self.teams = []
+        self._rows = {}
+        self._seen = set()
+
+        shape = (0, len(self.stats))
+        # cumulative
+        self.count = np.zeros(shape, dtype=np.int64)
+        self.sum = np.zeros(shape)
+        self._mean = np.zeros(shape)
+        self._m2 = np.zeros(shape)
+        # rolling window (ring buffer; NaN slots are empty)
+        self._buffer = np.full((0, self.window, len(self.stats)), np.nan)
+        self._position = np.zeros(0, dtype=np.int64)
+        self._window_count = np.zeros(shape, dtype=np.int64)
+        self._window_sum = np.zeros(shape)
+        self._window_sum2 = np.zeros(shape)
+        # exponentially weighted
+        self._ewm_mean = np.full(shape, np.nan)
+        self._ewm_var = np.full(shape, np.nan)
+
+        for team in teams:
+            self._row(team)
+
+    _ARRAYS = ['count', 'sum', '_mean', '_m2', '_buffer', '_position', '_window_count',
+               '_window_sum', '_window_sum2', '_ewm_mean', '_ewm_var']
+
+    def _row(self, team):
+        # row of `team` in the state arrays, adding it if needed
+        row = self._rows.get(team)
+        if row is not None:
+            return row
+
+        row = self._rows[team] = len(self.teams)
+        self.teams.append(team)
+
+        n = len(self.stats)
+        self.count = np.vstack([self.count, np.zeros((1, n), dtype=np.int64)])
+        self.sum = np.vstack([self.sum, np.zeros((1, n))])
+        self._mean = np.vstack([self._mean, np.zeros((1, n))])
+        self._m2 = np.vstack([self._m2, np.zeros((1, n))])
+        self._buffer = np.concatenate([self._buffer, np.full((1, self.window, n), np.nan)])
+        self._position = np.append(self._position, 0)
+        self._window_count = np.vstack([self._window_count, np.zeros((1, n), dtype=np.int64)])
+        self._window_sum = np.vstack([self._window_sum, np.zeros((1, n))])
+        self._window_sum2 = np.vstack([self._window_sum2, np.zeros((1, n))])
+        self._ewm_mean = np.vstack([self._ewm_mean, np.full((1, n), np.nan)])
+        self._ewm_var = np.vstack([self._ewm_var, np.full((1, n), np.nan)])
+
+        return row
+
+    def update(self, team, values, key=None):
+        """
+        Adds one game of `team`. Missing (NaN) values leave that stat untouched.
+
+        Parameters
+        ----------
+        team : hashable
+            e.g. the team's triCode or id.
+
+        values : dict, pd.Series or array-like
+            The game's stats; array-likes are in the order of self.stats.
+
+        key : hashable (default : None)
+            Identifies the game (e.g. its game id); a (team, key) pair that was
+            already added is skipped, so rows can safely be fed in twice.
+
+        Returns
+        -------
+        added : bool
+            False if the row was skipped.
+        """
+        if key is not None:
+            if (team, key) in self._seen:
+                return False
+            self._seen.add((team, key))
+
+        if isinstance(values, (dict, pd.Series)):
+            x = np.array([values.get(stat, np.nan) for stat in self.stats], dtype=float)
+        else:
+            x = np.asarray(values, dtype=float)
+
+        i = self._row(team)
+        present = ~np.isnan(x)
+        x0 = np.where(present, x, 0.0)
+
+        # cumulative (Welford)
+        self.count[i] += present
+        self.sum[i] += x0
+        delta = np.where(present, x0 - self._mean[i], 0.0)
+        self._mean[i] += np.where(present, delta / np.maximum(self.count[i], 1), 0.0)
+        self._m2[i] += np.where(present, delta * (x0 - self._mean[i]), 0.0)
+
+        # rolling: swap the oldest game out of the window for this one
+        pos = self._position[i]
+        old = self._buffer[i, pos]
+        old_present = ~np.isnan(old)
+        old0 = np.where(old_present, old, 0.0)
+        self._window_count[i] += present.astype(np.int64) - old_present
+        self._window_sum[i] += x0 - old0
+        self._window_sum2[i] += x0 ** 2 - old0 ** 2
+        self._buffer[i, pos] = x
+        self._position[i] = (pos + 1) % self.window
+
+        # exponentially weighted (West's incremental mean/variance)
+        first = present & np.isnan(self._ewm_mean[i])
+        mean = np.where(first, x0, self._ewm_mean[i])
+        var = np.where(first, 0.0, self._ewm_var[i])
+        diff = x0 - mean
+        increment = self.alpha * diff
+        update = present & ~first
+        self._ewm_mean[i] = np.where(update, mean + increment, mean)
+        self._ewm_var[i] = np.where(update, (1 - self.alpha) * (var + diff * increment), var)
+
+        return True
+
+    def update_frame(self, df, team_column='team', key_column='game_id'):
+        """
+        Adds every row of `df` (in order).
+
+        Parameters
+        ----------
+        df : pd.DataFrame
+            Game rows with a `team_column` and (some of) self.stats.
+
+        team_column : str (default : 'team')
+
+        key_column : str (default : 'game_id')
+            Column identifying the game (see update); ignored if missing.
+
+        Returns
+        -------
+        added : int
+            Number of rows added (i.e. not skipped).
+        """
+        values = df.reindex(columns=self.stats).to_numpy(dtype=float)
+        teams = df[team_column].tolist()
+        keys = df[key_column].tolist() if key_column in df.columns else [None] * len(df)
+
+        return sum(self.update(team, x, key=key) for team, x, key in zip(teams, values, keys))
+
+    def _frame(self, values):
+        return pd.DataFrame(values, index=pd.Index(self.teams, name='team'),
+                            columns=self.stats)
+
+    def mean(self):
+        """
+        Season-to-date mean of every team and stat.
+        """
+        return self._frame(np.where(self.count > 0, self._mean, np.nan))
+
+    def var(self):
+        """
+        Season-to-date (sample) variance of every team and stat.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self._frame(np.where(self.count > 1, self._m2 / (self.count - 1), np.nan))
+
+    def cumulative(self):
+        """
+        Season-to-date total of every team and stat.
+        """
+        return self._frame(self.sum)
+
+    def rolling_mean(self):
+        """
+        Mean over each team's last `window` games.
+        """
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return self._frame(np.where(self._window_count > 0,
+                                        self._window_sum / self._window_count, np.nan))
+
+    def rolling_var(self):
+        """
+        (Sample) variance over each team's last `window` games.
+        """
+        n = self._window_count
+        with np.errstate(divide='ignore', invalid='ignore'):
+            var = (self._window_sum2 - self._window_sum ** 2 / n) / (n - 1)
+        # guard against tiny negative values from cancellation
+        return self._frame(np.where(n > 1, np.maximum(var, 0.0), np.nan))
+
+    def ewm_mean(self):
+        """
+        Exponentially weighted mean of every team and stat.
+        """
+        return self._frame(self._ewm_mean)
+
+    def ewm_var(self):
+        """
+        Exponentially weighted variance of every team and stat.
+        """
+        return self._frame(self._ewm_var)
+
+    def per60(self, minutes):
+        """
+        Season-to-date rate of every stat per 60 minutes, given each team's
+        total minutes played (a pd.Series indexed by team).
+        """
+        minutes = pd.Series(minutes).reindex(self.teams).to_numpy(dtype=float)
+
+        return self._frame(60 * self.sum / minutes[:, None])
+
+    def checkpoint(self, path):
+        """
+        Saves the whole state to `path` (an .npz file), atomically.
+        """
+        config = {'stats': self.stats, 'window': self.window, 'alpha': self.alpha,
+                  'teams': self.teams, 'seen': sorted(self._seen, key=repr)}
+        arrays = {name.lstrip('_'): getattr(self, name) for name in self._ARRAYS}
+
+        tmp = path + '.tmp'
+        with open(tmp, 'wb') as f:
+            np.savez(f, config=np.array(json.dumps(config, default=_json_default)), **arrays)
+        os.replace(tmp, path)
+
+    @classmethod
+    def restore(cls, path):
+        """
+        Loads a state saved by checkpoint.
+
+        Returns
+        -------
+        stats : StreamingStats
+        """
+        with np.load(path) as data:
+            config = json.loads(str(data['config']))
+            stats = cls(config['stats'], window=config['window'], alpha=config['alpha'])
+            for name in cls._ARRAYS:
+                setattr(stats, name, data[name.lstrip('_')].copy())
+
+        # json turns tuples into lists
+        stats.teams = [_hashable(team) for team in config['teams']]
+        stats._rows = {team: i for i, team in enumerate(stats.teams)}
+        stats._seen = {tuple(_hashable(v) for v in pair) for pair in config['seen']}
+
+        return stats
+
+
+def _json_default(value):
+    # numpy scalars (e.g. game ids taken from a DataFrame)
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f'cannot checkpoint {value!r}')
+
+
+def _hashable(value):
+    return tuple(value) if isinstance(value, list) else value
@@ -1,15 +1,478 @@
 # time-series.py
 
-import requests
 import pandas as pd
 import numpy as np
-import time
 
-from nhl.api import getSchedule, getBoxScore
+from nhl import registry
+from nhl.api import getLeagueSchedule, iter_json_many
+from nhl.seasons import resolve_season
+
+# (season, include_pre, include_post, base url, client) -> LeagueSeries
+_league_series = {}
+
+# (season, include_pre, include_post, base url, client) -> LeagueBoxScores
+_league_box_scores = {}
+
+# teamSkaterStats key -> column name used by Game.agg_stats
+AGG_STAT_NAMES = {'goals': 'goals', 'pim': 'penalty_minutes', 'shots': 'shots',
+                  'powerPlayPercentage': 'PPP', 'powerPlayGoals': 'PPG',
+                  'powerPlayOpportunities': 'PPO',
+                  'faceOffWinPercentage': 'faceoff_win_percentage',
+                  'blocked': 'blocked_shots', 'takeaways': 'takeaways',
+                  'giveaways': 'giveaways', 'hits': 'hits'}
+
+
+class LeagueSeries:
+
+    def __init__(self, index, include_pre=False, include_post=False):
+        """
+        Every team's game-by-game results for a season, as teams x games played
+        matrices (row i is team self.team_ids[i], column j its (j+1)th game).
+
+        Transforms (cumulative, average, rolling, per60) work on every team at
+        once; use LeagueSeries.get to share one instance (and one schedule
+        request) between calls.
+
+        Parameters
+        ----------
+            index : nhl.schedule.ScheduleIndex
+                League schedule of the season (see nhl.api.getLeagueSchedule).
+
+            include_pre : bool (default: False)
+                Whether to include preseason games in the time series.
+
+            include_post : bool (default: False)
+                Whether to include postseason games in the time series.
+
+        Attributes
+        ----------
+            team_ids : ndarray
+                Team id of each row.
+
+            n_games : ndarray
+                Number of completed games of each team; columns past that are
+                padding (0, or NaN in transformed series).
+
+            goals_for, goals_against, home, opponent, date, game_id : ndarray
+                (teams x games) matrices; opponent is the opponent's team id.
+        """
+        self.index = index
+        self.include_pre = include_pre
+        self.include_post = include_post
+
+        positions = index.positions(None, include_pre=include_pre,
+                                    include_post=include_post, include_future=True)
+
+        # each team's completed games, in order (stopping at the first that isn't)
+        games = {}
+        stopped = set()
+        for pos in positions:
+            game = index.games[pos]
+            final = game['status']['detailedState'] == 'Final'
+            for side in ['home', 'away']:
+                team_id = game['teams'][side]['team']['id']
+                if team_id in stopped:
+                    continue
+                if not final:
+                    stopped.add(team_id)
+                    continue
+                games.setdefault(team_id, []).append((pos, side))
+
+        self.team_ids = np.array(sorted(set(games) | stopped), dtype=np.int64)
+        self._rows = {team_id: i for i, team_id in enumerate(self.team_ids)}
+        self.n_games = np.array([len(games.get(t, [])) for t in self.team_ids], dtype=np.int64)
+
+        shape = (len(self.team_ids), self.n_games.max(initial=0))
+        self.goals_for = np.zeros(shape, dtype=np.int64)
+        self.goals_against = np.zeros(shape, dtype=np.int64)
+        self.home = np.zeros(shape, dtype=bool)
+        self.opponent = np.zeros(shape, dtype=np.int64)
+        self.game_id = np.zeros(shape, dtype=np.int64)
+        self.date = np.full(shape, np.datetime64('NaT'), dtype='datetime64[D]')
+
+        for team_id, team_games in games.items():
+            i = self._rows[team_id]
+            for j, (pos, side) in enumerate(team_games):
+                game = index.games[pos]
+                other = 'away' if side == 'home' else 'home'
+                self.goals_for[i, j] = game['teams'][side]['score']
+                self.goals_against[i, j] = game['teams'][other]['score']
+                self.home[i, j] = side == 'home'
+                self.opponent[i, j] = game['teams'][other]['team']['id']
+                self.game_id[i, j] = game['gamePk']
+                self.date[i, j] = index.dates[pos]
+
+        # True where a column is an actual game
+        self.played = np.arange(shape[1]) < self.n_games[:, None]
+
+    @classmethod
+    def get(cls, season=None, include_pre=False, include_post=False, base_url=None,
+            client=None):
+        """
+        Returns the LeagueSeries of `season`, reusing the one built by an earlier
+        call as long as the league schedule it came from is still current (see
+        nhl.api.getLeagueSchedule).
+
+        Parameters
+        ----------
+            season : str (YYYYYYYY; default: None)
+                When season=None, this defaults to the current season.
+
+            include_pre, include_post, base_url, client
+                See getGoals.
+
+        Returns
+        -------
+            series : LeagueSeries
+        """
+        season = resolve_season(season, base_url=base_url, client=client)
+        index = getLeagueSchedule(season, base_url=base_url, client=client)
+
+        key = (str(season), include_pre, include_post, base_url, id(client))
+        series = _league_series.get(key)
+        if series is None or series.index is not index:
+            series = _league_series[key] = cls(index, include_pre=include_pre,
+                                               include_post=include_post)
+
+        return series
+
+    @property
+    def goal_diff(self):
+        """
+        Goal differential (teams x games).
+        """
+        return self.goals_for - self.goals_against
+
+    def _mask(self, values):
+        # padding -> NaN
+        return np.where(self.played, values, np.nan)
+
+    def cumulative(self, values):
+        """
+        Running total of `values` (teams x games) for every team.
+        """
+        return self._mask(np.cumsum(values, axis=1))
+
+    def average(self, values):
+        """
+        Running average of `values` (teams x games), i.e. column j is the average
+        over each team's first j+1 games.
+        """
+        return self.cumulative(values) / np.arange(1, values.shape[1] + 1)
+
+    def rolling(self, values, window):
+        """
+        Average of `values` (teams x games) over each team's last `window` games
+        (NaN until a team has played `window` games).
+        """
+        totals = np.cumsum(values, axis=1, dtype=np.float64)
+        rolled = np.full(totals.shape, np.nan)
+        if window <= totals.shape[1]:
+            rolled[:, window - 1] = totals[:, window - 1]
+            rolled[:, window:] = totals[:, window:] - totals[:, :-window]
+
+        return self._mask(rolled / window)
+
+    def per60(self, values, minutes=None):
+        """
+        Running rate of `values` (teams x games) per 60 minutes played.
+
+        Parameters
+        ----------
+            values : ndarray
+                (teams x games) matrix, e.g. self.goals_for.
+
+            minutes : ndarray (default: None)
+                (teams x games) minutes played in each game; the schedule has no
+                game lengths, so by default every game counts as 60 minutes.
+
+        Returns
+        -------
+            rate : ndarray
+        """
+        if minutes is None:
+            minutes = np.where(self.played, 60.0, 0.0)
+
+        return 60 * self.cumulative(values) / self.cumulative(minutes)
+
+    def transform(self, values, average=False, cumulative=False, window=None):
+        """
+        Applies (at most) one of the transforms to `values` (teams x games); with
+        none requested, `values` is returned as is.
+        """
+        if average:
+            return self.average(values)
+        elif cumulative:
+            return self.cumulative(values)
+        elif window is not None:
+            return self.rolling(values, window)
+
+        return values
+
+    def team(self, team_id, values):
+        """
+        Returns team `team_id`'s row of `values` (teams x games), without the
+        padding.
+        """
+        i = self._rows.get(registry.resolve(team_id))
+        if i is None:
+            # a team without games this season
+            return np.array([], dtype=values.dtype)
+
+        return values[i, :self.n_games[i]]
+
+    def series(self, team_id, values, average=False, cumulative=False, window=None):
+        """
+        Returns team `team_id`'s (transformed) time series of `values`; raw and
+        cumulative series of integer values stay integers.
+        """
+        row = self.team(team_id, self.transform(values, average=average,
+                                                cumulative=cumulative, window=window))
+        if not average and window is None and values.dtype.kind in 'iu':
+            row = row.astype(values.dtype)
+
+        return row
+
+
+class LeagueBoxScores:
+
+    def __init__(self, index, include_pre=False, include_post=False, concurrency=8,
+                 base_url=None, client=None, previous=None):
+        """
+        Box scores (teamSkaterStats) of every completed game of a season, as a
+        games x 2 (home, away) x stats tensor. Each box score is requested once,
+        concurrently.
+
+        Parameters
+        ----------
+            index : nhl.schedule.ScheduleIndex
+                League schedule of the season (see nhl.api.getLeagueSchedule).
+
+            include_pre : bool (default: False)
+                Whether to include preseason games.
+
+            include_post : bool (default: False)
+                Whether to include postseason games.
+
+            concurrency : int (default: 8)
+                Maximum number of simultaneous box score requests.
+
+            base_url : str (default: None)
+                URL to the NHL API base; defaults to the client's base url.
+
+            client : nhl.client.NhlClient (default: None)
+                Client to make requests with; defaults to the module-wide client.
+
+            previous : LeagueBoxScores (default: None)
+                Earlier box scores of the same season; games already in it are
+                not requested again.
+
+        Attributes
+        ----------
+            stats : list(str)
+                teamSkaterStats keys, i.e. the last axis of self.tensor.
+
+            tensor : ndarray
+                (games x 2 x stats) float matrix; side 0 is home, side 1 away.
+
+            game_ids, dates : ndarray
+                Game id and date of each game.
+
+            team_ids, teams : ndarray
+                (games x 2) team ids and triCodes.
+
+            failed : dict
+                Maps the game id of each box score that could not be requested
+                to the error; their rows are NaN and left out of every slice.
+
+            counted : ndarray
+                (games x 2) bool; True where the game comes before the team's
+                first game that isn't final (e.g. a postponed one). As in
+                LeagueSeries, a team's games stop there (see team_games).
+        """
+        self.index = index
+        self.include_pre = include_pre
+        self.include_post = include_post
+
+        positions = index.positions(None, include_pre=include_pre,
+                                    include_post=include_post, include_future=False)
+
+        n = len(positions)
+        self.game_ids = np.array([index.games[pos]['gamePk'] for pos in positions],
+                                 dtype=np.int64)
+        self.dates = np.array([index.dates[pos] for pos in positions], dtype='datetime64[D]')
+        self.team_ids = np.array([[index.games[pos]['teams'][side]['team']['id']
+                                   for side in ['home', 'away']] for pos in positions],
+                                 dtype=np.int64).reshape(n, 2)
+        self.teams = np.full((n, 2), None, dtype=object)
+        self.failed = {}
+
+        # each team's games, up to the first that isn't final
+        row_of = {pos: i for i, pos in enumerate(positions)}
+        self.counted = np.zeros((n, 2), dtype=bool)
+        stopped = set()
+        for pos in index.positions(None, include_pre=include_pre, include_post=include_post,
+                                   include_future=True):
+            i = row_of.get(pos)
+            for side, key in enumerate(['home', 'away']):
+                team_id = index.games[pos]['teams'][key]['team']['id']
+                if i is None:
+                    stopped.add(team_id)
+                else:
+                    self.counted[i, side] = team_id not in stopped
+
+        self.stats = None if previous is None else previous.stats
+        self.tensor = None
+        rows = {game_id: i for i, game_id in enumerate(self.game_ids)}
+
+        # reuse whatever an earlier instance already fetched
+        done = set()
+        if previous is not None and previous.stats is not None:
+            self._allocate(n)
+            for j, game_id in enumerate(previous.game_ids):
+                i = rows.get(game_id)
+                if i is not None and game_id not in previous.failed:
+                    self.tensor[i] = previous.tensor[j]
+                    self.teams[i] = previous.teams[j]
+                    done.add(game_id)
+
+        endpoints = {f'/game/{game_id}/boxscore': game_id
+                     for game_id in self.game_ids if game_id not in done}
+
+        # box scores of completed games never change
+        results = iter_json_many(endpoints, concurrency=concurrency, base_url=base_url,
+                                 client=client, final=lambda data: True,
+                                 return_exceptions=True)
+        for endpoint, data in results:
+            game_id = endpoints[endpoint]
+            if isinstance(data, Exception):
+                self.failed[int(game_id)] = repr(data)
+                continue
+            try:
+                sides = [data['teams']['home'], data['teams']['away']]
+                values = [side['teamStats']['teamSkaterStats'] for side in sides]
+            except (KeyError, TypeError) as e:
+                self.failed[int(game_id)] = repr(e)
+                continue
+
+            if self.stats is None:
+                self.stats = list(values[0].keys())
+            if self.tensor is None:
+                self._allocate(n)
+
+            i = rows[game_id]
+            for side in range(2):
+                self.tensor[i, side] = [float(values[side].get(stat, np.nan))
+                                        for stat in self.stats]
+                self.teams[i, side] = sides[side]['team'].get('triCode')
+
+        if self.tensor is None:
+            self.stats = []
+            self._allocate(n)
+
+        # games with box scores
+        self.valid = np.ones(n, dtype=bool)
+        failed = np.array(list(self.failed), dtype=np.int64)
+        self.valid[np.isin(self.game_ids, failed)] = False
+
+    def _allocate(self, n):
+        self.tensor = np.full((n, 2, len(self.stats)), np.nan)
+
+    @classmethod
+    def get(cls, season=None, include_pre=False, include_post=False, concurrency=8,
+            base_url=None, client=None):
+        """
+        Returns the LeagueBoxScores of `season`, reusing the one built by an
+        earlier call; once the league schedule changes, only the box scores of
+        the newly completed games are requested.
+
+        Parameters
+        ----------
+            season : str (YYYYYYYY; default: None)
+                When season=None, this defaults to the current season.
+
+            include_pre, include_post, concurrency, base_url, client
+                See LeagueBoxScores.
+
+        Returns
+        -------
+            box_scores : LeagueBoxScores
+        """
+        season = resolve_season(season, base_url=base_url, client=client)
+        index = getLeagueSchedule(season, base_url=base_url, client=client)
+
+        key = (str(season), include_pre, include_post, base_url, id(client))
+        box_scores = _league_box_scores.get(key)
+        if box_scores is None or box_scores.index is not index:
+            box_scores = _league_box_scores[key] = cls(
+                index, include_pre=include_pre, include_post=include_post,
+                concurrency=concurrency, base_url=base_url, client=client,
+                previous=box_scores)
+
+        return box_scores
+
+    def team_games(self, team_id):
+        """
+        Returns the (game rows, side) of team `team_id`'s games (in order, up
+        to its first game that isn't final); side is 0 where the team was home
+        and 1 where it was away.
+        """
+        games, sides = np.nonzero(self.team_ids == registry.resolve(team_id))
+        keep = self.valid[games] & self.counted[games, sides]
+
+        return games[keep], sides[keep]
+
+    def team(self, team_id):
+        """
+        Returns the (games x stats) matrices of team `team_id` and of its
+        opponents, game by game.
+        """
+        games, sides = self.team_games(team_id)
+
+        return self.tensor[games, sides], self.tensor[games, 1 - sides]
+
+    def agg_stats(self, game_ids=None):
+        """
+        Returns Game.agg_stats-style rows (one per team per game, with for and
+        against columns for every stat) for `game_ids` (default: every game).
+
+        Returns
+        -------
+            agg_stats : pd.DataFrame
+                Includes a game_id column.
+        """
+        rows = np.flatnonzero(self.valid)
+        if game_ids is not None:
+            game_ids = np.atleast_1d(np.asarray(game_ids, dtype=np.int64))
+            rows = rows[np.isin(self.game_ids[rows], game_ids)]
+
+        # each game twice: home team's row, then away team's row
+        games = np.repeat(rows, 2)
+        sides = np.tile([0, 1], len(rows))
+
+        team = self.tensor[games, sides]
+        other = self.tensor[games, 1 - sides]
+
+        df = pd.DataFrame({'date': self.dates[games].astype(str),
+                           'team': self.teams[games, sides],
+                           'team_id': self.team_ids[games, sides],
+                           'opponent': self.teams[games, 1 - sides],
+                           'home': sides == 0})
+        if 'goals' in self.stats:
+            goals = self.stats.index('goals')
+            df['win'] = team[:, goals] > other[:, goals]
+
+        for j, stat in enumerate(self.stats):
+            name = AGG_STAT_NAMES.get(stat, stat)
+            df[f'{name}_for'] = team[:, j]
+            df[f'{name}_against'] = other[:, j]
+        df['game_id'] = self.game_ids[games]
+
+        return df
 
 
 def getGoals(team_id, season=None, include_pre=False, include_post=False,
-             base_url='https://statsapi.web.nhl.com/api/v1'):
+             base_url=None, client=None):
     """
     Gathers a goals for/against time series for team `team_id` and season `season`.
 
@@ -28,8 +491,11 @@ def getGoals(team_id, season=None, include_pre=False, include_post=False,
         include_post : bool (default: False)
             Whether to include postseason games in the time series.
 
-        base_url : str
-            URL to the NHL API base; used only if season is not specified.
+        base_url : str (default: None)
+            URL to the NHL API base; defaults to the client's base url.
+
+        client : nhl.client.NhlClient (default: None)
+            Client to make requests with; defaults to the module-wide client.
 
     Returns
     -------
@@ -39,58 +505,21 @@ def getGoals(team_id, season=None, include_pre=False, include_post=False,
         goals_against : ndarray
             Goals against time series.
     """
-    if type(team_id) is int:
-        team_id = str(team_id)
-
-    # if season is not specified, assume it is the current season
-    if season is None:
-        season = requests.get(base_url + '/seasons/current').json()['seasons']
-        season = season[0]['seasonId']
-
-    games = getSchedule(team_id, season=season, mongodb=False)
-    games = games[team_id][season]
-
-    goals_for = []
-    goals_against = []
-
-    for game in games:
-        # drill down to the level we care about
-        game = game['games'][0]
+    # a view over the league-wide series (one schedule request for every team)
+    series = LeagueSeries.get(season, include_pre=include_pre, include_post=include_post,
+                              base_url=base_url, client=client)
 
-        # stop if we have reached games that have not been completed
-        if game['status']['detailedState'] != 'Final':
-            break
-
-        # if include_pre is False, skip preseason games
-        if not include_pre:
-            if game['gameType'] == 'PR':
-                continue
-
-        # if include_post is False, skip preseason games
-        if not include_post:
-            if game['gameType'] == 'P':
-                continue
-
-        # check for home/away
-        if str(game['teams']['home']['team']['id']) == team_id:
-            goals_for.append(game['teams']['home']['score'])
-            goals_against.append(game['teams']['away']['score'])
-        else:
-            goals_for.append(game['teams']['away']['score'])
-            goals_against.append(game['teams']['home']['score'])
-
-    # convert to numpy because that is better
-    goals_for, goals_against = np.array(goals_for), np.array(goals_against)
+    goals_for = series.series(team_id, series.goals_for)
+    goals_against = series.series(team_id, series.goals_against)
 
     return goals_for, goals_against
 
 
 def getTeamBoxScores(team_id, season=None, include_pre=False, include_post=False,
-                     return_np=False, base_url='https://statsapi.web.nhl.com/api/v1',
-                     wait=0):
+                     return_np=False, base_url=None, wait=0, client=None, concurrency=8):
     """
-    Note, this will take some time to run.
-    Constructs time series for each
+    Constructs time series for each of team `team_id`'s box score stats, as
+    slices of the season's LeagueBoxScores.
 
     Parameters
     ----------
@@ -110,84 +539,49 @@ def getTeamBoxScores(team_id, season=None, include_pre=False, include_post=False
         return_np : bool (default: False)
             If False, returns a pandas dataframe; otherwise, returns an ndarray.
 
-        base_url : str
-            URL to the NHL API base.
+        base_url : str (default: None)
+            URL to the NHL API base; defaults to the client's base url.
 
         wait : float (nonnegative, defalut: 0)
-            Specifies a wait time between requests to the API. Not needed unless
-            you are making 1000+ requests per second (I think...?)
+            No longer used; requests are limited by `concurrency` instead.
+
+        client : nhl.client.NhlClient (default: None)
+            Client to make requests with; defaults to the module-wide client.
+
+        concurrency : int (default: 8)
+            Maximum number of simultaneous box score requests.
 
     Returns
     -------
+        team_stats : pd.DataFrame
+            The team's teamSkaterStats, one row per game (indexed by team id).
 
+        other_stats : pd.DataFrame
+            Its opponents' teamSkaterStats (indexed by opponent id).
     """
-    # if season is not specified, assume it is the current season
-    if season is None:
-        season = requests.get(base_url + '/seasons/current').json()['seasons']
-        season = season[0]['seasonId']
-
-    # request raw schedule
-    games = getSchedule(team_id, season=season, base_url=base_url)
-
-    team_stats = []
-    other_stats = []
-    cols = None
-
-    for game in games:
-        if wait:
-            time.sleep(wait)
-        # grab the actual game dictionary
-        game = game['games'][0]
-
-        # stop if we have reached games that have not been completed
-        if game['status']['detailedState'] != 'Final':
-            break
-
-        # if include_pre is False, skip preseason games
-        if not include_pre and game['gameType'] == 'PR':
-            continue
-
-        # if include_post is False, skip postseason games
-        if not include_post and game['gameType'] == 'P':
-            continue
-
-        # get boxscore data
-        game_id = game['gamePk']    # game id
-        try:
-            team, other = getBoxScore(game_id)
-        except KeyError:
-            print(f'game_id: {game_id} failed')
-            continue
-
-        # grab team ids and find which is team_id
-        home_id, away_id = str(team['team']['id']), str(other['team']['id'])
-        if home_id != team_id:
-            team, other = other, team
-
-        team = team['teamStats']['teamSkaterStats']
-        other = other['teamStats']['teamSkaterStats']
-
-        if cols is None:
-            # save column labels for future
-            cols = list(team.keys())
-
-        team_stats.append([float(team_id)] + [float(team[stat]) for stat in team.keys()])
-        other_stats.append([float(away_id)] + [float(other[stat]) for stat in other.keys()])
-
-    team_stats = np.array(team_stats)
-    other_stats = np.array(other_stats)
+    # a slice of the league-wide box scores (each game is requested once)
+    box_scores = LeagueBoxScores.get(season, include_pre=include_pre,
+                                     include_post=include_post, concurrency=concurrency,
+                                     base_url=base_url, client=client)
+    games, sides = box_scores.team_games(team_id)
+    team, other = box_scores.team(team_id)
+
+    cols = box_scores.stats
+    team_ids = box_scores.team_ids[games, sides].astype(float)
+    other_ids = box_scores.team_ids[games, 1 - sides].astype(float)
 
     if return_np:
-        return team_stats, other_stats
+        return np.column_stack([team_ids, team]), np.column_stack([other_ids, other])
 
-    team_stats = pd.DataFrame(team_stats[:, 1:], index=team_stats[:, 0], columns=cols)
-    other_stats = pd.DataFrame(other_stats[:, 1:], index=other_stats[:, 0], columns=cols)
+    team_stats = pd.DataFrame(team, index=team_ids, columns=cols)
+    other_stats = pd.DataFrame(other, index=other_ids, columns=cols)
 
     return team_stats, other_stats
 
 
 def goalsFor(team_id, season=None, include_pre=False, include_post=False,
-             average=False, cumulative=False, base_url='https://statsapi.web.nhl.com/api/v1'):
+             average=False, cumulative=False, base_url=None, client=None,
+             window=None):
     """
     Creates a goals for time series for the given team.
 
@@ -213,31 +607,31 @@ def goalsFor(team_id, season=None, include_pre=False, include_post=False,
         cumulative : bool (default: False)
             If True, the time series will be the cumulative goals for.
 
-        base_url : str
-            URL to the NHL API base; used only if season is not specified.
+        base_url : str (default: None)
+            URL to the NHL API base; defaults to the client's base url.
+
+        client : nhl.client.NhlClient (default: None)
+            Client to make requests with; defaults to the module-wide client.
+
+        window : int (default: None)
+            If given, the ith element of the resulting time series will be the
+            average goals for over the `window` games up through the ith game.
 
     Returns
     -------
         goals_for : ndarray
             Goals for time series.
     """
-    if type(team_id) is int:
-        team_id = str(team_id)
+    series = LeagueSeries.get(season, include_pre=include_pre, include_post=include_post,
+                              base_url=base_url, client=client)
 
-    goals_for, _ = getGoals(team_id, season=season, include_pre=include_pre,
-                            include_post=include_post, base_url=base_url)
-
-    # if average/cumulative is requested
-    if average:
-        goals_for = np.cumsum(goals_for)/np.arange(1, goals_for.size+1)
-    elif cumulative:
-        goals_for = np.cumsum(goals_for)
-
-    return goals_for
+    return series.series(team_id, series.goals_for, average=average, cumulative=cumulative,
+                         window=window)
 
 
 def goalsAgainst(team_id, season=None, include_pre=False, include_post=False,
-                 average=False, cumulative=False, base_url='https://statsapi.web.nhl.com/api/v1'):
+                 average=False, cumulative=False, base_url=None, client=None,
+                 window=None):
     """
     Creates a goals against time series for the given team.
 
@@ -263,31 +657,31 @@ def goalsAgainst(team_id, season=None, include_pre=False, include_post=False,
         cumulative : bool (default: False)
             If True, the time series will be the cumulative goals against.
 
-        base_url : str
-            URL to the NHL API base; used only if season is not specified.
+        base_url : str (default: None)
+            URL to the NHL API base; defaults to the client's base url.
+
+        client : nhl.client.NhlClient (default: None)
+            Client to make requests with; defaults to the module-wide client.
+
+        window : int (default: None)
+            If given, the ith element of the resulting time series will be the
+            average goals against over the `window` games up through the ith game.
 
     Returns
     -------
         goals_against : ndarray
             Goals against time series.
     """
-    if type(team_id) is int:
-        team_id = str(team_id)
+    series = LeagueSeries.get(season, include_pre=include_pre, include_post=include_post,
+                              base_url=base_url, client=client)
 
-    _, goals_against = getGoals(team_id, season=season, include_pre=include_pre,
-                                include_post=include_post, base_url=base_url)
-
-    # if average/cumulative is requested
-    if average:
-        goals_against = np.cumsum(goals_against)/np.arange(1, goals_against.size+1)
-    elif cumulative:
-        goals_against = np.cumsum(goals_against)
-
-    return goals_against
+    return series.series(team_id, series.goals_against, average=average, cumulative=cumulative,
+                         window=window)
 
 
 def goalDiff(team_id, season=None, include_pre=False, include_post=False,
-             average=False, cumulative=False, base_url='https://statsapi.web.nhl.com/api/v1'):
+             average=False, cumulative=False, base_url=None, client=None,
+             window=None):
     """
     Creates a goals against time series for the given team.
 
@@ -313,27 +707,24 @@ def goalDiff(team_id, season=None, include_pre=False, include_post=False,
         cumulative : bool (default: False)
             If True, the time series will be the cumulative goal differential.
 
-        base_url : str
-            URL to the NHL API base; used only if season is not specified.
+        base_url : str (default: None)
+            URL to the NHL API base; defaults to the client's base url.
+
+        client : nhl.client.NhlClient (default: None)
+            Client to make requests with; defaults to the module-wide client.
+
+        window : int (default: None)
+            If given, the ith element of the resulting time series will be the
+            average goal differential over the `window` games up through the ith
+            game.
 
     Returns
     -------
         goal_diff : ndarray
             Goal differential time series.
     """
-    if type(team_id) is int:
-        team_id = str(team_id)
-
-    goals_for, goals_against = getGoals(team_id, season=season, include_pre=include_pre,
-                                        include_post=include_post, base_url=base_url)
-
-    # calculate the goal differential
-    goal_diff = goals_for - goals_against
-
-    # if average/cumulative is requested
-    if average:
-        goal_diff = np.cumsum(goal_diff)/np.arange(1, goal_diff.size+1)
-    elif cumulative:
-        goal_diff = np.cumsum(goal_diff)
+    series = LeagueSeries.get(season, include_pre=include_pre, include_post=include_post,
+                              base_url=base_url, client=client)
 
-    return goal_diff
+    return series.series(team_id, series.goal_diff, average=average, cumulative=cumulative,
+                         window=window)
@@ -1,79 +1,370 @@
 # collect_data.py
-import requests
-import numpy as np
-import pandas as pd
+import datetime
 import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from urllib.parse import urlsplit
 
+from nhl import registry
+from nhl.client import NhlClient
+from nhl.seasons import SEASON_DATES, resolve_season
+from nhl.schedule import ScheduleIndex
 
-def getTeamIDs(base_url='https://statsapi.web.nhl.com/api/v1', active=True):
+# client shared by every function in this module; created on first use
+_client = None
+
+# league schedules indexed in memory (see getLeagueSchedule), keyed by request url
+_schedules = {}
+_schedules_lock = threading.Lock()
+
+# seconds before a schedule that still has unplayed games is requested again
+SCHEDULE_TTL = 600
+
+# league rosters kept in memory (see getLeagueRosters), keyed by request url
+_rosters = {}
+_rosters_lock = threading.Lock()
+
+# seconds before the rosters of a season in progress are requested again
+ROSTER_TTL = 3600
+
+
+def get_client():
+    """
+    Returns the module-wide NhlClient, creating it if needed.
     """
-    Queries the NHL API for (team_name, team_id) pairs.
+    global _client
+    if _client is None:
+        _client = NhlClient()
+
+    return _client
+
+
+def set_client(client):
+    """
+    Sets the module-wide NhlClient used by nhl.api (and by Game and Team objects
+    that are not given a client explicitly).
+
+    Parameters
+    ----------
+    client : nhl.client.NhlClient or None
+        Client to use; None resets to a default client on the next request.
+
+    Returns
+    -------
+    previous : nhl.client.NhlClient or None
+        The client that was previously in use.
+    """
+    global _client
+    previous, _client = _client, client
+
+    return previous
+
+
+def set_cache(cache):
+    """
+    Sets the response cache used by the module-wide client.
+
+    Parameters
+    ----------
+    cache : nhl.cache.DiskCache or None
+        Any object with `get(url)` and `set(url, data, final=False)` methods.
+        Pass None to disable caching.
+
+    Returns
+    -------
+    previous : cache object or None
+        The cache that was previously in use.
+    """
+    client = get_client()
+    previous, client.cache = client.cache, cache
+
+    return previous
+
+
+def get_cache():
+    """
+    Returns the response cache used by the module-wide client (None if disabled).
+    """
+    return get_client().cache
+
+
+def _isFinalGame(data):
+    # live feed of a completed game; this can never change again
+    try:
+        return data['gameData']['status']['abstractGameState'] == 'Final'
+    except (KeyError, TypeError):
+        return False
+
+
+def _isFinalSchedule(data):
+    # schedule where every game has been completed
+    games = [game for date in data.get('dates', []) for game in date['games']]
+    if not games:
+        return False
+
+    return all(game['status']['abstractGameState'] == 'Final' for game in games)
+
+
+def _isPastSeason(season):
+    # season ('YYYYYYYY') that ended before today; its data can't change again
+    dates = SEASON_DATES.get(str(season))
+    if dates is None:
+        return False
+
+    return datetime.date.fromisoformat(dates[1]) < datetime.date.today()
+
+
+def _get(endpoint, base_url=None, client=None, final=None, cache=True):
+    """
+    Requests `endpoint` through `client` (defaults to the module-wide client)
+    and returns the decoded json.
+
+    Parameters
+    ----------
+    endpoint : str
+        Endpoint to request, including the query string.
+
+    base_url : str (default : None)
+        Base url to the nhl api; defaults to the client's base url.
+
+    client : nhl.client.NhlClient (default : None)
+        Client to make the request with.
+
+    final : callable (default : None)
+        Function of the decoded json returning True if the response can never
+        change again (and so should be cached forever).
+
+    cache : bool (default : True)
+        If False, bypass the response cache; see NhlClient.get.
+    """
+    if client is None:
+        client = get_client()
+
+    return client.get(endpoint, base_url=base_url, final=final, cache=cache)
+
+
+async def fetch_json_many(endpoints, concurrency=8, base_url=None, client=None,
+                          final=None, return_exceptions=False):
+    """
+    Asynchronously requests many endpoints, yielding each response as soon as it
+    arrives (i.e. not necessarily in the order given).
+
+    Requests are made over the (pooled) client from a thread pool driven by the
+    running event loop, with at most `concurrency` requests in flight per host.
+
+    Parameters
+    ----------
+    endpoints : iterable of str
+        Endpoints to request, including query strings.
+
+    concurrency : int (default : 8)
+        Maximum number of simultaneous requests per host. The client's
+        pool_size should be at least this large so connections are reused.
+
+    base_url : str (default : None)
+        Base url to the NHL API; defaults to the client's base url.
+
+    client : nhl.client.NhlClient (default : None)
+        Client to make requests with; defaults to the module-wide client.
+
+    final : callable (default : None)
+        Passed on to the client; see NhlClient.get.
+
+    return_exceptions : bool (default : False)
+        If True, a failed request yields (endpoint, exception) instead of
+        raising and stopping the iteration.
+
+    Yields
+    ------
+    endpoint, data : str, dict (json-like)
+    """
+    # only needed (and so only imported) for concurrent requests
+    import asyncio
+
+    if client is None:
+        client = get_client()
+
+    endpoints = list(dict.fromkeys(endpoints))
+    hosts = {endpoint: urlsplit(client.url(endpoint, base_url)).netloc
+             for endpoint in endpoints}
+    semaphores = {host: asyncio.Semaphore(concurrency) for host in set(hosts.values())}
+
+    # enough threads for every host to have `concurrency` requests in flight
+    loop = asyncio.get_running_loop()
+    executor = ThreadPoolExecutor(max_workers=concurrency * max(len(semaphores), 1))
+
+    async def fetch(endpoint):
+        async with semaphores[hosts[endpoint]]:
+            request = partial(client.get, endpoint, base_url=base_url, final=final)
+            try:
+                return endpoint, await loop.run_in_executor(executor, request)
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                return endpoint, e
+
+    tasks = [asyncio.ensure_future(fetch(endpoint)) for endpoint in endpoints]
+    try:
+        for task in asyncio.as_completed(tasks):
+            yield await task
+    finally:
+        # stop anything still pending if the caller stopped early (or we failed)
+        for task in tasks:
+            task.cancel()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def fetch_live_data_many(game_ids, concurrency=8, base_url=None, client=None,
+                               return_exceptions=False):
+    """
+    Asynchronously requests the live data feed of many games, yielding each one
+    as soon as it arrives. See getLiveData and fetch_json_many.
+
+    Parameters
+    ----------
+    game_ids : iterable of str or int
+        NHL API game_ids (gamePk) of the games to request.
+
+    concurrency : int (default : 8)
+        Maximum number of simultaneous requests per host.
+
+    base_url : str (default : None)
+        Base url to the NHL API; defaults to the client's base url.
+
+    client : nhl.client.NhlClient (default : None)
+        Client to make requests with; defaults to the module-wide client.
+
+    return_exceptions : bool (default : False)
+        If True, a failed game yields (game_id, exception) instead of raising.
+
+    Yields
+    ------
+    game_id, live_data : str, dict (json-like)
+        Same live_data as returned by getLiveData.
+    """
+    endpoints = {f'/game/{game_id}/feed/live': str(game_id) for game_id in game_ids}
+
+    results = fetch_json_many(endpoints, concurrency=concurrency, base_url=base_url,
+                              client=client, final=_isFinalGame,
+                              return_exceptions=return_exceptions)
+    async for endpoint, data in results:
+        game_id = endpoints[endpoint]
+        if isinstance(data, Exception):
+            yield game_id, data
+            continue
+
+        try:
+            yield game_id, data['liveData']
+        except KeyError as e:
+            # the api responds with an error message instead of a feed
+            if not return_exceptions:
+                raise KeyError(f'no live data for game {game_id}: {data}') from e
+            yield game_id, e
+
+
+def _iterate(make_generator):
+    """
+    Runs the async generator returned by `make_generator()` on its own event
+    loop (in a background thread) and yields its items synchronously. Works
+    whether or not the caller already has a running event loop (e.g. Jupyter).
+    """
+    import asyncio
+
+    items = queue.Queue()
+    stop = threading.Event()
+    done = object()
+
+    async def consume():
+        generator = make_generator()
+        try:
+            async for item in generator:
+                items.put((True, item))
+                if stop.is_set():
+                    break
+        finally:
+            await generator.aclose()
+
+    def run():
+        try:
+            asyncio.run(consume())
+        except BaseException as e:
+            items.put((False, e))
+        items.put((True, done))
+
+    threading.Thread(target=run, daemon=True).start()
+
+    try:
+        while True:
+            ok, item = items.get()
+            if not ok:
+                raise item
+            if item is done:
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+def iter_json_many(endpoints, **kwargs):
+    """
+    Synchronous version of fetch_json_many; takes the same arguments and yields
+    (endpoint, data) pairs as they arrive.
+    """
+    return _iterate(lambda: fetch_json_many(endpoints, **kwargs))
+
+
+def iter_live_data_many(game_ids, **kwargs):
+    """
+    Synchronous version of fetch_live_data_many; takes the same arguments and
+    yields (game_id, live_data) pairs as they arrive.
+    """
+    return _iterate(lambda: fetch_live_data_many(game_ids, **kwargs))
+
+
+def getTeamIDs(base_url=None, active=True, client=None, refresh=False):
+    """
+    Returns (team_name, team_id) pairs, from the offline team registry (see
+    nhl.registry); no request is made unless refresh is True.
 
     Parameters:
-        base_url (str): base url to the nhl api
+        base_url (str): base url to the nhl api; defaults to the client's
         active (bool): if True, only return data for active teams
+        client (NhlClient): client to make requests with; defaults to the
+            module-wide client
+        refresh (bool): if True, first update the registry from the /teams
+            endpoint
 
     Returns:
-        teams (list(tuples)): list containing (team-name, team-id) pairs
-            for all (active) teams
+        teams (dict): maps team name to team id for all (active) teams
     """
-    # request teams data
-    all_teams = requests.get(base_url + '/teams').json()['teams']
-
-    # extract team names and ids
-    if active:
-        teams = {team['name']: team['id'] for team in all_teams if team['active']}
-    else:
-        teams = {team['name']: team['id'] for team in all_teams}
+    if refresh:
+        registry.refresh(base_url=base_url, client=client)
 
-    return teams
+    return {team['name']: team['id'] for team in registry.teams(active=active)}
 
 
 def teamIDsDict():
-    team_dict = {
-                'new jersey devils': 1,         'njd': 1,
-                'new york islanders': 2,        'nyi': 2,
-                'new york rangers': 3,          'nyr': 3,
-                'philadelphia flyers': 4,       'phi': 4,
-                'pittsburgh penguins': 5,       'pit': 5,
-                'boston bruins': 6,             'bos': 6,
-                'buffalo sabres': 7,            'buf': 7,
-                'montreal canadiens': 8,        'mtl': 8,
-                'ottawa senators': 9,           'ott': 9,
-                'toronto maple leafs': 10,      'tor': 10,
-                'carolina hurricanes': 12,      'car': 12,
-                'florida panthers': 13,         'fla': 13,
-                'tampa bay lightning': 14,      'tbl': 14,
-                'washington capitals': 15,      'wsh': 15,
-                'chicago blackhawks': 16,       'chi': 16,
-                'detroit red wings': 17,        'det': 17,
-                'nashville predators': 18,      'nsh': 18,
-                'st. louis blues': 19,          'stl': 19,
-                'calgary flames': 20,           'cgy': 20,
-                'colorado avalanche': 21,       'col': 21,
-                'edmonton oilers': 22,          'edm': 22,
-                'vancouver canucks': 23,        'van': 23,
-                'anaheim ducks': 24,            'ana': 24,
-                'dallas stars': 25,             'dal': 25,
-                'los angeles kings': 26,        'lak': 26,
-                'san jose sharks': 28,          'sjs': 28,
-                'columbus blue jackets': 29,    'cbj': 29,
-                'minnesota wild': 30,           'min': 30,
-                'winnipeg jets': 52,            'wpg': 52,
-                'arizona coyotes': 53,          'ari': 53,
-                'vegas golden knights': 54,     'vgk': 54
-                }
+    """
+    Returns a dict mapping lower cased team names, triCodes and aliases to team
+    ids (see nhl.registry.resolve to resolve any of them directly).
+    """
+    return registry.team_map()
 
 
 def getTeamRoster(team_id, season=None, wait=0,
-                    base_url='https://statsapi.web.nhl.com/api/v1'):
+                    base_url=None, client=None):
     """
     Queries the NHL API for roster information for a given team
 
     Parameters
     ----------
-        team_id (int): nhl api team id number
-        base_url (str): base url to the nhl api
+        team_id (int or str): nhl api team id number, triCode or name (see
+            nhl.registry.resolve)
+        base_url (str): base url to the nhl api; defaults to the client's
+        client (NhlClient): client to make requests with; defaults to the
+            module-wide client
         season (str): season to request roster; defaults to using active roster
 
         wait : float (nonnegative, default=0)
@@ -98,38 +389,91 @@ def getTeamRoster(team_id, season=None, wait=0,
         }
     """
     # if season is not specified, assume it is the current season
-    if season is None:
-        season = requests.get(base_url + '/seasons/current').json()['seasons']
-        season = season[0]['seasonId']
+    season = resolve_season(season, base_url=base_url, client=client)
 
     if wait:
         # wait a moment to request additional data
         time.sleep(wait)
 
     # endpoint to request data from
-    endpoint_url = '/teams/{}/roster'.format(team_id)
+    endpoint_url = '/teams/{}/roster'.format(registry.resolve(team_id))
 
     if  season:
         # if we want data from a specific season
         endpoint_url += '?expand=team.roster&season={}'.format(season)
 
     # get team roster
-    team_roster = requests.get(base_url + endpoint_url).json()
+    team_roster = _get(endpoint_url, base_url, client)
 
     # extract player information
     return team_roster['roster']
 
 
+def getLeagueRosters(season=None, base_url=None, client=None, refresh=False):
+    """
+    Queries the NHL API for every team's roster with a single request.
+
+    Rosters are kept in memory per season; the rosters of a season in progress
+    are requested again once older than ROSTER_TTL seconds, those of past
+    seasons never are (and are cached forever).
+
+    Parameters
+    ----------
+    season : str ('YYYYYYYY', default : None)
+        Season to request rosters from; defaults to the current season.
+
+    base_url : str (default : None)
+        Base url to the NHL API; defaults to the client's base url.
+
+    client : nhl.client.NhlClient (default : None)
+        Client to make requests with; defaults to the module-wide client.
+
+    refresh : bool (default : False)
+        If True, ignore any rosters already in memory.
+
+    Returns
+    -------
+    rosters : dict
+        Maps team id to the team's roster (see getTeamRoster).
+    """
+    if client is None:
+        client = get_client()
+
+    season = str(resolve_season(season, base_url=base_url, client=client))
+    endpoint_url = f'/teams?expand=team.roster&season={season}'
+
+    key = client.url(endpoint_url, base_url)
+    now = time.monotonic()
+    past = _isPastSeason(season)
+
+    with _rosters_lock:
+        if not refresh and key in _rosters:
+            rosters, created = _rosters[key]
+            if past or now - created < ROSTER_TTL:
+                return rosters
+
+    data = _get(endpoint_url, base_url, client, final=lambda data: past)
+    rosters = {team['id']: team.get('roster', {}).get('roster', [])
+               for team in data.get('teams', [])}
+
+    with _rosters_lock:
+        _rosters[key] = (rosters, now)
+
+    return rosters
+
+
 def getGameIDs(team_id, season=None, include_pre=False, include_post=False,
-                include_future=True, base_url='https://statsapi.web.nhl.com/api/v1'):
+                include_future=True, base_url=None, client=None):
     """
     Queries the NHL API for a team's schedule and returns a list of each game_id.
-    Basically just wraps getSchedule and extracts only the game IDs.
+    Basically just looks the team up in the league schedule (see getLeagueSchedule)
+    and extracts only the game IDs.
 
     Parameters
     ----------
     team_id : str or int
-        Team's NHL API id number.
+        Team's NHL API id number, triCode or name (see nhl.registry.resolve).
+        If None, every game in the league.
 
     season : str or list-like ('YYYYYYYY' or (start_date, end_date), default: None)
         Season to request data from (e.g. '20192020'). If None, defaults to the
@@ -147,24 +491,25 @@ def getGameIDs(team_id, season=None, include_pre=False, include_post=False,
     include_future : bool (default : True)
         Whether to include future (i.e. unplayed/unfinished) games.
 
+    base_url : str (default : None)
+        Base url to the NHL API; defaults to the client's base url.
+
+    client : nhl.client.NhlClient (default : None)
+        Client to make requests with; defaults to the module-wide client.
+
     Returns
     -------
-    schedule : list(dicts)
-        List containing one dictionary per scheduled game for the entire season.
+    game_ids : list(int)
+        List containing the game id of each scheduled game for the entire season.
     """
-    # get the team's schedule
-    schedule = getSchedule(team_id, season=season, include_pre=include_pre,
-                           include_post=include_post, include_future=include_future,
-                           base_url=base_url)
-
-    # get the game id from each game
-    game_ids = [game['games'][0]['gamePk'] for game in schedule]
+    index = getLeagueSchedule(season, base_url=base_url, client=client)
 
-    return game_ids
+    return index.game_ids(team_id, include_pre=include_pre, include_post=include_post,
+                          include_future=include_future)
 
 
 def getPlayerStats(player_id, season=None, report_type='statsSingleSeason',
-                    wait=0, base_url='https://statsapi.web.nhl.com/api/v1'):
+                    wait=0, base_url=None, client=None):
     """
     Queries the NHL API for the stats of a player.
 
@@ -186,8 +531,11 @@ def getPlayerStats(player_id, season=None, report_type='statsSingleSeason',
             request to the API; not necessary unless making more then ~500+ requests
             a second.
 
-        base_url : str (default: 'https://statsapi.web.nhl.com/api/v1')
-            Base url to the NHL API
+        base_url : str (default: None)
+            Base url to the NHL API; defaults to the client's base url.
+
+        client : nhl.client.NhlClient (default: None)
+            Client to make requests with; defaults to the module-wide client.
 
     Returns
     -------
@@ -282,9 +630,7 @@ def getPlayerStats(player_id, season=None, report_type='statsSingleSeason',
     """
 
     # if season is not specified, assume it is the current season
-    if season is None:
-        season = requests.get(base_url + '/seasons/current').json()['seasons']
-        season = season[0]['seasonId']
+    season = resolve_season(season, base_url=base_url, client=client)
 
     time.sleep(wait)
 
@@ -292,21 +638,83 @@ def getPlayerStats(player_id, season=None, report_type='statsSingleSeason',
     endpoint_url = f'/people/{player_id}/stats?stats={report_type}&season={season}'
 
     # request player statistics
-    player_stats = requests.get(base_url + endpoint_url).json()
+    player_stats = _get(endpoint_url, base_url, client)
 
     # return the requested stats splits
     return player_stats['stats'][0]['splits']
 
 
+def getLeagueSchedule(season=None, base_url=None, client=None, refresh=False):
+    """
+    Queries the NHL API for the whole league's schedule with a single request and
+    returns it as a ScheduleIndex.
+
+    Indexes are kept in memory and reused by later calls (and by getSchedule and
+    getGameIDs for any team). An index is requested again once it is older than
+    SCHEDULE_TTL seconds, unless every game in it is already final.
+
+    Parameters
+    ----------
+    season : str or list-like ('YYYYYYYY' or (start_date, end_date), default: None)
+        Season to request data from (e.g. '20192020'). If None, defaults to the
+        current season.
+
+        If passing a list, should be of the form ("YYYY-MM-DD", "YYYY-MM-DD"),
+        with the first entry being the start date and the second the end date.
+
+    base_url : str (default : None)
+        Base url to the NHL API; defaults to the client's base url.
+
+    client : nhl.client.NhlClient (default : None)
+        Client to make requests with; defaults to the module-wide client.
+
+    refresh : bool (default : False)
+        If True, ignore any index already in memory.
+
+    Returns
+    -------
+    index : nhl.schedule.ScheduleIndex
+    """
+    if client is None:
+        client = get_client()
+
+    # if season is not specified, assume it is the current season
+    season = resolve_season(season, base_url=base_url, client=client)
+
+    # request schedule information
+    if isinstance(season, (str, int)):
+        endpoint_url = f'/schedule?season={season}'
+    else:
+        endpoint_url = f'/schedule?startDate={season[0]}&endDate={season[1]}'
+
+    key = client.url(endpoint_url, base_url)
+    now = time.monotonic()
+
+    with _schedules_lock:
+        if not refresh and key in _schedules:
+            index, created = _schedules[key]
+            if index.final or now - created < SCHEDULE_TTL:
+                return index
+
+    data = _get(endpoint_url, base_url, client, final=_isFinalSchedule)
+    index = ScheduleIndex(data.get('dates', []))
+
+    with _schedules_lock:
+        _schedules[key] = (index, now)
+
+    return index
+
+
 def getSchedule(team_id, season=None, include_pre=False, include_post=False,
-                include_future=True, base_url='https://statsapi.web.nhl.com/api/v1'):
+                include_future=True, base_url=None, client=None):
     """
     Queries the NHL API for a team's schedule.
 
     Parameters
     ----------
     team_id : str or int
-        Team's NHL API id number.
+        Team's NHL API id number, triCode or name (see nhl.registry.resolve).
+        If None, every game in the league.
 
     season : str or list-like ('YYYYYYYY' or (start_date, end_date), default: None)
         Season to request data from (e.g. '20192020'). If None, defaults to the
@@ -324,50 +732,25 @@ def getSchedule(team_id, season=None, include_pre=False, include_post=False,
     include_future : bool (default : True)
         Whether to include future (i.e. unplayed/unfinished) games.
 
+    base_url : str (default : None)
+        Base url to the NHL API; defaults to the client's base url.
+
+    client : nhl.client.NhlClient (default : None)
+        Client to make requests with; defaults to the module-wide client.
+
     Returns
     -------
     schedule : list(dicts)
         List containing one dictionary per scheduled game for the entire season.
     """
-    # if season is not specified, assume it is the current season
-    if season is None:
-        season = requests.get(base_url + '/seasons/current').json()['seasons']
-        season = season[0]['seasonId']
-
-    # request schedule information
-    if type(season) is str:
-        schedule = requests.get(base_url + f'/schedule?season={season}&teamId={team_id}')
-    else:
-        modifier = f'teamId={team_id}&startDate={season[0]}&endDate={season[1]}'
-        schedule = requests.get(base_url + f'/schedule?{modifier}')
-
-    schedule = schedule.json()['dates']
-
-    # filter out preseason/postseason/future games based on parameters
-    if not np.all([include_pre, include_post, include_future]):
-        for game_num in range(len(schedule))[::-1]:
-            # drill down to the level we care about
-            game = schedule[game_num]['games'][0]
+    # every team's schedule comes from the same (league-wide) index
+    index = getLeagueSchedule(season, base_url=base_url, client=client)
 
-            # if we don't want to include future games
-            if not include_future and game['status']['detailedState'] != 'Final':
-                schedule.pop(game_num) # remove from schedule
-                continue
+    return index.schedule(team_id, include_pre=include_pre, include_post=include_post,
+                          include_future=include_future)
 
-            # if include_pre is False, skip preseason games
-            if not include_pre and game['gameType'] == 'PR':
-                schedule.pop(game_num)
-                continue
 
-            # if include_post is False, skip postseason games
-            if not include_post and game['gameType'] == 'P':
-                schedule.pop(game_num)
-                continue
-
-    return schedule
-
-
-def getBoxScore(game_id, base_url='https://statsapi.web.nhl.com/api/v1'):
+def getBoxScore(game_id, base_url=None, client=None):
     """
     Queries the NHL API for the boxscore for game `game_id`.
 
@@ -376,8 +759,11 @@ def getBoxScore(game_id, base_url='https://statsapi.web.nhl.com/api/v1'):
     game_id : str
         NHL API game_id number for the desired game.
 
-    base_url : str
-        URL to the base of the NHL API
+    base_url : str (default : None)
+        URL to the base of the NHL API; defaults to the client's base url.
+
+    client : nhl.client.NhlClient (default : None)
+        Client to make requests with; defaults to the module-wide client.
 
     Returns
     -------
@@ -387,12 +773,12 @@ def getBoxScore(game_id, base_url='https://statsapi.web.nhl.com/api/v1'):
     away : dict
         dictionary containing away team information
     """
-    boxscore = requests.get(base_url + f'/game/{game_id}/boxscore').json()
+    boxscore = _get(f'/game/{game_id}/boxscore', base_url, client)
 
     return boxscore['teams']['home'], boxscore['teams']['away']
 
 
-def getLiveData(game_id, base_url='https://statsapi.web.nhl.com/api/v1'):
+def getLiveData(game_id, base_url=None, client=None):
     """
     Queries the NHL API for the live data feed of a game.
 
@@ -402,6 +788,12 @@ def getLiveData(game_id, base_url='https://statsapi.web.nhl.com/api/v1'):
         NHL API game_id. First four characters are the year the season started,
         the final six are unique to this game.
 
+    base_url : str (default : None)
+        Base url to the NHL API; defaults to the client's base url.
+
+    client : nhl.client.NhlClient (default : None)
+        Client to make requests with; defaults to the module-wide client.
+
     Returns
     -------
     live_data : dict (json-like)
@@ -448,9 +840,72 @@ def getLiveData(game_id, base_url='https://statsapi.web.nhl.com/api/v1'):
 
     """
     # request all the data
-    live_data = requests.get(base_url + f'/game/{game_id}/feed/live')
+    live_data = _get(f'/game/{game_id}/feed/live', base_url, client, final=_isFinalGame)
+
+    return live_data['liveData']
+
+
+def getLiveFeed(game_id, base_url=None, client=None, cache=True):
+    """
+    Queries the NHL API for the full live feed of a game, i.e. getLiveData along
+    with the feed's metaData (e.g. its timeStamp) and gameData.
+
+    Parameters
+    ----------
+    game_id : str or int (YYYYGGGGGG)
+        NHL API game_id.
+
+    base_url : str (default : None)
+        Base url to the NHL API; defaults to the client's base url.
+
+    client : nhl.client.NhlClient (default : None)
+        Client to make requests with; defaults to the module-wide client.
+
+    cache : bool (default : True)
+        If False, bypass the response cache (for games in progress).
+
+    Returns
+    -------
+    feed : dict (json-like)
+        Has the keys gamePk, link, metaData, gameData and liveData.
+    """
+    return _get(f'/game/{game_id}/feed/live', base_url, client, final=_isFinalGame,
+                cache=cache)
+
+
+def getLiveDiff(game_id, timecode, base_url=None, client=None):
+    """
+    Queries the NHL API for the changes to a game's live feed since `timecode`.
+
+    Parameters
+    ----------
+    game_id : str or int (YYYYGGGGGG)
+        NHL API game_id.
+
+    timecode : str ('YYYYMMDD_HHMMSS')
+        Timecode of the feed the changes apply to, i.e. its
+        feed['metaData']['timeStamp'].
+
+    base_url : str (default : None)
+        Base url to the NHL API; defaults to the client's base url.
+
+    client : nhl.client.NhlClient (default : None)
+        Client to make requests with; defaults to the module-wide client.
+
+    Returns
+    -------
+    patches : list(dicts) or None
+        Each patch has a 'diff' key, holding a list of JSON patch operations
+        (op, path and value); empty if nothing changed. None if the API did not
+        return a diff (e.g. an unknown timecode).
+    """
+    endpoint = f'/game/{game_id}/feed/live/diffPatch?startTimecode={timecode}'
+    patches = _get(endpoint, base_url, client, cache=False)
+
+    if not isinstance(patches, list):
+        return None
 
-    return live_data.json()['liveData']
+    return patches
 
 
 
@@ -0,0 +1,241 @@
+# cache.py
+"""
+On-disk response cache for the NHL API.
+
+Responses are stored as gzipped json files keyed by the full request url. Entries
+are split into two groups:
+
+    final   -   responses that can never change (e.g. the live feed of a game
+                whose status is 'Final'); these never expire
+    ttl     -   everything else (schedules, rosters, the current season, ...);
+                these expire after a configurable number of seconds (only a few
+                seconds for the live feeds of games in progress, see LIVE_TTL)
+
+The cache is bounded in size; once it grows past `max_bytes` the least recently
+used entries are evicted until it is back under the limit.
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+
+# seconds a live feed of a game in progress is kept; these change with every play
+LIVE_TTL = 5
+
+
+class DiskCache:
+
+    def __init__(self, path='~/.cache/nhl', ttl=3600, endpoint_ttl=None,
+                 max_bytes=2*1024**3):
+        """
+        Persistent cache for NHL API responses.
+
+        Parameters
+        ----------
+        path : str (default : '~/.cache/nhl')
+            Directory the cache lives in; created if it does not exist.
+
+        ttl : float (default : 3600)
+            Number of seconds a non-final response is kept before it expires.
+
+        endpoint_ttl : dict (default : None)
+            Per-endpoint overrides of `ttl`, keyed by a path segment of the
+            endpoint, e.g. {'seasons': 86400, 'schedule': 600, 'teams': 86400}.
+            The last segment with an override wins. Live feeds ('live') default
+            to LIVE_TTL.
+
+        max_bytes : int (default : 2GB)
+            Maximum size of the cache on disk. Least recently used entries are
+            evicted once this is exceeded.
+
+        Attributes
+        ----------
+        hits : int
+            Number of requests served from the cache.
+
+        misses : int
+            Number of requests not found (or expired) in the cache.
+        """
+        self.path = os.path.expanduser(path)
+        self.ttl = ttl
+        self.endpoint_ttl = {'live': LIVE_TTL, **(endpoint_ttl or {})}
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+
+        # total size on disk; computed lazily on the first write
+        self._size = None
+        self._lock = threading.Lock()
+
+        os.makedirs(self.path, exist_ok=True)
+
+    def _key(self, url):
+        return hashlib.sha1(url.encode('utf-8')).hexdigest()
+
+    def _file(self, url, final):
+        key = self._key(url)
+        group = 'final' if final else 'ttl'
+        return os.path.join(self.path, group, key[:2], key + '.json.gz')
+
+    def _ttl(self, url):
+        # last path segment with an override, so '/api/v1/game/ID/feed/live'
+        # matches 'live' before 'game'
+        segments = url.split('?')[0].split('/')
+        for segment in segments[::-1]:
+            if segment in self.endpoint_ttl:
+                return self.endpoint_ttl[segment]
+        return self.ttl
+
+    def _entries(self):
+        for group in ['final', 'ttl']:
+            for root, _, files in os.walk(os.path.join(self.path, group)):
+                for name in files:
+                    # skip entries still being written by `set`
+                    if name.endswith('.tmp'):
+                        continue
+                    yield os.path.join(root, name)
+
+    def get(self, url):
+        """
+        Looks up the cached response for `url`.
+
+        Returns
+        -------
+        data : dict (json-like) or None
+            The cached response, or None if it is not cached (or has expired).
+        """
+        now = time.time()
+        for final in [True, False]:
+            file = self._file(url, final)
+            try:
+                stat = os.stat(file)
+            except FileNotFoundError:
+                continue
+
+            # expired entries are removed and treated as misses
+            if not final and now - stat.st_mtime > self._ttl(url):
+                self._remove(file)
+                continue
+
+            try:
+                with gzip.open(file, 'rt', encoding='utf-8') as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                # partially written or corrupted entry
+                self._remove(file)
+                continue
+
+            # mark as recently used (keep mtime, which tracks the expiry)
+            os.utime(file, (now, stat.st_mtime))
+
+            with self._lock:
+                self.hits += 1
+            return data
+
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, url, data, final=False):
+        """
+        Stores the response `data` for `url`.
+
+        Parameters
+        ----------
+        url : str
+            Full request url (including the query string).
+
+        data : dict (json-like)
+            Response to store.
+
+        final : bool (default : False)
+            If True, the response never expires (it can still be evicted).
+        """
+        file = self._file(url, final)
+        os.makedirs(os.path.dirname(file), exist_ok=True)
+
+        # write to a temporary file first so readers never see partial entries
+        tmp = f'{file}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with gzip.open(tmp, 'wt', encoding='utf-8') as f:
+            json.dump(data, f)
+
+        old = os.path.getsize(file) if os.path.exists(file) else 0
+        os.replace(tmp, file)
+
+        # a response that became final supersedes any expiring copy
+        if final:
+            self._remove(self._file(url, False))
+
+        with self._lock:
+            if self._size is None:
+                self._size = sum(os.path.getsize(f) for f in self._entries())
+            else:
+                self._size += os.path.getsize(file) - old
+            over = self._size > self.max_bytes
+
+        if over:
+            self.evict()
+
+    def _remove(self, file):
+        try:
+            size = os.path.getsize(file)
+            os.remove(file)
+        except FileNotFoundError:
+            return
+        with self._lock:
+            if self._size is not None:
+                self._size -= size
+
+    def evict(self, max_bytes=None):
+        """
+        Removes least recently used entries until the cache is no larger than
+        `max_bytes` (defaults to self.max_bytes).
+        """
+        if max_bytes is None:
+            max_bytes = self.max_bytes
+
+        entries = []
+        for file in self._entries():
+            try:
+                stat = os.stat(file)
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_atime, stat.st_size, file))
+
+        size = sum(entry[1] for entry in entries)
+        # oldest access first
+        for _, entry_size, file in sorted(entries):
+            if size <= max_bytes:
+                break
+            try:
+                os.remove(file)
+            except FileNotFoundError:
+                pass
+            size -= entry_size
+
+        with self._lock:
+            self._size = size
+
+    def clear(self):
+        """
+        Removes every entry from the cache and resets the hit/miss counters.
+        """
+        self.evict(max_bytes=0)
+        with self._lock:
+            self.hits = 0
+            self.misses = 0
+
+    @property
+    def stats(self):
+        """
+        Dictionary with the hit/miss counters and the current size of the cache.
+        """
+        files = list(self._entries())
+        size = sum(os.path.getsize(f) for f in files)
+        with self._lock:
+            self._size = size
+            return {'hits': self.hits, 'misses': self.misses,
+                    'entries': len(files), 'bytes': size}
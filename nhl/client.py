@@ -0,0 +1,210 @@
+# client.py
+"""
+HTTP client shared by every request made to the NHL API.
+"""
+import threading
+import time
+
+BASE_URL = 'https://statsapi.web.nhl.com/api/v1'
+
+# responses worth retrying: rate limited, or a (probably transient) server error
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class NhlClient:
+
+    def __init__(self, base_url=BASE_URL, pool_size=10, timeout=(5, 30),
+                 headers=None, cache=None, session=None, retries=0, backoff=0.5,
+                 max_backoff=30):
+        """
+        Keep-alive HTTP client for the NHL API.
+
+        All requests go through a single requests.Session, so connections (and
+        their TLS handshakes) are reused across calls instead of being opened
+        once per request.
+
+        Parameters
+        ----------
+        base_url : str (default : 'https://statsapi.web.nhl.com/api/v1')
+            Base url to the NHL API.
+
+        pool_size : int (default : 10)
+            Maximum number of connections kept open per host. Should be at
+            least the number of threads making requests concurrently.
+
+        timeout : float or tuple (default : (5, 30))
+            Timeout (in seconds) passed to every request; either a single value
+            or a (connect, read) pair. None disables the timeout.
+
+        headers : dict (default : None)
+            Extra headers sent with every request. By default the client asks
+            for gzip compressed responses and json.
+
+        cache : nhl.cache.DiskCache (default : None)
+            Response cache to go through before making a request; None disables
+            caching.
+
+        session : requests.Session (default : None)
+            Session to use; a new one is created if not given. Any transport
+            adapters already mounted on it are left alone.
+
+        retries : int (default : 0)
+            Number of times a request is retried after a connection error, a
+            timeout or a RETRY_STATUSES response. The last error is raised once
+            they are used up.
+
+        backoff : float (default : 0.5)
+            Seconds to wait before the first retry, doubling with every retry
+            after it; a 429's Retry-After header (in seconds) is used instead
+            when present.
+
+        max_backoff : float (default : 30)
+            Maximum number of seconds to wait before a retry.
+
+        Attributes
+        ----------
+        requests : int
+            Number of requests actually sent over the network (retries
+            included).
+
+        retried : int
+            Number of retries made.
+        """
+        self.base_url = base_url.rstrip('/')
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.cache = cache
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+        self.requests = 0
+        self.retried = 0
+        self._lock = threading.Lock()
+
+        # requests is only imported once a client is actually needed, which
+        # keeps `import nhl` (and e.g. team id resolution) fast
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('https://', adapter)
+            session.mount('http://', adapter)
+
+        session.headers.update({'Accept-Encoding': 'gzip, deflate',
+                                'Accept': 'application/json',
+                                'Connection': 'keep-alive'})
+        if headers:
+            session.headers.update(headers)
+
+        self.session = session
+        self._retry_errors = (requests.ConnectionError, requests.Timeout)
+
+    def url(self, endpoint, base_url=None):
+        """
+        Returns the full url for `endpoint`.
+        """
+        if base_url is None:
+            base_url = self.base_url
+
+        return base_url + endpoint
+
+    def get(self, endpoint, base_url=None, final=None, cache=True):
+        """
+        Requests `endpoint` and returns the decoded json, going through the
+        response cache (if one is set).
+
+        Parameters
+        ----------
+        endpoint : str
+            Endpoint to request, including the query string (e.g. '/teams').
+
+        base_url : str (default : None)
+            Overrides the client's base url for this request.
+
+        final : callable (default : None)
+            Function of the decoded json returning True if the response can
+            never change again (and so should be cached forever).
+
+        cache : bool (default : True)
+            If False, always make the request, even if the response is cached
+            (e.g. for polling live games); final responses are still stored.
+
+        Returns
+        -------
+        data : dict (json-like)
+
+        Raises
+        ------
+        requests.HTTPError
+            If the (last) response has an error status; its body isn't decoded
+            (gateways often answer errors with html, or nothing at all).
+        """
+        url = self.url(endpoint, base_url)
+
+        if self.cache is not None and cache:
+            data = self.cache.get(url)
+            if data is not None:
+                return data
+
+        response = self._send(url)
+        # never decode (or cache) error responses
+        response.raise_for_status()
+        data = response.json()
+
+        if self.cache is not None:
+            final = final is not None and final(data)
+            if cache or final:
+                self.cache.set(url, data, final=final)
+
+        return data
+
+    def _send(self, url):
+        # requests `url`, retrying failed attempts (see RETRY_STATUSES) up to
+        # self.retries times
+        for attempt in range(self.retries + 1):
+            last = attempt == self.retries
+            try:
+                response = self.session.get(url, timeout=self.timeout)
+            except self._retry_errors:
+                if last:
+                    raise
+                retry_after = None
+            else:
+                if last or response.status_code not in RETRY_STATUSES:
+                    return response
+                retry_after = response.headers.get('Retry-After')
+            finally:
+                with self._lock:
+                    self.requests += 1
+
+            with self._lock:
+                self.retried += 1
+            time.sleep(self._delay(attempt, retry_after))
+
+    def _delay(self, attempt, retry_after=None):
+        # seconds to wait before retry number `attempt` (0 based)
+        try:
+            delay = float(retry_after)
+        except (TypeError, ValueError):
+            # no header, or an http date
+            delay = self.backoff * 2 ** attempt
+
+        return min(max(delay, 0), self.max_backoff)
+
+    def close(self):
+        """
+        Closes every pooled connection.
+        """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __repr__(self):
+        return f'NhlClient({self.base_url!r}, pool_size={self.pool_size})'
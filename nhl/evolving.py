@@ -0,0 +1,529 @@
+# evolving.py
+"""
+Catalog and loader for the evolving-hockey csv exports in data/evolving-hockey.
+
+File names encode what each file holds:
+
+    <TEAM>_game_log_<table>_<strength>_<season>.csv
+        table       -   on_ice, zones, other_box_score
+        strength    -   ev, pp, sh
+
+    std_<table>_<strength>_<measure>.csv
+        table       -   box_score, on_ice, zones
+        strength    -   all, ev, pp, sh, 5v5, 4v4, 5v4, ...
+        measure     -   totals, rates, percentages
+
+Catalog parses the names into an index, so any slice (teams x seasons x tables x
+strengths) can be loaded in parallel, with column projection and explicit
+(compact) dtypes. Loaded slices are cached in a binary (pickle) form that is
+invalidated as soon as any of the source files changes.
+
+The std tables all describe the same player seasons (EH_ID, Season, Team) at
+different strengths. StdMatrices aligns every one of them onto a single key
+index and keeps each (table, strength, measure) block as a memory-mapped float32
+matrix, so comparing players across strengths is array slicing:
+
+    std = load_std()
+    goals = std.get('G', '5v5')             # one value per player season
+    pp = std.get('G/60', 'pp', 'rates')     # aligned with goals
+"""
+import hashlib
+import json
+import os
+import pickle
+import re
+import shutil
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+_GAME_LOG = re.compile(r'^(?P<team>[A-Z.]{3})_game_log_(?P<table>on_ice|zones|other_box_score)'
+                       r'_(?P<strength>ev|pp|sh)_(?P<season>\d{8})\.csv$')
+_STD = re.compile(r'^std_(?P<table>box_score|on_ice|zones)_(?P<strength>[a-z0-9]+)'
+                  r'_(?P<measure>totals|rates|percentages)\.csv$')
+
+# evolving-hockey abbreviations that differ from the NHL's
+TEAM_CODES = {'L.A': 'LAK', 'N.J': 'NJD', 'S.J': 'SJS', 'T.B': 'TBL'}
+
+# dtypes of the identifying columns; every other column is a float32 metric
+KEY_DTYPES = {
+    # game logs ('-' on the season total row, hence the nullable integers)
+    'Team': 'str', 'Date': 'str', 'Game_ID': 'Int32', 'Season': 'str',
+    'Opponent': 'str', 'Is_Home': 'Int8',
+    # std tables (Age is missing for a few players)
+    'Player': 'str', 'EH_ID': 'str', 'Position': 'str', 'Shoots': 'str',
+    'Birthday': 'str', 'Age': 'float32',
+}
+
+# identify a row of a std table, and describe it (first seen value is kept)
+STD_KEYS = ['EH_ID', 'Season', 'Team']
+STD_ATTRIBUTES = ['Player', 'Position', 'Shoots', 'Birthday', 'Age']
+
+# which table a metric is taken from when several have it (e.g. GP, TOI)
+STD_TABLES = ['on_ice', 'box_score', 'zones']
+
+# made categorical once the files of a slice are concatenated
+CATEGORICAL = ['Team', 'Season', 'Opponent', 'Position', 'Shoots', 'table',
+               'strength', 'measure']
+
+
+def parse_filename(name):
+    """
+    Parses an evolving-hockey file name.
+
+    Returns
+    -------
+    info : dict or None
+        kind ('game_log' or 'std'), team, table, strength, season and measure
+        (None where not applicable); None if the name isn't recognized.
+    """
+    match = _GAME_LOG.match(name)
+    if match:
+        info = match.groupdict()
+        info.update({'kind': 'game_log', 'measure': None,
+                     'team': TEAM_CODES.get(info['team'], info['team'])})
+        return info
+
+    match = _STD.match(name)
+    if match:
+        info = match.groupdict()
+        info.update({'kind': 'std', 'team': None, 'season': None})
+        return info
+
+    return None
+
+
+def read_file(path, columns=None, totals=False):
+    """
+    Reads a single evolving-hockey csv with explicit dtypes (see KEY_DTYPES).
+
+    Parameters
+    ----------
+    path : str
+
+    columns : list(str) (default : None)
+        Columns to read (identifying columns are always read); None reads all.
+
+    totals : bool (default : False)
+        Whether to keep the season total row at the end of game logs.
+
+    Returns
+    -------
+    df : pd.DataFrame
+    """
+    usecols = None
+    if columns is not None:
+        wanted = set(columns) | set(KEY_DTYPES)
+        usecols = lambda column: column in wanted
+
+    # no need to read the header first: unknown columns default to float32
+    dtype = defaultdict(lambda: 'float32', KEY_DTYPES)
+    df = pd.read_csv(path, usecols=usecols, dtype=dtype, na_values=['-'])
+
+    if 'Date' in df.columns and not totals:
+        df = df[df['Date'] != 'Total']
+        for column in ['Game_ID', 'Is_Home']:
+            if column in df.columns and not df[column].hasnans:
+                df[column] = df[column].astype(KEY_DTYPES[column].lower())
+
+    return df
+
+
+def _read(args):
+    # (path, columns, totals, info) -> DataFrame with the file's info attached
+    path, columns, totals, info = args
+    df = read_file(path, columns=columns, totals=totals)
+    for key in ['table', 'strength', 'measure']:
+        if isinstance(info[key], str):
+            df[key] = info[key]
+    if info['kind'] == 'game_log':
+        df['Team'] = info['team']
+
+    return df
+
+
+class Catalog:
+
+    def __init__(self, root='data/evolving-hockey', cache_dir='~/.cache/nhl/evolving'):
+        """
+        Index over a directory of evolving-hockey csv files.
+
+        Parameters
+        ----------
+        root : str (default : 'data/evolving-hockey')
+            Directory holding the csv files.
+
+        cache_dir : str or None (default : '~/.cache/nhl/evolving')
+            Where loaded slices are cached; None disables caching.
+
+        Attributes
+        ----------
+        index : pd.DataFrame
+            One row per recognized file, with columns kind, team, table,
+            strength, season, measure and path.
+        """
+        self.root = root
+        self.cache_dir = None if cache_dir is None else os.path.expanduser(cache_dir)
+
+        rows = []
+        for name in sorted(os.listdir(root)):
+            info = parse_filename(name)
+            if info is not None:
+                info['path'] = os.path.join(root, name)
+                rows.append(info)
+
+        cols = ['kind', 'team', 'table', 'strength', 'season', 'measure', 'path']
+        self.index = pd.DataFrame(rows, columns=cols)
+
+    def select(self, kind='game_log', teams=None, seasons=None, tables=None,
+               strengths=None, measures=None):
+        """
+        Returns the rows of self.index matching every given filter. Each filter is
+        a single value or a list of values; None matches anything.
+        """
+        index = self.index[self.index.kind == kind]
+        filters = {'team': teams, 'season': seasons, 'table': tables,
+                   'strength': strengths, 'measure': measures}
+        for column, values in filters.items():
+            if values is None:
+                continue
+            if isinstance(values, (str, int)):
+                values = [values]
+            values = [TEAM_CODES.get(v, v) for v in values] if column == 'team' else values
+            index = index[index[column].isin([str(v) for v in values])]
+
+        return index
+
+    def load(self, kind='game_log', teams=None, seasons=None, tables=None,
+             strengths=None, measures=None, columns=None, totals=False, workers=8,
+             processes=False, cache=True):
+        """
+        Loads and concatenates every file matching the filters (see select).
+
+        Parameters
+        ----------
+        columns : list(str) (default : None)
+            Metric columns to read (identifying columns are always read).
+
+        totals : bool (default : False)
+            Whether to keep the season total rows of game logs.
+
+        workers : int (default : 8)
+            Number of files read in parallel.
+
+        processes : bool (default : False)
+            If True, read in a process pool instead of a thread pool.
+
+        cache : bool (default : True)
+            If True (and the catalog has a cache_dir), reuse/stores the result;
+            a cached result is only used if no source file changed since.
+
+        Returns
+        -------
+        df : pd.DataFrame
+            Rows of every file; `table`, `strength` (and `measure` for std files)
+            columns identify where each row came from.
+        """
+        selected = self.select(kind=kind, teams=teams, seasons=seasons, tables=tables,
+                               strengths=strengths, measures=measures)
+        paths = list(selected.path)
+        if not paths:
+            return pd.DataFrame()
+
+        mtimes = {path: os.stat(path).st_mtime_ns for path in paths}
+        key = hashlib.sha1(json.dumps([paths, columns, totals]).encode('utf-8')).hexdigest()
+
+        if cache and self.cache_dir is not None:
+            df = self._cached(key, mtimes)
+            if df is not None:
+                return df
+
+        jobs = [(row.path, columns, totals, row._asdict()) for row in selected.itertuples(index=False)]
+        Executor = ProcessPoolExecutor if processes else ThreadPoolExecutor
+        with Executor(max_workers=workers) as executor:
+            frames = list(executor.map(_read, jobs))
+
+        df = pd.concat(frames, ignore_index=True)
+        for column in CATEGORICAL:
+            if column in df.columns:
+                df[column] = df[column].astype('category')
+        for column in ['Team', 'Opponent']:
+            if column in df.columns:
+                df[column] = df[column].cat.rename_categories(
+                    lambda code: TEAM_CODES.get(code, code))
+
+        if cache and self.cache_dir is not None:
+            self._store(key, mtimes, df)
+
+        return df
+
+    def _cached(self, key, mtimes):
+        try:
+            with open(os.path.join(self.cache_dir, key + '.json')) as f:
+                if json.load(f) != mtimes:
+                    return None
+            with open(os.path.join(self.cache_dir, key + '.pkl'), 'rb') as f:
+                return pickle.load(f)
+        except (FileNotFoundError, ValueError, pickle.UnpicklingError, EOFError):
+            return None
+
+    def _store(self, key, mtimes, df):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        file = os.path.join(self.cache_dir, key)
+
+        # data first, manifest last (and both atomically), so a manifest always
+        # describes the data next to it
+        with open(file + '.pkl.tmp', 'wb') as f:
+            pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(file + '.pkl.tmp', file + '.pkl')
+        with open(file + '.json.tmp', 'w') as f:
+            json.dump(mtimes, f)
+        os.replace(file + '.json.tmp', file + '.json')
+
+
+class StdMatrices:
+
+    def __init__(self, path='~/.cache/nhl/evolving/std'):
+        """
+        Memory-mapped std tables, as written by StdMatrices.build.
+
+        Parameters
+        ----------
+        path : str (default : '~/.cache/nhl/evolving/std')
+            Directory the matrices were built in.
+
+        Attributes
+        ----------
+        keys : pd.DataFrame
+            One row per player season (STD_KEYS and STD_ATTRIBUTES); row i of
+            every matrix describes keys.iloc[i].
+
+        blocks : dict
+            Maps (table, strength, measure) to the block's metric columns.
+        """
+        self.path = os.path.expanduser(path)
+
+        with open(os.path.join(self.path, 'manifest.json')) as f:
+            self.manifest = json.load(f)
+        with open(os.path.join(self.path, 'keys.pkl'), 'rb') as f:
+            self.keys = pickle.load(f)
+
+        self.blocks = {}
+        # (strength, measure) -> {metric: (table, column number)}
+        self._metrics = {}
+        for name, block in self.manifest['blocks'].items():
+            key = (block['table'], block['strength'], block['measure'])
+            self.blocks[key] = block['columns']
+
+        for table in reversed(STD_TABLES):
+            for (table_, strength, measure), columns in self.blocks.items():
+                if table_ != table:
+                    continue
+                metrics = self._metrics.setdefault((strength, measure), {})
+                metrics.update({c: (table, j) for j, c in enumerate(columns)})
+
+        self._matrices = {}
+        self._index = None
+
+    @staticmethod
+    def _name(table, strength, measure):
+        return f'{table}_{strength}_{measure}'
+
+    @classmethod
+    def build(cls, catalog=None, path='~/.cache/nhl/evolving/std', workers=8):
+        """
+        Reads every std table of `catalog`, aligns them onto one key index and
+        writes one float32 matrix (column major, so each metric is contiguous)
+        per table.
+
+        Parameters
+        ----------
+        catalog : Catalog (default : None)
+            Catalog of the std files; defaults to Catalog().
+
+        path : str (default : '~/.cache/nhl/evolving/std')
+            Directory to write to; replaced as a whole once everything is written.
+
+        workers : int (default : 8)
+            Number of files read in parallel.
+
+        Returns
+        -------
+        std : StdMatrices
+        """
+        catalog = Catalog() if catalog is None else catalog
+        path = os.path.expanduser(path)
+        selected = catalog.select(kind='std')
+        infos = [row._asdict() for row in selected.itertuples(index=False)]
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            frames = list(executor.map(read_file, [info['path'] for info in infos]))
+
+        keys = pd.concat([df[STD_KEYS + STD_ATTRIBUTES] for df in frames], ignore_index=True)
+        keys = keys.drop_duplicates(STD_KEYS).sort_values(STD_KEYS, ignore_index=True)
+        index = pd.MultiIndex.from_frame(keys[STD_KEYS])
+
+        tmp = path + '.tmp'
+        shutil.rmtree(tmp, ignore_errors=True)
+        os.makedirs(tmp)
+
+        blocks = {}
+        for info, df in zip(infos, frames):
+            columns = [c for c in df.columns if c not in STD_KEYS + STD_ATTRIBUTES]
+            name = cls._name(info['table'], info['strength'], info['measure'])
+
+            matrix = np.lib.format.open_memmap(os.path.join(tmp, name + '.npy'), mode='w+',
+                                               dtype=np.float32, shape=(len(keys), len(columns)),
+                                               fortran_order=True)
+            matrix[:] = np.nan
+            rows = index.get_indexer(pd.MultiIndex.from_frame(df[STD_KEYS]))
+            matrix[rows] = df[columns].to_numpy(dtype=np.float32)
+            matrix.flush()
+            del matrix
+
+            blocks[name] = {'table': info['table'], 'strength': info['strength'],
+                            'measure': info['measure'], 'columns': columns}
+
+        for column in ['Season', 'Team', 'Position', 'Shoots']:
+            keys[column] = keys[column].astype('category')
+        keys['Team'] = keys['Team'].cat.rename_categories(lambda code: TEAM_CODES.get(code, code))
+
+        with open(os.path.join(tmp, 'keys.pkl'), 'wb') as f:
+            pickle.dump(keys, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        mtimes = {info['path']: os.stat(info['path']).st_mtime_ns for info in infos}
+        with open(os.path.join(tmp, 'manifest.json'), 'w') as f:
+            json.dump({'rows': len(keys), 'mtimes': mtimes, 'blocks': blocks}, f)
+
+        shutil.rmtree(path, ignore_errors=True)
+        os.replace(tmp, path)
+
+        return cls(path)
+
+    def stale(self, catalog=None):
+        """
+        Returns True if the std files of `catalog` (default: Catalog()) differ
+        from the ones the matrices were built from.
+        """
+        catalog = Catalog() if catalog is None else catalog
+        paths = catalog.select(kind='std').path
+        mtimes = {path: os.stat(path).st_mtime_ns for path in paths}
+
+        return mtimes != self.manifest['mtimes']
+
+    def block(self, table, strength='5v5', measure='totals'):
+        """
+        Returns the (read-only, memory-mapped) matrix of a std table; columns
+        are given by self.blocks[(table, strength, measure)].
+        """
+        key = (table, strength, measure)
+        if key not in self.blocks:
+            raise KeyError(f'no std table {self._name(*key)}')
+
+        matrix = self._matrices.get(key)
+        if matrix is None:
+            file = os.path.join(self.path, self._name(*key) + '.npy')
+            matrix = self._matrices[key] = np.load(file, mmap_mode='r')
+
+        return matrix
+
+    def get(self, metric, strength='5v5', kind='totals', table=None):
+        """
+        Returns one metric for every player season, without copying.
+
+        Parameters
+        ----------
+        metric : str
+            Column of the std table, e.g. 'G', 'xGF', 'OZS%'.
+
+        strength : str (default : '5v5')
+            e.g. 'all', 'ev', 'pp', 'sh', '5v5', '4v4'.
+
+        kind : str (default : 'totals')
+            'totals', 'rates' or 'percentages' (zones only).
+
+        table : str (default : None)
+            'on_ice', 'box_score' or 'zones'; by default the first of STD_TABLES
+            having the metric.
+
+        Returns
+        -------
+        values : np.ndarray (float32)
+            View of the memory-mapped matrix, aligned with self.keys (NaN where a
+            player season does not appear at that strength).
+        """
+        if table is None:
+            try:
+                table, j = self._metrics[(strength, kind)][metric]
+            except KeyError:
+                raise KeyError(f'no std metric {metric!r} at {strength} ({kind})') from None
+        else:
+            j = self.blocks[(table, strength, kind)].index(metric)
+
+        return self.block(table, strength, kind)[:, j]
+
+    def rows(self, eh_id=None, season=None, team=None):
+        """
+        Returns the row numbers of the player seasons matching every given
+        filter (a value or a list of values; None matches anything).
+        """
+        mask = np.ones(len(self.keys), dtype=bool)
+        for column, values in zip(STD_KEYS, [eh_id, season, team]):
+            if values is None:
+                continue
+            if isinstance(values, str):
+                values = [values]
+            mask &= self.keys[column].isin(values).to_numpy()
+
+        return np.flatnonzero(mask)
+
+    def frame(self, metrics, strengths=('5v5',), kind='totals', rows=None):
+        """
+        Gathers metrics at several strengths into one DataFrame.
+
+        Parameters
+        ----------
+        metrics : str or list(str)
+
+        strengths : str or list(str) (default : ('5v5',))
+
+        kind : str (default : 'totals')
+
+        rows : array-like (default : None)
+            Row numbers to keep (see rows); None keeps every player season.
+
+        Returns
+        -------
+        df : pd.DataFrame
+            Indexed by STD_KEYS, with (strength, metric) columns.
+        """
+        metrics = [metrics] if isinstance(metrics, str) else list(metrics)
+        strengths = [strengths] if isinstance(strengths, str) else list(strengths)
+        rows = slice(None) if rows is None else rows
+
+        if self._index is None:
+            self._index = pd.MultiIndex.from_frame(self.keys[STD_KEYS])
+
+        data = {(strength, metric): self.get(metric, strength, kind)[rows]
+                for strength in strengths for metric in metrics}
+
+        return pd.DataFrame(data, index=self._index[rows])
+
+
+def load_std(catalog=None, path='~/.cache/nhl/evolving/std', workers=8):
+    """
+    Returns the StdMatrices at `path`, (re)building them first if they are
+    missing or any std file changed since they were built.
+    """
+    catalog = Catalog() if catalog is None else catalog
+    try:
+        std = StdMatrices(path)
+    except FileNotFoundError:
+        return StdMatrices.build(catalog, path=path, workers=workers)
+
+    if std.stale(catalog):
+        return StdMatrices.build(catalog, path=path, workers=workers)
+
+    return std
@@ -1,12 +1,14 @@
 # game.py
+import gzip
+import json
 
-from nhl import api
+from nhl import api, parse, schema
 import numpy as np
 import pandas as pd
 
 class Game:
 
-    def __init__(self, game_id):
+    def __init__(self, game_id, client=None, base_url=None, live_data=None, lazy=False):
         """
         Class providing a high level object-oriented approach to working with game data.
 
@@ -15,6 +17,20 @@ class Game:
         game_id : str or int (default : None)
             Integer or string of the unique game id (gamePk) for the desired game.
 
+        client : nhl.client.NhlClient (default : None)
+            Client to make requests with; defaults to the module-wide client.
+
+        base_url : str (default : None)
+            Base url to the NHL API; defaults to the client's base url.
+
+        live_data : dict (default : None)
+            Already fetched live data (as returned by nhl.api.getLiveData); if
+            given, no request is made at instantiation.
+
+        lazy : bool (default : False)
+            If True, the live data is not requested until it (or anything derived
+            from it) is first accessed.
+
         Attributes
         ----------
         game_id : str
@@ -35,7 +51,8 @@ class Game:
         getShots : creates a nice dataframe of the shot data
 
         """
-        self._base_url = 'https://statsapi.web.nhl.com/api/v1'
+        self.client = client
+        self._base_url = base_url
 
         # if integer was passed, convert to string
         if game_id is not None:
@@ -43,17 +60,124 @@ class Game:
 
         self.game_id = game_id
 
-        self.live_data = self.getLiveData()
+        # private attributes
+        self._live_data = None
+        self._summary = None
+        self._agg_stats = None
+        self._shotData = None
+        self._DataFrame = None
+        self._play_index = None
+        self._partition = None
+        self._tables = {}
+        self._relabel = True
+
+        if live_data is not None:
+            self.live_data = live_data
+        elif not lazy:
+            self.getLiveData()
+
+    @classmethod
+    def from_live_data(cls, live_data, game_id=None, client=None, base_url=None):
+        """
+        Creates a Game from already fetched data, without making any requests.
+
+        Parameters
+        ----------
+        live_data : dict
+            Either the full /feed/live response or just its 'liveData' part (as
+            returned by nhl.api.getLiveData).
+
+        game_id : str or int (default : None)
+            Game id (gamePk); taken from the feed if it is a full response.
+            Required if only the 'liveData' part is given, which doesn't
+            include it.
+
+        client : nhl.client.NhlClient (default : None)
+            Client used if the live data is ever updated.
+
+        base_url : str (default : None)
+            Base url used if the live data is ever updated.
+
+        Returns
+        -------
+        game : Game
+
+        Raises
+        ------
+        ValueError
+            If no game id is given and the feed doesn't have one.
+        """
+        if 'liveData' in live_data:
+            if game_id is None:
+                game_id = live_data.get('gamePk')
+            live_data = live_data['liveData']
+
+        if game_id is None:
+            raise ValueError('no game id: pass game_id, or the full /feed/live response '
+                             '(with its gamePk)')
+
+        return cls(game_id, client=client, base_url=base_url, live_data=live_data)
+
+    @classmethod
+    def from_file(cls, path, game_id=None, client=None, base_url=None):
+        """
+        Creates a Game from a live feed saved as json (optionally gzipped).
+
+        Parameters
+        ----------
+        path : str
+            Path to the json file; see from_live_data for what it may contain.
+
+        game_id : str or int (default : None)
+            Game id (gamePk); taken from the file if it is a full response,
+            required otherwise.
 
+        Returns
+        -------
+        game : Game
+        """
+        opener = gzip.open if str(path).endswith('.gz') else open
+        with opener(path, 'rt', encoding='utf-8') as f:
+            live_data = json.load(f)
+
+        return cls.from_live_data(live_data, game_id=game_id, client=client,
+                                  base_url=base_url)
+
+    @property
+    def live_data(self):
+        # fetch on first access (lazy games)
+        if self._live_data is None:
+            self.getLiveData()
+
+        return self._live_data
+
+    @live_data.setter
+    def live_data(self, live_data):
+        self._live_data = live_data
+
+        # everything derived from the old data is now stale
+        self._summary = None
+        self._agg_stats = None
+        self._shotData = None
+        self._DataFrame = None
+        self._play_index = None
+        self._partition = None
+        self._tables = {}
+
+    def _getSummary(self):
+        if self._summary is not None:
+            return self._summary
+
+        summary = {}
         temp_home = self.live_data['boxscore']['teams']['home']
         temp_away = self.live_data['boxscore']['teams']['away']
-        self.home = temp_home['team']['triCode']
-        self.away = temp_away['team']['triCode']
-        self.home_id = temp_home['team']['id']
-        self.away_id = temp_away['team']['id']
+        summary['home'] = temp_home['team']['triCode']
+        summary['away'] = temp_away['team']['triCode']
+        summary['home_id'] = temp_home['team']['id']
+        summary['away_id'] = temp_away['team']['id']
 
-        self.home_goals = self.live_data['linescore']['teams']['home']['goals']
-        self.away_goals = self.live_data['linescore']['teams']['home']['goals']
+        summary['home_goals'] = self.live_data['linescore']['teams']['home']['goals']
+        summary['away_goals'] = self.live_data['linescore']['teams']['home']['goals']
 
         # bool for if the game is final (i.e. complete)
         temp_cur = self.live_data['plays']['currentPlay']
@@ -66,18 +190,40 @@ class Game:
         #     self.final = False
 
         # TODO: figure out what is happening with the final status...
-        self.final = True
+        summary['final'] = True
 
         # set winner
-        if not self.final:
-            self.winner = None
-        elif self.home_goals > self.away_goals:
-            self.winner = self.home
+        if not summary['final']:
+            summary['winner'] = None
+        elif summary['home_goals'] > summary['away_goals']:
+            summary['winner'] = summary['home']
         else:
-            self.winner = self.away
+            summary['winner'] = summary['away']
 
         # TODO: this isn't always the correct date (sometimes one day after...)
-        self.date = temp_cur['about']['dateTime'][:10]
+        summary['date'] = temp_cur['about']['dateTime'][:10]
+
+        self._summary = summary
+
+        return summary
+
+    home = property(lambda self: self._getSummary()['home'])
+    away = property(lambda self: self._getSummary()['away'])
+    home_id = property(lambda self: self._getSummary()['home_id'])
+    away_id = property(lambda self: self._getSummary()['away_id'])
+    home_goals = property(lambda self: self._getSummary()['home_goals'])
+    away_goals = property(lambda self: self._getSummary()['away_goals'])
+    final = property(lambda self: self._getSummary()['final'])
+    winner = property(lambda self: self._getSummary()['winner'])
+    date = property(lambda self: self._getSummary()['date'])
+
+    @property
+    def agg_stats(self):
+        """
+        Aggregate (boxscore) stats; one row for each team.
+        """
+        if self._agg_stats is not None:
+            return self._agg_stats
 
         # create aggregate (boxscore) stats dataframe
         _stats = self.live_data['boxscore']['teams']
@@ -101,11 +247,40 @@ class Game:
                 'blocked_shots_against', 'takeaways_for', 'takeaways_against',
                 'giveaways_for', 'giveaways_against', 'hits_for', 'hits_against']
 
-        self.agg_stats = pd.DataFrame([_home, _away], columns=cols)
+        self._agg_stats = pd.DataFrame([_home, _away], columns=cols)
 
-        # private attributes
-        self._shotData = None
-        self._DataFrame = None
+        return self._agg_stats
+
+    @classmethod
+    def many(cls, game_ids, concurrency=8, client=None, base_url=None):
+        """
+        Creates a Game for each of `game_ids`, fetching the live feeds
+        concurrently. Games are yielded as soon as their feed arrives, so they
+        are not necessarily in the order given.
+
+        Parameters
+        ----------
+        game_ids : iterable of str or int
+            NHL API game ids (gamePk).
+
+        concurrency : int (default : 8)
+            Maximum number of simultaneous requests.
+
+        client : nhl.client.NhlClient (default : None)
+            Client to make requests with; defaults to the module-wide client.
+
+        base_url : str (default : None)
+            Base url to the NHL API; defaults to the client's base url.
+
+        Yields
+        ------
+        game : Game
+        """
+        feeds = api.iter_live_data_many(game_ids, concurrency=concurrency,
+                                        client=client, base_url=base_url)
+        for game_id, live_data in feeds:
+            yield cls.from_live_data(live_data, game_id=game_id, client=client,
+                                     base_url=base_url)
 
     def getLiveData(self):
         """
@@ -119,7 +294,8 @@ class Game:
         """
 
         # request data
-        self.live_data = api.getLiveData(self.game_id, base_url=self._base_url)
+        self.live_data = api.getLiveData(self.game_id, base_url=self._base_url,
+                                         client=self.client)
 
         return self.live_data
 
@@ -144,89 +320,234 @@ class Game:
         # don't recompute the dataframe if we don't need to
         if not updateLiveData and self._shotData is not None:
             return self._shotData
-        # if live data update is requested
+        # if live data update is requested (this resets every cached table)
         elif updateLiveData:
             self.getLiveData()
 
+        # the shot rows (in play order) of just the columns needed, read as
+        # categorical codes; only the output columns are turned into objects
+        events = self._events()
+        rows = np.sort(self._rows(_SHOT_EVENTS))
+
+        role_one, roles_one = _codes(events['player_one_role'], rows)
+        role_two, roles_two = _codes(events['player_two_role'], rows)
+        name_one, names_one = _codes(events['player_one'], rows)
+        name_two, names_two = _codes(events['player_two'], rows)
+        one, two = names_one[name_one], names_two[name_two]
+
+        # shooter is the Shooter/Scorer, other is the Goalie/Blocker (if any)
+        shooter_one = np.isin(roles_one, ['Shooter', 'Scorer'])[role_one]
+        shooter_two = np.isin(roles_two, ['Shooter', 'Scorer'])[role_two]
+        shooter = np.where(shooter_one, one, np.where(shooter_two, two, None))
+        other_one = np.isin(roles_one, ['Goalie', 'Blocker'])[role_one]
+        other_two = np.isin(roles_two, ['Goalie', 'Blocker'])[role_two]
+        other = np.where(other_one, one, np.where(other_two, two, None))
+
+        # a play's team (player_one_team) is the shooting team, except on
+        # blocked shots, where it is the blocking team; shooterTeam is always
+        # the shooting team and otherTeam its opponent
+        event, labels = _codes(events['event'], rows)
+        blocked = (labels == 'blocked_shot')[event]
+        results = np.array([label.split('_')[0] if isinstance(label, str) else label
+                            for label in labels], dtype=object)
+        team_one, teams_one = _codes(events['player_one_team'], rows)
+        team_two, teams_two = _codes(events['player_two_team'], rows)
+        team_one, team_two = teams_one[team_one], teams_two[team_two]
+        shot_type, shot_types = _codes(events['secondary_type'], rows)
+
+        # flip the coordinates if it is an even period number
+        period = events['period'].to_numpy()[rows]
+        sign = np.where(period % 2 == 0, -1, 1)
+        x = events['x'].to_numpy()[rows].astype('float64') * sign
+        y = events['y'].to_numpy()[rows].astype('float64') * sign
+        coords = np.empty(len(rows), dtype=object)
+        for i in np.flatnonzero(~(np.isnan(x) | np.isnan(y))):
+            coords[i] = np.array([x[i], y[i]])
+
+        plays = self.live_data['plays']['allPlays']
+        period_time = [plays[i]['about']['periodTime'] for i in self._play_index[rows]]
+
+        self._shotData = pd.DataFrame({
+            'shooter': shooter,
+            'result': results[event],
+            'other': other,
+            'shotType': shot_types[shot_type],
+            'coords': coords,
+            'period': period,
+            'periodTime': period_time,
+            'shooterTeam': np.where(blocked, team_two, team_one),
+            'otherTeam': np.where(blocked, team_one, team_two)})
+
+        return self._shotData
+
+    def _events(self):
+        # parses the live feed (once) into the event table
+        if self._DataFrame is None:
+            plays = self.live_data['plays']['allPlays']
+            self._DataFrame, self._play_index = self._parsePlays(plays)
+
+        return self._DataFrame
+
+    def _parsePlays(self, plays, start=0):
+        # event table rows (and their positions in allPlays) of `plays`, which
+        # start at position `start` in allPlays
+
         # DataFrame column structure
-        cols = ['shooter', 'result', 'other', 'shotType', 'coords', 'period',
-                'periodTime', 'shooterTeam', 'otherTeam']
-
-        _data = []
-
-        shotIDs = ['SHOT', 'MISSED_SHOT', 'BLOCKED_SHOT', 'GOAL']
-        # find all the shots
-        for event in self.live_data['plays']['allPlays']:
-            # reset everything to None so we don't have accidental carry over
-            shooter, result, other, shotType, coords, period = [None]*6
-            periodTime, shooterTeam, otherTeam = [None]*3
-
-            # check if it is a shot
-            if event['result']['eventTypeId'] in shotIDs:
-                # get the shot result and make it lower case
-                result = event['result']['eventTypeId'].split('_')[0].lower()
-
-                # determine team affiliation
-                if result == 'blocked':
-                    otherTeam = event['team']['triCode']
-                    if self.home == otherTeam:
-                        shooterTeam = self.away
-                    else:
-                        shooterTeam = self.home
-                else:
-                    shooterTeam = event['team']['triCode']
-                    if self.home == shooterTeam:
-                        otherTeam = self.away
-                    else:
-                        otherTeam = self.home
-
-                # get relevant shot data
-                try:
-                    # i.e. wrist shot, snap shot, etc.
-                    shotType = event['result']['secondaryType']
-                except KeyError:
-                    shotType = None
-
-                try:
-                    coords = np.array(list(event['coordinates'].values()))
-                except KeyError:
-                    coords = None
-
-                period = event['about']['period']
-                periodTime = event['about']['periodTime']
-
-                # find who the involved players were (excludes assists on goals)
-                for p in event['players']:
-                    # finding shooter
-                    if p['playerType'] in ['Shooter', 'Scorer']:
-                        shooter = p['player']['fullName']
-                    # finding other player
-                    if p['playerType'] in ['Goalie', 'Blocker']:
-                        other = p['player']['fullName']
-
-                # flip the coordinates if it is an even period number
-                if period%2 == 0:
-                    try:
-                        coords = -coords
-                    except IndexError or TypeError:
-                        pass
-
-                # append to list that will become the dataframe
-                vals = [shooter, result, other, shotType, coords, period,
-                        periodTime, shooterTeam, otherTeam]
-                _data.append(vals)
-
-        return pd.DataFrame(_data, columns=cols)
+        cols = ['event', 'secondary_type', 'player_one', 'player_one_role',
+                'player_two', 'player_two_role', 'x', 'y', 'period',
+                'period_time_remaining', 'player_one_team', 'player_two_team',
+                'home_team', 'home_team_id', 'away_team', 'away_team_id',
+                'home_goals', 'away_goals', 'game_winning', 'empty_net',
+                'player_one_id', 'player_two_id', 'game_id', 'winning_team',
+                'date', 'description']
+
+        # extract every play into (preallocated) columns in a single pass
+        data = parse.extract_events(plays, self.home, self.away)
+        # position of each row's play in allPlays
+        play_index = data.pop('index') + start
+
+        # game level columns are the same for every play
+        data.update(self._constantColumns(len(play_index)))
+
+        # the columns already have the compact types of nhl.schema
+        return pd.DataFrame(data, columns=cols), play_index
+
+    def _constantColumns(self, n):
+        # game level columns of an event table with n rows
+        return parse.constant_columns(n, {
+            'home_team': self.home, 'home_team_id': self.home_id,
+            'away_team': self.away, 'away_team_id': self.away_id,
+            'game_id': self.game_id, 'winning_team': self.winner, 'date': self.date})
+
+    def appendPlays(self, live_data):
+        """
+        Moves the game on to `live_data`, a newer live feed of the same game
+        whose allPlays starts with the plays the game already has. Only the new
+        plays are parsed; they are appended to the event table.
+
+        Parameters
+        ----------
+        live_data : dict
+            The newer live data (see getLiveData).
+
+        Returns
+        -------
+        new : pd.DataFrame
+            The rows added to the event table.
+        """
+        n = len(self._live_data['plays']['allPlays']) if self._live_data is not None else 0
+        events = self._DataFrame
+
+        # not through the live_data setter: the event table stays valid
+        self._live_data = live_data
+        self._summary = None
+        self._agg_stats = None
+        self._shotData = None
+        self._partition = None
+        self._tables = {}
+
+        if events is None:
+            return self._events()
+
+        new, play_index = self._parsePlays(live_data['plays']['allPlays'][n:], start=n)
+        new.index = pd.RangeIndex(len(events), len(events) + len(new))
+
+        events = schema.concat([events, new]) if len(new) else events
+        # the date and winner move on while the game is played; every row gets
+        # the current ones, as a full parse of this feed would give
+        events = events.assign(**self._constantColumns(len(events)))
+
+        self._DataFrame = events
+        self._play_index = np.concatenate([self._play_index, play_index])
+
+        return events.iloc[len(events) - len(new):]
+
+    def _rows(self, events):
+        # row positions of `events` (in that order) in the event table; the
+        # table is partitioned by event once, from the event codes
+        if self._partition is None:
+            event = self._events()['event'].array
+            order = np.argsort(event.codes, kind='stable')
+            bounds = np.searchsorted(event.codes[order], np.arange(len(event.categories) + 1))
+            self._partition = {label: order[bounds[code]:bounds[code + 1]]
+                               for code, label in enumerate(event.categories)
+                               if bounds[code] < bounds[code + 1]}
+
+        empty = np.array([], dtype=np.intp)
+        return np.concatenate([self._partition.get(event, empty) for event in events])
+
+    def _table(self, name):
+        # builds (and caches) one of the derived event tables
+        table = self._tables.get(name)
+        if table is not None:
+            return table
+
+        events = self._events()
+        relabel = self._relabel
+
+        if name == 'shots':
+            table = events.iloc[self._rows(_SHOT_EVENTS)]
+
+        elif name == 'penalties':
+            table = events.iloc[self._rows(['penalty'])]
+            table = table.drop(columns=['empty_net', 'game_winning'])
+
+            if relabel:
+                col_relabel = {'secondary_type': 'penalty', 'player_one': 'penalty_on',
+                               'player_two': 'drew_by', 'player_one_team': 'penalty_team',
+                               'player_two_team': 'drew_by_team', 'player_one_id': 'penalty_on_id',
+                               'player_two_id': 'drew_by_id'}
+
+                table = table.rename(columns=col_relabel)
+                table = table.drop(columns=['player_one_role', 'player_two_role'])
+
+        elif name == 'turnovers':
+            table = events.iloc[self._rows(['giveaway', 'takeaway'])]
+            table = table.drop(columns=['secondary_type', 'empty_net', 'game_winning',
+                                        'player_one_role', 'player_two', 'player_two_role',
+                                        'player_two_id'])
+
+        elif name == 'hits':
+            table = events.iloc[self._rows(['hit'])]
+            table = table.drop(columns=['secondary_type', 'empty_net', 'game_winning'])
+
+            if relabel:
+                col_relabel = {'player_one': 'hitter', 'player_two': 'hittee',
+                               'player_one_team': 'hitter_team', 'player_two_team': 'hittee_team',
+                               'player_one_id': 'hitter_id', 'player_two_id': 'hittee_id'}
+
+                table = table.rename(columns=col_relabel)
+                table = table.drop(columns=['player_one_role', 'player_two_role'])
+
+        self._tables[name] = table
+
+        return table
+
+    # derived tables, built from the event table on first access
+    shot_data = property(lambda self: self._table('shots'))
+    penalty_data = property(lambda self: self._table('penalties'))
+    turnover_data = property(lambda self: self._table('turnovers'))
+    hit_data = property(lambda self: self._table('hits'))
 
     def makeDataFrames(self, relabel=True, updateLiveData=False):
         """
         Method for sorting through basically all the relevant live data.
 
+        The live feed is parsed once into the event table returned here; the
+        shot_data, penalty_data, turnover_data and hit_data tables are built
+        from it when first accessed.
+
         NOTE: this function does NOT automatically flip the coordinates for events
-        during the second period (or even numbered OT periods).
+        during the second period (or even numbered OT periods). Coordinates are
+        given as float columns `x` and `y` (NaN where missing), and every table
+        uses the compact column types defined in nhl.schema.
 
         Parameters
         ----------
+        relabel : bool (default : True)
+            If True, the penalty and hit tables get descriptive column names
+            (e.g. 'penalty_on', 'hitter') instead of player_one/player_two.
+
         updateLiveData : bool (default : False)
             If True, this runs getLiveData before getting the data.
 
@@ -236,154 +557,25 @@ class Game:
 
 
         """
-        # don't recompute the dataframe if we don't need to
-        if not updateLiveData and self._DataFrame is not None:
-            return self._DataFrame
-        # if live data update is requested
-        elif updateLiveData:
+        # if live data update is requested (this resets every cached table)
+        if updateLiveData:
             self.getLiveData()
 
-        # DataFrame column structure
-        cols = ['event', 'secondary_type', 'player_one', 'player_one_role',
-                'player_two', 'player_two_role', 'coords', 'period',
-                'period_time_remaining', 'player_one_team', 'player_two_team',
-                'home_team', 'home_team_id', 'away_team', 'away_team_id',
-                'home_goals', 'away_goals', 'game_winning', 'empty_net',
-                'player_one_id', 'player_two_id', 'game_id', 'winning_team',
-                'date', 'description']
+        if relabel != self._relabel:
+            self._relabel = relabel
+            self._tables = {}
+
+        return self._events()
+
+
+# shot events, in the order shot_data lists them
+_SHOT_EVENTS = ['shot', 'missed_shot', 'blocked_shot', 'goal']
+
+
+def _codes(column, rows):
+    # (codes, values) of the `rows` of a categorical column: values[codes] are
+    # its values as objects (NaN where missing, i.e. where the code is -1)
+    values = column.array
+    categories = np.append(np.asarray(values.categories, dtype=object), np.nan)
 
-        weird_events = {'Unknown', 'Period Start', 'Period End', 'Game End', 'Game Scheduled',
-                        'Period Ready', 'Period Official', 'Early Intermission Start',
-                        'Early Intermission End', 'Game Official', 'Shootout Complete'}
-
-        other_events = {'Stoppage', 'Sub', 'Fight', 'Emergency Goaltender', 'Official Challenge'}
-
-        game_events = {'Faceoff', 'Hit', 'Giveaway', 'Goal', 'Shot', 'Missed Shot', 'Penalty',
-                       'Takeaway', 'Blocked Shot'}
-
-        _data = []
-        for play in self.live_data['plays']['allPlays']:
-            if play['result']['event'] in weird_events:
-                continue
-            elif play['result']['event'] in other_events:
-                # for now just ignore these
-                continue
-            # just so we do not have any accidental carry over
-            event, secondary_type, player_one, player_two = [None]*4
-            player_one_role, player_two_role, coords, period = [None]*4
-            period_time_remaining, player_one_team, player_two_team = [None]*3
-            description, home_goals, away_goals, game_winning, empty_net = [None]*5
-            player_one_id, player_two_id = None, None
-
-            # now collect and organize the data......
-            event = play['result']['eventTypeId'].lower()
-            description = play['result']['description']
-            period = play['about']['period']
-            period_time_remaining = play['about']['periodTimeRemaining']
-            _score = play['about']['goals']
-            home_goals, away_goals = _score['home'], _score['away']
-
-            try:
-                coords = np.array(list(play['coordinates'].values()))
-            except KeyError:
-                coords = np.nan
-            try:
-                empty_net = play['result']['emptyNet']
-                game_winning = play['result']['gameWinningGoal']
-            except KeyError:
-                empty_net = None
-                game_winning = None
-
-            try:
-                strength = play['result']['strength']['name'].lower()
-            except KeyError:
-                strength = None
-
-            try:
-                secondary_type = play['result']['secondaryType']
-            except KeyError:
-                secondary_type = None
-
-            try:
-                player_one = play['players'][0]['player']['fullName']
-                player_one_id = int(play['players'][0]['player']['id'])
-                player_one_role = play['players'][0]['playerType']
-
-                if empty_net:
-                    pass
-                elif play['players'][-1]['player']['fullName'] == player_one:
-                    player_two = None
-                    player_two_id = None
-                    player_two_role = None
-                else:
-                    _temp = play['players'][-1]['player']
-                    player_two = _temp['fullName']
-                    player_two_id = int(_temp['id'])
-                    player_two_role = play['players'][-1]['playerType']
-
-            except KeyError:
-                player_one, player_one_id, player_one_role = [None]*3
-                player_two, player_two_id, player_two_role = [None]*3
-
-            player_one_team = play['team']['triCode']
-            if self.home == player_one_team:
-                player_two_team = self.away
-            else:
-                player_two_team = self.home
-
-
-            vals = [event, secondary_type, player_one, player_one_role]
-            vals += [player_two, player_two_role, coords, period]
-            vals += [period_time_remaining, player_one_team, player_two_team]
-            vals += [self.home, self.home_id, self.away, self.away_id]
-            vals += [home_goals, away_goals, game_winning, empty_net]
-            vals += [player_one_id, player_two_id, self.game_id, self.winner]
-            vals += [self.date, description]
-
-            _data.append(vals)
-
-        self._DataFrame = pd.DataFrame(_data, columns=cols)
-
-        # filter for shots
-        _shot_events = ['shot', 'missed_shot', 'blocked_shot', 'goal']
-        _shot_data = [self._DataFrame[self._DataFrame.event == event].copy()
-                        for event in _shot_events]
-        self.shot_data = pd.concat(_shot_data)
-
-        # filter for penalties
-        self.penalty_data = self._DataFrame[self._DataFrame.event == 'penalty'].copy()
-        self.penalty_data.drop(['empty_net', 'game_winning'], axis=1, inplace=True)
-
-        if relabel:
-            col_relabel = {'secondary_type': 'penalty', 'player_one': 'penalty_on',
-                           'player_two': 'drew_by', 'player_one_team': 'penalty_team',
-                           'player_two_team': 'drew_by_team', 'player_one_id': 'penalty_on_id',
-                           'player_two_id': 'drew_by_id'}
-
-            self.penalty_data.rename(columns=col_relabel, inplace=True)
-            self.penalty_data.drop(['player_one_role', 'player_two_role'], axis=1, inplace=True)
-
-
-        # filter for giveaways and takeaways
-        _turnover = [self._DataFrame[self._DataFrame.event == _].copy()
-                        for _ in ['giveaway', 'takeaway']]
-        self.turnover_data = pd.concat(_turnover)
-        self.turnover_data.drop(['secondary_type', 'empty_net', 'game_winning',
-                                 'player_one_role', 'player_two', 'player_two_role',
-                                 'player_two_id'], axis=1, inplace=True)
-        self.turnover_data.rename({'player_two_team': 'other_team'}, inplace=True)
-
-
-        # extract hit data
-        self.hit_data = self._DataFrame[self._DataFrame.event == 'hit'].copy()
-        self.hit_data.drop(['secondary_type', 'empty_net', 'game_winning'], axis=1, inplace=True)
-
-        if relabel:
-            col_relabel = {'player_one': 'hitter', 'player_two': 'hittee',
-                           'player_one_team': 'hitter_team', 'player_two_team': 'hittee_team',
-                           'player_one_id': 'hitter_id', 'player_two_id': 'hittee_id'}
-
-            self.hit_data.rename(columns=col_relabel, inplace=True)
-            self.hit_data.drop(['player_one_role', 'player_two_role'], axis=1, inplace=True)
-
-        return None
+    return values.codes[rows], categories
@@ -0,0 +1,370 @@
+# index.py
+"""
+Player-centric inverted index over the event tables.
+
+PlayerIndex maps every player id, in either player role (player_one_id or
+player_two_id, or their relabeled names, e.g. hitter_id/hittee_id), to the row
+positions of that player's events in the shots, hits, penalties and turnovers
+tables. It also maps normalized player names to ids. The index is built once,
+when the tables are loaded, and updated in place as games are appended, so a
+player's events across seasons are gathered by position instead of scanning
+(and string comparing) whole tables:
+
+    index = PlayerIndex.from_store(store)
+    shots = index.get('Auston Matthews', 'shots', season=['20162017', '20172018'])
+
+Pass the index to nhl.ingest.ingest_season to keep it up to date with the store.
+"""
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+from nhl import schema
+
+TABLES = ['shots', 'hits', 'penalties', 'turnovers']
+
+# role -> id columns holding it (the relabeled names of Game.makeDataFrames too)
+ROLES = {'one': ['player_one_id', 'penalty_on_id', 'hitter_id'],
+         'two': ['player_two_id', 'drew_by_id', 'hittee_id']}
+
+# appended segments kept before the postings are rebuilt as one
+_MAX_SEGMENTS = 8
+
+
+def normalize_name(name):
+    """
+    Returns `name` lower cased, without accents, punctuation or extra spaces
+    (e.g. 'Pierre-Luc Dubois' -> 'pierre luc dubois').
+    """
+    name = unicodedata.normalize('NFKD', str(name))
+    name = ''.join(c for c in name if not unicodedata.combining(c))
+    name = re.sub(r'[^a-z0-9]+', ' ', name.lower())
+
+    return name.strip()
+
+
+def _postings(ids, positions):
+    # CSR postings: sorted unique ids, offsets into positions (grouped by id)
+    valid = ids >= 0
+    ids, positions = ids[valid], positions[valid]
+    order = np.argsort(ids, kind='stable')
+    ids, positions = ids[order], positions[order]
+    keys, starts = np.unique(ids, return_index=True)
+    offsets = np.append(starts, len(ids)).astype(np.int64)
+
+    return keys, offsets, positions
+
+
+class _Table:
+    # one table's rows (kept as appended chunks, merged like the postings once
+    # there are more than _MAX_SEGMENTS) and postings per role
+
+    def __init__(self):
+        self.chunks = []
+        self.arrays = []
+        self.starts = []
+        self.n = 0
+        self.ids = {role: [] for role in ROLES}
+        self.seasons = []
+        self.segments = {role: [] for role in ROLES}
+        self._columns = None
+
+    def append(self, df):
+        positions = np.arange(self.n, self.n + len(df), dtype=np.int64)
+        for role, columns in ROLES.items():
+            column = next((c for c in columns if c in df.columns), None)
+            if column is None:
+                ids = np.full(len(df), -1, dtype=np.int64)
+            else:
+                ids = df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+                ids = np.where(np.isnan(ids), -1, ids).astype(np.int64)
+            self.ids[role].append(ids)
+            self.segments[role].append(_postings(ids, positions))
+
+            if len(self.segments[role]) > _MAX_SEGMENTS:
+                ids = np.concatenate(self.ids[role])
+                self.ids[role] = [ids]
+                self.segments[role] = [_postings(ids, np.arange(len(ids), dtype=np.int64))]
+
+        self.seasons.append(df['game_id'].to_numpy(dtype=np.int64) // 1000000)
+        if len(self.seasons) > _MAX_SEGMENTS:
+            self.seasons = [np.concatenate(self.seasons)]
+
+        self.chunks.append(df)
+        self.starts.append(self.n)
+        self.n += len(df)
+        if len(self.chunks) > _MAX_SEGMENTS or not df.columns.equals(self.chunks[0].columns):
+            self.chunks = [schema.concat(self.chunks)]
+            self.starts = [0]
+            self.arrays = []
+        # every chunk's columns, as arrays
+        self.arrays += [{column: chunk[column].array for column in chunk.columns}
+                        for chunk in self.chunks[len(self.arrays):]]
+        self._columns = None
+
+    def rows(self, player_id, role):
+        found = []
+        for keys, offsets, positions in self.segments[role]:
+            i = np.searchsorted(keys, player_id)
+            if i < len(keys) and keys[i] == player_id:
+                found.append(positions[offsets[i]:offsets[i + 1]])
+
+        return found
+
+    def take(self, positions):
+        # the rows at (sorted) `positions`, gathered column by column from the
+        # chunks they fall in (the table is never concatenated to answer a query)
+        if not self.chunks:
+            return pd.DataFrame()
+        if len(self.chunks) == 1:
+            return self.chunks[0].iloc[positions]
+
+        bounds = np.searchsorted(positions, self.starts + [self.n])
+        gathered = [(k, positions[bounds[k]:bounds[k + 1]] - start)
+                    for k, start in enumerate(self.starts) if bounds[k] < bounds[k + 1]]
+        gathered = gathered or [(0, positions)]
+
+        columns = {}
+        for column, (arrays, dtype, codes) in self.columns().items():
+            if codes is not None:
+                # categorical: chunk codes -> codes of the whole table's categories
+                columns[column] = pd.Categorical.from_codes(
+                    np.concatenate([codes[k][arrays[k].codes[rows]] for k, rows in gathered]),
+                    dtype=dtype)
+            else:
+                # (_concat_same_type is part of the ExtensionArray interface)
+                taken = [arrays[k].take(rows) for k, rows in gathered]
+                columns[column] = type(taken[0])._concat_same_type(taken)
+        index = self.chunks[0].index[:0].append([self.chunks[k].index[rows]
+                                                 for k, rows in gathered])
+
+        df = pd.DataFrame(columns, index=index, copy=False)
+        df.columns = self.chunks[0].columns
+
+        return df
+
+    def columns(self):
+        # {column: (arrays, dtype, codes)}: the column's array in every chunk,
+        # its dtype in the chunks concatenated (see schema.concat) and, for
+        # categorical columns, per chunk the array mapping the chunk's codes to
+        # codes of that dtype (-1 included, as the last entry)
+        if self._columns is None:
+            self._columns = {}
+            frame_dtypes = [chunk.dtypes for chunk in self.chunks]
+            for column, dtype in frame_dtypes[0].items():
+                arrays = [chunk_arrays[column] for chunk_arrays in self.arrays]
+                dtypes = [chunk_dtypes[column] for chunk_dtypes in frame_dtypes]
+                codes = None
+                if all(isinstance(d, pd.CategoricalDtype) for d in dtypes):
+                    if any(d != dtype for d in dtypes):
+                        # all-missing columns have no categories; skip them
+                        empty = [pd.Categorical([], dtype=d) for d in dtypes
+                                 if len(d.categories)]
+                        categories = union_categoricals(
+                            empty or [pd.Categorical([], dtype=dtype)],
+                            sort_categories=True).categories
+                        dtype = pd.CategoricalDtype(categories)
+                    codes = [np.append(dtype.categories.get_indexer(d.categories), -1)
+                             for d in dtypes]
+                elif any(d != dtype for d in dtypes):
+                    # e.g. a column missing (so of another dtype) in some games
+                    dtype = pd.concat([chunk[column].iloc[:0] for chunk in self.chunks]).dtype
+                    arrays = [chunk[column].astype(dtype).array for chunk in self.chunks]
+                self._columns[column] = (arrays, dtype, codes)
+
+        return self._columns
+
+
+class PlayerIndex:
+
+    def __init__(self, tables=None):
+        """
+        Inverted index from players to their rows in the event tables.
+
+        Parameters
+        ----------
+        tables : dict (default : None)
+            Maps table name (see TABLES) to its DataFrame (e.g. EventStore.read,
+            or the shot_data/hit_data/... of many games concatenated); the
+            tables must have a game_id column.
+
+        Attributes
+        ----------
+        names : dict
+            Maps normalized player name to the set of ids seen with that name.
+        """
+        self.tables = {table: _Table() for table in TABLES}
+        self.names = {}
+
+        if tables is not None:
+            self.append(tables)
+
+    @classmethod
+    def from_store(cls, store, season=None):
+        """
+        Builds the index over the tables of an nhl.store.EventStore.
+
+        Parameters
+        ----------
+        store : nhl.store.EventStore
+
+        season : str or list(str) (default : None)
+            Season(s) to load; None loads every season.
+        """
+        tables = {}
+        for table in TABLES:
+            df = store.read(table, season=season)
+            if 'game_id' in df.columns:
+                tables[table] = df.drop(columns=['season'], errors='ignore')
+
+        return cls(tables)
+
+    @classmethod
+    def from_games(cls, games):
+        """
+        Builds the index over the tables of nhl.game.Game objects.
+        """
+        index = cls()
+        for game in games:
+            index.append_game(game)
+
+        return index
+
+    def append(self, tables):
+        """
+        Appends rows to the indexed tables (e.g. a batch of newly ingested
+        games); only the new rows are indexed.
+
+        Parameters
+        ----------
+        tables : dict
+            Maps table name to the DataFrame of rows to append; tables not in
+            TABLES (e.g. 'games') are ignored.
+        """
+        for table, df in tables.items():
+            if table not in self.tables or not len(df):
+                continue
+            self.tables[table].append(df)
+            self._add_names(df)
+
+    def append_game(self, game):
+        """
+        Appends every table of an nhl.game.Game.
+        """
+        game_id = int(game.game_id)
+        self.append({'shots': game.shot_data.assign(game_id=game_id),
+                     'hits': game.hit_data.assign(game_id=game_id),
+                     'penalties': game.penalty_data.assign(game_id=game_id),
+                     'turnovers': game.turnover_data.assign(game_id=game_id)})
+
+    def _add_names(self, df):
+        for name, id_ in schema.PLAYER_COLUMNS:
+            if name not in df.columns or id_ not in df.columns:
+                continue
+            pairs = df[[name, id_]].dropna().drop_duplicates()
+            for player, player_id in zip(pairs[name].astype(str), pairs[id_].astype(int)):
+                self.names.setdefault(normalize_name(player), set()).add(int(player_id))
+
+    def ids(self, name):
+        """
+        Returns the (sorted) ids of every player seen with `name` (there may be
+        more than one, e.g. two players named Sebastian Aho).
+        """
+        return sorted(self.names.get(normalize_name(name), ()))
+
+    def _player_id(self, player):
+        if isinstance(player, str) and not player.isdigit():
+            ids = self.ids(player)
+            if not ids:
+                raise KeyError(f'unknown player {player!r}')
+            if len(ids) > 1:
+                raise KeyError(f'{player!r} is ambiguous, use one of the ids {ids}')
+            return ids[0]
+
+        return int(player)
+
+    def rows(self, player, table, role=None, season=None):
+        """
+        Returns the (sorted) row positions of `player`'s events in `table`.
+
+        Parameters
+        ----------
+        player : int or str
+            Player id, or player name (see ids).
+
+        table : str
+            One of TABLES.
+
+        role : str (default : None)
+            'one' (player_one_id, e.g. the shooter or hitter), 'two'
+            (player_two_id, e.g. the goalie, blocker or hittee), or None for
+            either.
+
+        season : str or list(str) (default : None)
+            Season(s) ('YYYYYYYY') to keep; None keeps every season.
+
+        Returns
+        -------
+        positions : np.ndarray (int64)
+        """
+        player_id = self._player_id(player)
+        indexed = self.tables[table]
+        roles = list(ROLES) if role is None else [role]
+
+        found = [positions for r in roles for positions in indexed.rows(player_id, r)]
+        if not found:
+            return np.array([], dtype=np.int64)
+
+        positions = np.concatenate(found)
+        if len(roles) > 1:
+            # a player may fill both roles of the same event
+            positions = np.unique(positions)
+        else:
+            positions.sort()
+
+        if season is not None:
+            seasons = [season] if isinstance(season, (str, int)) else season
+            years = [int(str(s)[:4]) for s in seasons]
+            if len(indexed.seasons) > 1:
+                indexed.seasons = [np.concatenate(indexed.seasons)]
+            positions = positions[np.isin(indexed.seasons[0][positions], years)]
+
+        return positions
+
+    def get(self, player, table, role=None, season=None):
+        """
+        Returns `player`'s rows of `table` (see rows for the parameters).
+
+        Returns
+        -------
+        df : pd.DataFrame
+        """
+        positions = self.rows(player, table, role=role, season=season)
+
+        return self.tables[table].take(positions)
+
+    def counts(self, table, role='one'):
+        """
+        Number of events in `table` of every player in `role`.
+
+        Returns
+        -------
+        counts : pd.Series
+            Indexed by player id.
+        """
+        indexed = self.tables[table]
+        counts = {}
+        for keys, offsets, _ in indexed.segments[role]:
+            for key, n in zip(keys.tolist(), np.diff(offsets).tolist()):
+                counts[key] = counts.get(key, 0) + n
+
+        return pd.Series(counts, dtype='int64').sort_index()
+
+    def __len__(self):
+        return sum(indexed.n for indexed in self.tables.values())
+
+    def __repr__(self):
+        return f'PlayerIndex({ {table: t.n for table, t in self.tables.items()} })'
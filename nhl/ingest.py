@@ -0,0 +1,157 @@
+# ingest.py
+"""
+Incremental ingestion of completed games into an nhl.store.EventStore.
+
+Rather than re-pulling and re-parsing a whole season, ingest_season compares the
+games already in the store against the season's schedule and only fetches and
+parses the games that became final since the last run. Each season keeps a
+watermark (number of games stored, latest game/date ingested, time of the last
+refresh) in <store root>/_watermarks.json.
+"""
+import datetime
+import json
+import os
+
+from nhl import api, schema
+from nhl.game import Game
+from nhl.seasons import resolve_season
+from nhl.store import game_tables, season_of
+
+
+def _watermark_file(store):
+    return os.path.join(store.root, '_watermarks.json')
+
+
+def watermarks(store):
+    """
+    Returns every season's watermark, i.e. {season: {...}}, for `store`.
+    """
+    try:
+        with open(_watermark_file(store)) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _set_watermark(store, season, watermark):
+    marks = watermarks(store)
+    marks[season] = watermark
+
+    # write then rename, so the file is never left half written
+    file = _watermark_file(store)
+    with open(file + '.tmp', 'w') as f:
+        json.dump(marks, f, indent=2, sort_keys=True)
+    os.replace(file + '.tmp', file)
+
+
+def ingest_season(store, season=None, include_pre=False, include_post=True,
+                  concurrency=8, batch_size=50, base_url=None, client=None,
+                  progress=None, index=None):
+    """
+    Adds every newly final game of `season` to `store`.
+
+    Parameters
+    ----------
+    store : nhl.store.EventStore
+        Store to append to.
+
+    season : str ('YYYYYYYY', default: None)
+        Season to refresh; defaults to the current season.
+
+    include_pre : bool (default: False)
+        Whether to include preseason games.
+
+    include_post : bool (default: True)
+        Whether to include postseason games.
+
+    concurrency : int (default : 8)
+        Maximum number of simultaneous feed requests.
+
+    batch_size : int (default : 50)
+        Number of games written per (atomic) batch.
+
+    base_url : str (default : None)
+        Base url to the NHL API; defaults to the client's base url.
+
+    client : nhl.client.NhlClient (default : None)
+        Client to make requests with; defaults to the module-wide client.
+
+    progress : callable (default : None)
+        Called as progress(game_id) after each game is parsed.
+
+    index : nhl.index.PlayerIndex (default : None)
+        Index to append every written batch to, keeping it up to date with
+        the store.
+
+    Returns
+    -------
+    summary : dict
+        'season', 'new' (game ids added), 'failed' ({game id: error}) and
+        'watermark' (the season's updated watermark).
+    """
+    season = str(resolve_season(season, base_url=base_url, client=client))
+
+    # clean up anything a previous (interrupted) run left behind
+    store.recover()
+
+    # always look at a fresh schedule; finished games are what we are after
+    schedule = api.getLeagueSchedule(season, base_url=base_url, client=client, refresh=True)
+    final = schedule.game_ids(include_pre=include_pre, include_post=include_post,
+                           include_future=False)
+
+    existing = store.game_ids(season=season)
+    new = [game_id for game_id in final
+           if game_id not in existing and season_of(game_id) == season]
+
+    added = []
+    failed = {}
+    batch = []
+
+    def flush():
+        if not batch:
+            return
+        tables = {}
+        for game in batch:
+            for table, df in game_tables(game).items():
+                tables.setdefault(table, []).append(df)
+        tables = {table: schema.concat(frames) for table, frames in tables.items()}
+        store.write_batch(tables)
+        if index is not None:
+            index.append(tables)
+        added.extend(int(game.game_id) for game in batch)
+        batch.clear()
+
+    feeds = api.iter_live_data_many(new, concurrency=concurrency, base_url=base_url,
+                                    client=client, return_exceptions=True)
+    for game_id, live_data in feeds:
+        if isinstance(live_data, Exception):
+            failed[int(game_id)] = repr(live_data)
+            continue
+
+        try:
+            game = Game.from_live_data(live_data, game_id=game_id, client=client,
+                                       base_url=base_url)
+            game.makeDataFrames()
+        except (KeyError, TypeError, ValueError) as e:
+            failed[int(game_id)] = repr(e)
+            continue
+
+        batch.append(game)
+        if progress is not None:
+            progress(game_id)
+        if len(batch) >= batch_size:
+            flush()
+    flush()
+
+    # the latest ingested game (in schedule order) marks how far we have come
+    stored = existing | set(added)
+    latest = [game_id for game_id in final if game_id in stored]
+    watermark = watermarks(store).get(season, {})
+    watermark.update({'games': len(stored & set(final)),
+                      'updated': datetime.datetime.now().isoformat(timespec='seconds')})
+    if latest:
+        watermark['last_game_id'] = latest[-1]
+        watermark['last_date'] = schedule.dates[schedule.by_id[latest[-1]]]
+    _set_watermark(store, season, watermark)
+
+    return {'season': season, 'new': added, 'failed': failed, 'watermark': watermark}
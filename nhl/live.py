@@ -0,0 +1,302 @@
+# live.py
+"""
+Incremental tracking of games in progress.
+
+Rather than re-downloading the whole live feed (10K+ lines) and re-parsing every
+play on each update, LiveGame asks the API only for what changed since the feed
+it already has (/feed/live/diffPatch?startTimecode=<feed timeStamp>), applies
+those changes, and parses just the newly appended plays onto the game's event
+table. If no diff is available, it falls back to the full feed, still only
+parsing the plays past the ones it already has.
+
+    game = LiveGame(2019020001)
+    game.on(lambda game, goals: print(goals.description), events=['goal'])
+    game.run(interval=10)
+
+follow() polls many games (e.g. a whole game night) side by side.
+"""
+import copy
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from nhl import api
+from nhl.game import Game
+
+
+def apply_patch(document, operations):
+    """
+    Applies JSON patch operations (add, replace, remove) to `document`.
+
+    The document is not modified: every container along a patched path is
+    copied (shallowly) before being changed, so the cost depends on the size of
+    the patch, not on the size of the document.
+
+    Parameters
+    ----------
+    document : dict (json-like)
+
+    operations : list(dicts)
+        Operations with keys op, path and (for add/replace) value.
+
+    Returns
+    -------
+    document : dict (json-like)
+        The patched document.
+    """
+    document = copy.copy(document)
+    copied = {id(document)}
+
+    for operation in operations:
+        op = operation['op']
+        if op not in ('add', 'replace', 'remove'):
+            raise ValueError(f'unsupported patch operation {op!r}')
+
+        keys = [key.replace('~1', '/').replace('~0', '~')
+                for key in operation['path'].split('/')[1:]]
+
+        parent = document
+        for key in keys[:-1]:
+            key = int(key) if isinstance(parent, list) else key
+            child = parent[key]
+            if id(child) not in copied:
+                child = copy.copy(child)
+                parent[key] = child
+                copied.add(id(child))
+            parent = child
+
+        key = keys[-1]
+        if isinstance(parent, list):
+            index = len(parent) if key == '-' else int(key)
+            if op == 'add':
+                parent.insert(index, operation['value'])
+            elif op == 'replace':
+                parent[index] = operation['value']
+            else:
+                del parent[index]
+        elif op == 'remove':
+            del parent[key]
+        else:
+            parent[key] = operation['value']
+
+    return document
+
+
+def _changes_existing(operations, n):
+    # True if any operation changes one of the first n plays (rather than
+    # appending new ones)
+    prefix = '/liveData/plays/allPlays/'
+    for operation in operations:
+        path = operation['path']
+        if not path.startswith(prefix):
+            continue
+        index, _, rest = path[len(prefix):].partition('/')
+        if index == '-':
+            continue
+        if rest or operation['op'] != 'add' or int(index) < n:
+            return True
+
+    return False
+
+
+class LiveGame:
+
+    def __init__(self, game_id, client=None, base_url=None, diff=True):
+        """
+        Tracker of a game in progress.
+
+        Parameters
+        ----------
+        game_id : str or int
+            NHL API game id (gamePk).
+
+        client : nhl.client.NhlClient (default : None)
+            Client to make requests with; defaults to the module-wide client.
+
+        base_url : str (default : None)
+            Base url to the NHL API (or e.g. an nhl.replay.ReplayServer);
+            defaults to the client's base url.
+
+        diff : bool (default : True)
+            If True, poll with diffPatch; otherwise always request the full feed.
+
+        Attributes
+        ----------
+        feed : dict
+            The latest full live feed (None until the first poll).
+
+        game : nhl.game.Game
+            The game, whose event table (see Game.makeDataFrames) grows with
+            every poll.
+
+        requests : dict
+            Number of 'full' and 'diff' requests made.
+        """
+        self.game_id = str(game_id)
+        self.client = client
+        self.base_url = base_url
+        self.diff = diff
+
+        self.feed = None
+        self.game = None
+        self.requests = {'full': 0, 'diff': 0}
+
+        self._callbacks = []
+
+    def on(self, callback, events=None):
+        """
+        Registers callback(live_game, rows), called after each poll with the new
+        event table rows (only if there are any).
+
+        Parameters
+        ----------
+        callback : callable
+
+        events : list(str) (default : None)
+            Only pass on rows of these events (e.g. ['goal', 'penalty']); None
+            passes on every new row.
+
+        Returns
+        -------
+        callback : callable
+        """
+        self._callbacks.append((callback, None if events is None else list(events)))
+
+        return callback
+
+    @property
+    def final(self):
+        """
+        True once the game is over.
+        """
+        if self.feed is None:
+            return False
+
+        return self.feed['gameData']['status']['abstractGameState'] == 'Final'
+
+    @property
+    def timecode(self):
+        """
+        Timecode ('YYYYMMDD_HHMMSS') of the current feed.
+        """
+        return None if self.feed is None else self.feed['metaData']['timeStamp']
+
+    def _full(self):
+        self.requests['full'] += 1
+
+        return api.getLiveFeed(self.game_id, base_url=self.base_url, client=self.client,
+                               cache=False)
+
+    def poll(self):
+        """
+        Brings the game up to date and fires the callbacks.
+
+        Returns
+        -------
+        rows : pd.DataFrame
+            Rows added to the event table by this poll.
+        """
+        if self.feed is None:
+            self.feed = self._full()
+            self.game = Game.from_live_data(self.feed, game_id=self.game_id,
+                                            client=self.client, base_url=self.base_url)
+            rows = self.game.makeDataFrames()
+        else:
+            rows = self._update()
+
+        for callback, events in self._callbacks:
+            selected = rows if events is None else rows[rows['event'].isin(events)]
+            if len(selected):
+                callback(self, selected)
+
+        return rows
+
+    def _update(self):
+        n = len(self.feed['liveData']['plays']['allPlays'])
+
+        feed = None
+        rebuild = False
+        if self.diff:
+            self.requests['diff'] += 1
+            patches = api.getLiveDiff(self.game_id, self.timecode, base_url=self.base_url,
+                                      client=self.client)
+            if patches is not None:
+                operations = [op for patch in patches for op in patch.get('diff', [])]
+                try:
+                    feed = apply_patch(self.feed, operations)
+                    rebuild = _changes_existing(operations, n)
+                except (KeyError, IndexError, ValueError, TypeError):
+                    # a diff we can't follow; start over from the full feed
+                    feed = None
+
+        if feed is None:
+            feed = self._full()
+            plays = feed['liveData']['plays']['allPlays']
+            old = self.feed['liveData']['plays']['allPlays']
+            # plays are only ever appended, unless something was corrected
+            # (anywhere in the game, not just the latest play)
+            rebuild = plays[:n] != old
+
+        self.feed = feed
+        if rebuild:
+            self.game.live_data = feed['liveData']
+            events = self.game.makeDataFrames()
+            return events[self.game._play_index >= n]
+
+        return self.game.appendPlays(feed['liveData'])
+
+    def run(self, interval=10, until_final=True, max_polls=None):
+        """
+        Polls every `interval` seconds until the game is over (or `max_polls`
+        polls were made).
+        """
+        polls = 0
+        while max_polls is None or polls < max_polls:
+            self.poll()
+            polls += 1
+            if until_final and self.final:
+                break
+            time.sleep(interval)
+
+
+def follow(games, interval=10, max_polls=None):
+    """
+    Polls several LiveGames concurrently, every `interval` seconds, until all of
+    them are over (or `max_polls` rounds were made).
+
+    Parameters
+    ----------
+    games : list(LiveGame)
+
+    interval : float (default : 10)
+
+    max_polls : int (default : None)
+
+    Returns
+    -------
+    errors : dict
+        Maps game id to the errors raised while polling it (a failed poll is
+        simply retried next round).
+    """
+    import requests
+
+    errors = {}
+    rounds = 0
+    with ThreadPoolExecutor(max_workers=max(len(games), 1)) as executor:
+        while max_polls is None or rounds < max_polls:
+            active = [game for game in games if not game.final]
+            if not active:
+                break
+
+            futures = {game: executor.submit(game.poll) for game in active}
+            for game, future in futures.items():
+                try:
+                    future.result()
+                except (requests.RequestException, KeyError, ValueError) as e:
+                    errors.setdefault(game.game_id, []).append(repr(e))
+
+            rounds += 1
+            if all(game.final for game in games):
+                break
+            time.sleep(interval)
+
+    return errors
@@ -0,0 +1,263 @@
+# parse.py
+"""
+Columnar extraction of play-by-play data from a game's live feed.
+
+Rather than building one Python list per play and handing pandas a list of rows,
+every column is a preallocated array that is filled in a single pass over
+allPlays. The resulting dictionary of columns can be handed straight to
+pd.DataFrame without any per-row object allocation.
+
+Columns come out in the compact types of nhl.schema: categorical columns are
+filled with category codes as the plays are read (and built with
+pd.Categorical.from_codes), so no per-game dtype conversion is needed.
+"""
+import numpy as np
+import pandas as pd
+
+from nhl.schema import COLUMN_TYPES, EVENTS, ROLES, TEAMS
+
+# events that are not actual plays (period/game bookkeeping)
+WEIRD_EVENTS = {'Unknown', 'Period Start', 'Period End', 'Game End', 'Game Scheduled',
+                'Period Ready', 'Period Official', 'Early Intermission Start',
+                'Early Intermission End', 'Game Official', 'Shootout Complete'}
+
+# events we (for now) just ignore
+OTHER_EVENTS = {'Stoppage', 'Sub', 'Fight', 'Emergency Goaltender', 'Official Challenge'}
+
+SKIPPED_EVENTS = WEIRD_EVENTS | OTHER_EVENTS
+
+# order of the columns returned by extract_events
+EVENT_COLUMNS = ['event', 'secondary_type', 'player_one', 'player_one_role',
+                 'player_two', 'player_two_role', 'x', 'y', 'period',
+                 'period_time_remaining', 'player_one_team', 'player_two_team',
+                 'home_goals', 'away_goals', 'game_winning', 'empty_net',
+                 'player_one_id', 'player_two_id', 'description']
+
+# eventTypeId -> event label (e.g. 'MISSED_SHOT' -> 'missed_shot'), filled as seen
+_event_labels = {}
+
+
+def _lookup(categories=()):
+    # value -> category code; values outside of `categories` are added to it
+    # (with the next code) as they are seen
+    return {value: code for code, value in enumerate(categories)}
+
+
+def _categorical(codes, lookup, fixed=None):
+    # categorical from codes into `lookup`; open ended (or extended fixed)
+    # categories are sorted, as with astype('category')
+    categories = list(lookup)
+    if fixed is None or len(categories) > len(fixed):
+        order = sorted(range(len(categories)), key=categories.__getitem__)
+        # code -1 (missing) maps to the last entry, i.e. stays -1
+        remap = np.full(len(categories) + 1, -1, dtype=codes.dtype)
+        remap[order] = np.arange(len(categories))
+        codes = remap[codes]
+        categories = [categories[i] for i in order]
+
+    return pd.Categorical.from_codes(codes, categories=pd.Index(categories))
+
+
+def constant_columns(n, values):
+    """
+    Builds columns repeating a single value (e.g. a game's teams and date) in
+    the types of nhl.schema.COLUMN_TYPES.
+
+    Parameters
+    ----------
+    n : int
+        Length of the columns.
+
+    values : dict
+        Maps column name to its value.
+
+    Returns
+    -------
+    columns : dict
+        Missing (None) values of numeric columns give nullable columns (e.g.
+        Int32 instead of int32).
+    """
+    columns = {}
+    for name, value in values.items():
+        dtype = COLUMN_TYPES.get(name)
+        if isinstance(dtype, list):
+            lookup = _lookup(dtype)
+            code = -1 if value is None else lookup.setdefault(value, len(lookup))
+            columns[name] = _categorical(np.full(n, code, dtype=np.int16), lookup, dtype)
+        elif dtype == 'datetime64[ns]':
+            value = pd.to_datetime(pd.Series([value])).to_numpy()[0]
+            columns[name] = np.full(n, value)
+        elif dtype is not None and value is None:
+            # e.g. a game without an id: int32 -> Int32, all missing
+            columns[name] = pd.array([pd.NA] * n, dtype=dtype[0].upper() + dtype[1:])
+        elif dtype is not None:
+            columns[name] = np.full(n, value, dtype=dtype)
+        else:
+            columns[name] = np.full(n, value, dtype=object)
+
+    return columns
+
+
+def extract_events(plays, home, away):
+    """
+    Extracts every (non-bookkeeping) play into columns.
+
+    Parameters
+    ----------
+    plays : list of dicts
+        Plays from a live feed, i.e. live_data['plays']['allPlays'] (or any
+        slice of it).
+
+    home : str
+        Home team's triCode.
+
+    away : str
+        Away team's triCode.
+
+    Returns
+    -------
+    columns : dict
+        Maps each name in EVENT_COLUMNS to an array with one entry per play,
+        in the types of nhl.schema.COLUMN_TYPES:
+
+            event, roles, teams     -   categoricals (fixed categories)
+            secondary type, names   -   categoricals (categories as seen)
+            period_time_remaining,
+            description             -   object arrays
+            x, y                    -   float32 (NaN if missing)
+            period, home_goals,
+            away_goals              -   int8
+            game_winning, empty_net -   nullable booleans (only set for goals)
+            player ids              -   nullable Int32
+
+        The key 'index' gives the position of each play in `plays`.
+    """
+    n = len(plays)
+
+    # category codes (-1 if missing) and their lookups
+    event = np.full(n, -1, dtype=np.int16)
+    secondary_type = np.full(n, -1, dtype=np.int32)
+    player_one = np.full(n, -1, dtype=np.int32)
+    player_one_role = np.full(n, -1, dtype=np.int16)
+    player_two = np.full(n, -1, dtype=np.int32)
+    player_two_role = np.full(n, -1, dtype=np.int16)
+    player_one_team = np.full(n, -1, dtype=np.int16)
+    player_two_team = np.full(n, -1, dtype=np.int16)
+    events, roles_one, roles_two = _lookup(EVENTS), _lookup(ROLES), _lookup(ROLES)
+    teams_one, teams_two = _lookup(TEAMS), _lookup(TEAMS)
+    secondary_types, names_one, names_two = _lookup(), _lookup(), _lookup()
+
+    period_time_remaining = np.empty(n, dtype=object)
+    description = np.empty(n, dtype=object)
+
+    x = np.full(n, np.nan, dtype=np.float32)
+    y = np.full(n, np.nan, dtype=np.float32)
+    player_one_id = np.zeros(n, dtype=np.int32)
+    player_two_id = np.zeros(n, dtype=np.int32)
+    # True where the player ids are missing
+    one_missing = np.ones(n, dtype=bool)
+    two_missing = np.ones(n, dtype=bool)
+
+    period = np.zeros(n, dtype=np.int8)
+    home_goals = np.zeros(n, dtype=np.int8)
+    away_goals = np.zeros(n, dtype=np.int8)
+
+    game_winning = np.zeros(n, dtype=bool)
+    empty_net = np.zeros(n, dtype=bool)
+    # True where game_winning/empty_net are missing (i.e. not a goal)
+    goal_missing = np.ones(n, dtype=bool)
+
+    index = np.zeros(n, dtype=np.int64)
+
+    k = 0
+    for i, play in enumerate(plays):
+        result = play['result']
+        if result['event'] in SKIPPED_EVENTS:
+            continue
+
+        about = play['about']
+        index[k] = i
+
+        type_id = result['eventTypeId']
+        label = _event_labels.get(type_id)
+        if label is None:
+            label = _event_labels[type_id] = type_id.lower()
+        event[k] = events.setdefault(label, len(events))
+
+        secondary = result.get('secondaryType')
+        if secondary is not None:
+            secondary_type[k] = secondary_types.setdefault(secondary, len(secondary_types))
+        description[k] = result['description']
+        period[k] = about['period']
+        period_time_remaining[k] = about['periodTimeRemaining']
+        home_goals[k] = about['goals']['home']
+        away_goals[k] = about['goals']['away']
+
+        coordinates = play.get('coordinates')
+        if coordinates:
+            x[k] = coordinates.get('x', np.nan)
+            y[k] = coordinates.get('y', np.nan)
+
+        empty = result.get('emptyNet')
+        if empty is not None:
+            empty_net[k] = empty
+            game_winning[k] = result.get('gameWinningGoal', False)
+            goal_missing[k] = False
+
+        players = play.get('players')
+        if players:
+            first, last = players[0], players[-1]
+            name = first['player']['fullName']
+            player_one[k] = names_one.setdefault(name, len(names_one))
+            player_one_id[k] = first['player']['id']
+            one_missing[k] = False
+            role = first['playerType']
+            player_one_role[k] = roles_one.setdefault(role, len(roles_one))
+
+            # no second player on empty net goals, or if only one was involved
+            if not empty and last['player']['fullName'] != name:
+                name = last['player']['fullName']
+                player_two[k] = names_two.setdefault(name, len(names_two))
+                player_two_id[k] = last['player']['id']
+                two_missing[k] = False
+                role = last['playerType']
+                player_two_role[k] = roles_two.setdefault(role, len(roles_two))
+
+        team = play.get('team')
+        if team is not None:
+            tri_code = team['triCode']
+            other = away if tri_code == home else home
+            player_one_team[k] = teams_one.setdefault(tri_code, len(teams_one))
+            player_two_team[k] = teams_two.setdefault(other, len(teams_two))
+
+        k += 1
+
+    columns = {'event': event, 'secondary_type': secondary_type,
+               'player_one': player_one, 'player_one_role': player_one_role,
+               'player_two': player_two, 'player_two_role': player_two_role,
+               'x': x, 'y': y, 'period': period,
+               'period_time_remaining': period_time_remaining,
+               'player_one_team': player_one_team, 'player_two_team': player_two_team,
+               'home_goals': home_goals, 'away_goals': away_goals,
+               'game_winning': game_winning, 'empty_net': empty_net,
+               'player_one_id': player_one_id, 'player_two_id': player_two_id,
+               'description': description}
+
+    # trim to the plays actually kept (slices are views, not copies)
+    columns = {name: values[:k] for name, values in columns.items()}
+    for name, lookup, fixed in [('event', events, EVENTS),
+                                ('secondary_type', secondary_types, None),
+                                ('player_one', names_one, None),
+                                ('player_one_role', roles_one, ROLES),
+                                ('player_two', names_two, None),
+                                ('player_two_role', roles_two, ROLES),
+                                ('player_one_team', teams_one, TEAMS),
+                                ('player_two_team', teams_two, TEAMS)]:
+        columns[name] = _categorical(columns[name], lookup, fixed)
+    for name in ['game_winning', 'empty_net']:
+        columns[name] = pd.arrays.BooleanArray(columns[name], goal_missing[:k])
+    for name, missing in [('player_one_id', one_missing), ('player_two_id', two_missing)]:
+        columns[name] = pd.arrays.IntegerArray(columns[name], missing[:k])
+    columns['index'] = index[:k]
+
+    return columns
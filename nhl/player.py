@@ -0,0 +1,259 @@
+# player.py
+"""
+Player stats, fetched in bulk.
+
+get_player_stats_many requests every (player, report type, season) combination
+once, concurrently over the client's pooled connections (see
+nhl.api.iter_json_many), and normalizes the splits into one DataFrame per report
+type. The stats of seasons that are over can't change anymore: their responses
+are cached as final (if the client has a cache) and memoized in memory, so
+refreshing the whole league only requests the current season again.
+
+    stats = get_player_stats_many(player_ids, ['statsSingleSeason', 'gameLog'],
+                                  seasons=['20182019', '20192020'])
+    stats['gameLog']    # one row per player per game
+"""
+import threading
+
+import pandas as pd
+
+from nhl import api
+from nhl.seasons import resolve_season
+
+# report types that aren't split by season (the season argument is ignored)
+SEASONLESS = ['yearByYear', 'yearByYearRank', 'careerRegularSeason',
+              'yearByYearPlayoffs', 'yearByYearPlayoffsRank', 'careerPlayoffs']
+
+# splits of past seasons, keyed by request url
+_past_splits = {}
+_past_lock = threading.Lock()
+
+
+def _endpoint(player_id, report_type, season):
+    if report_type in SEASONLESS:
+        return f'/people/{player_id}/stats?stats={report_type}'
+
+    return f'/people/{player_id}/stats?stats={report_type}&season={season}'
+
+
+def _minutes(value):
+    # 'MM:SS' time on ice -> minutes
+    if not isinstance(value, str) or ':' not in value:
+        return value
+    minutes, _, seconds = value.partition(':')
+
+    return int(minutes) + int(seconds) / 60
+
+
+def _flatten(split):
+    # one split -> one flat row: the stats, plus the scalars of every other
+    # entry (e.g. team -> team_id, team_name; game -> game_gamePk)
+    row = {}
+    for key, value in split.items():
+        if key == 'stat':
+            row.update(value)
+        elif isinstance(value, dict):
+            for subkey, subvalue in value.items():
+                if subkey != 'link' and not isinstance(subvalue, (dict, list)):
+                    row[f'{key}_{subkey}'] = subvalue
+        elif not isinstance(value, list):
+            row[key] = value
+
+    return row
+
+
+def normalize_splits(splits, player_id, report_type, season=None):
+    """
+    Turns the splits of a stats response into a DataFrame.
+
+    Parameters
+    ----------
+    splits : list(dicts)
+        The `['stats'][0]['splits']` of a /people/<id>/stats response.
+
+    player_id : int
+
+    report_type : str
+
+    season : str (default : None)
+        Season requested; used where a split doesn't name its season.
+
+    Returns
+    -------
+    df : pd.DataFrame
+        One row per split, with player_id and season columns, the stats (time
+        on ice in minutes) and the split's other fields flattened.
+    """
+    rows = [_flatten(split) for split in splits]
+    df = pd.DataFrame(rows)
+    if not len(df):
+        return df
+
+    df.insert(0, 'player_id', int(player_id))
+    if 'season' not in df.columns:
+        df.insert(1, 'season', season)
+    elif season is not None:
+        df['season'] = df['season'].fillna(season)
+
+    for column in df.columns:
+        if 'timeonice' in column.lower():
+            df[column] = df[column].map(_minutes).astype(float)
+    if 'date' in df.columns:
+        df['date'] = pd.to_datetime(df['date'])
+
+    return df
+
+
+def get_player_stats_many(player_ids, report_types=('statsSingleSeason',), seasons=None,
+                          concurrency=8, base_url=None, client=None, errors='raise'):
+    """
+    Requests many players' stats, for many report types and seasons, at once.
+
+    Parameters
+    ----------
+    player_ids : iterable of int
+        NHL API player ids; duplicates are only requested once.
+
+    report_types : iterable of str (default : ('statsSingleSeason',))
+        Report types (see api.getPlayerStats for the options).
+
+    seasons : iterable of str (default : None)
+        Seasons ('YYYYYYYY'); defaults to the current season. Ignored by the
+        SEASONLESS report types.
+
+    concurrency : int (default : 8)
+        Maximum number of simultaneous requests.
+
+    base_url : str (default : None)
+        Base url to the NHL API; defaults to the client's base url.
+
+    client : nhl.client.NhlClient (default : None)
+        Client to make requests with; defaults to the module-wide client.
+
+    errors : str (default : 'raise')
+        'raise' to raise the first failed request (after the others are done),
+        'ignore' to leave its rows out.
+
+    Returns
+    -------
+    stats : dict
+        Maps report type to a DataFrame of every requested player's splits (see
+        normalize_splits); empty if there are none.
+    """
+    if client is None:
+        client = api.get_client()
+
+    if seasons is None:
+        seasons = [resolve_season(None, base_url=base_url, client=client)]
+    seasons = [str(season) for season in seasons]
+    report_types = list(dict.fromkeys(report_types))
+
+    # every distinct request, and what it is for
+    requests = {}
+    for player_id in dict.fromkeys(int(p) for p in player_ids):
+        for report_type in report_types:
+            for season in ([None] if report_type in SEASONLESS else seasons):
+                endpoint = _endpoint(player_id, report_type, season)
+                requests[endpoint] = (player_id, report_type, season)
+
+    splits = {}
+    past, current = [], []
+    for endpoint, (_, report_type, season) in requests.items():
+        if season is not None and api._isPastSeason(season):
+            with _past_lock:
+                memoized = _past_splits.get(client.url(endpoint, base_url))
+            if memoized is not None:
+                splits[endpoint] = memoized
+            else:
+                past.append(endpoint)
+        else:
+            current.append(endpoint)
+
+    failed = []
+    for endpoints, final in [(past, lambda data: 'stats' in data), (current, None)]:
+        if not endpoints:
+            continue
+        responses = api.iter_json_many(endpoints, concurrency=concurrency, base_url=base_url,
+                                       client=client, final=final, return_exceptions=True)
+        for endpoint, data in responses:
+            if isinstance(data, Exception):
+                failed.append((endpoint, data))
+                continue
+            try:
+                splits[endpoint] = data['stats'][0]['splits']
+            except (KeyError, IndexError, TypeError) as e:
+                failed.append((endpoint, e))
+                continue
+            if final is not None:
+                with _past_lock:
+                    _past_splits[client.url(endpoint, base_url)] = splits[endpoint]
+
+    if failed and errors == 'raise':
+        endpoint, error = failed[0]
+        raise RuntimeError(f'{len(failed)} requests failed, e.g. {endpoint}') from error
+
+    frames = {report_type: [] for report_type in report_types}
+    for endpoint, (player_id, report_type, season) in requests.items():
+        if endpoint in splits:
+            frames[report_type].append(normalize_splits(splits[endpoint], player_id,
+                                                        report_type, season=season))
+
+    return {report_type: pd.concat([df for df in dfs if len(df)], ignore_index=True)
+            if any(len(df) for df in dfs) else pd.DataFrame()
+            for report_type, dfs in frames.items()}
+
+
+class Player:
+
+    def __init__(self, player_id, client=None, base_url=None):
+        """
+        Class providing an object-oriented approach to working with nhl player data.
+
+        Parameters
+        ----------
+        player_id : int or str
+            NHL API player id.
+
+        client : nhl.client.NhlClient (default : None)
+            Client to make requests with; defaults to the module-wide client.
+
+        base_url : str (default : None)
+            Base url to the NHL API; defaults to the client's base url.
+        """
+        self.player_id = int(player_id)
+        self.client = client
+        self._base_url = base_url
+        self._info = None
+
+    @property
+    def info(self):
+        """
+        The player's biographical data (the /people/<id> response), requested
+        on first access.
+        """
+        if self._info is None:
+            data = api._get(f'/people/{self.player_id}', self._base_url, self.client)
+            self._info = data['people'][0]
+
+        return self._info
+
+    @property
+    def name(self):
+        return self.info['fullName']
+
+    def stats(self, report_types=('statsSingleSeason',), seasons=None, concurrency=8):
+        """
+        The player's stats for every report type and season, requested
+        concurrently; see get_player_stats_many.
+
+        Returns
+        -------
+        stats : dict
+            Maps report type to DataFrame.
+        """
+        return get_player_stats_many([self.player_id], report_types, seasons=seasons,
+                                     concurrency=concurrency, base_url=self._base_url,
+                                     client=self.client)
+
+    def __repr__(self):
+        return f'Player({self.player_id})'
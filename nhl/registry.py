@@ -0,0 +1,242 @@
+# registry.py
+"""
+Offline reference data for teams (and seasons).
+
+Team identifiers rarely change, so rather than asking the API (or rebuilding a
+lookup dict) every time a team is named, the registry ships the metadata of
+every franchise that played since the 2005-06 season: id, triCode, names,
+aliases, active seasons and division/conference. Any form of identifier (id,
+numeric string, triCode, full name, short name, old/alternate abbreviations) is
+resolved with a single dictionary lookup:
+
+    resolve('TOR') == resolve('toronto maple leafs') == resolve('10') == 10
+
+Divisions and conferences are the team's latest (or, for relocated/defunct
+teams, last). refresh() updates the registry from the /teams endpoint, e.g.
+when a new team joins the league. Season date ranges are nhl.seasons.SEASON_DATES.
+"""
+import threading
+
+from nhl.seasons import SEASON_DATES
+
+# (id, triCode, full name, location, short name, division, conference,
+#  first season, last season (None if active), aliases)
+_TEAMS = [
+    (1, 'NJD', 'New Jersey Devils', 'New Jersey', 'Devils', 'Metropolitan', 'Eastern', '19821983', None, ['N.J', 'NJ']),
+    (2, 'NYI', 'New York Islanders', 'New York', 'Islanders', 'Metropolitan', 'Eastern', '19721973', None, []),
+    (3, 'NYR', 'New York Rangers', 'New York', 'Rangers', 'Metropolitan', 'Eastern', '19261927', None, []),
+    (4, 'PHI', 'Philadelphia Flyers', 'Philadelphia', 'Flyers', 'Metropolitan', 'Eastern', '19671968', None, []),
+    (5, 'PIT', 'Pittsburgh Penguins', 'Pittsburgh', 'Penguins', 'Metropolitan', 'Eastern', '19671968', None, []),
+    (6, 'BOS', 'Boston Bruins', 'Boston', 'Bruins', 'Atlantic', 'Eastern', '19241925', None, []),
+    (7, 'BUF', 'Buffalo Sabres', 'Buffalo', 'Sabres', 'Atlantic', 'Eastern', '19701971', None, []),
+    (8, 'MTL', 'Montréal Canadiens', 'Montréal', 'Canadiens', 'Atlantic', 'Eastern', '19171918', None, ['Montreal Canadiens', 'MON']),
+    (9, 'OTT', 'Ottawa Senators', 'Ottawa', 'Senators', 'Atlantic', 'Eastern', '19921993', None, []),
+    (10, 'TOR', 'Toronto Maple Leafs', 'Toronto', 'Maple Leafs', 'Atlantic', 'Eastern', '19171918', None, []),
+    (11, 'ATL', 'Atlanta Thrashers', 'Atlanta', 'Thrashers', 'Southeast', 'Eastern', '19992000', '20102011', []),
+    (12, 'CAR', 'Carolina Hurricanes', 'Carolina', 'Hurricanes', 'Metropolitan', 'Eastern', '19971998', None, []),
+    (13, 'FLA', 'Florida Panthers', 'Florida', 'Panthers', 'Atlantic', 'Eastern', '19931994', None, []),
+    (14, 'TBL', 'Tampa Bay Lightning', 'Tampa Bay', 'Lightning', 'Atlantic', 'Eastern', '19921993', None, ['T.B', 'TB']),
+    (15, 'WSH', 'Washington Capitals', 'Washington', 'Capitals', 'Metropolitan', 'Eastern', '19741975', None, ['WAS']),
+    (16, 'CHI', 'Chicago Blackhawks', 'Chicago', 'Blackhawks', 'Central', 'Western', '19261927', None, []),
+    (17, 'DET', 'Detroit Red Wings', 'Detroit', 'Red Wings', 'Atlantic', 'Eastern', '19261927', None, []),
+    (18, 'NSH', 'Nashville Predators', 'Nashville', 'Predators', 'Central', 'Western', '19981999', None, []),
+    (19, 'STL', 'St. Louis Blues', 'St. Louis', 'Blues', 'Central', 'Western', '19671968', None, ['St Louis Blues']),
+    (20, 'CGY', 'Calgary Flames', 'Calgary', 'Flames', 'Pacific', 'Western', '19801981', None, ['CAL']),
+    (21, 'COL', 'Colorado Avalanche', 'Colorado', 'Avalanche', 'Central', 'Western', '19951996', None, []),
+    (22, 'EDM', 'Edmonton Oilers', 'Edmonton', 'Oilers', 'Pacific', 'Western', '19791980', None, []),
+    (23, 'VAN', 'Vancouver Canucks', 'Vancouver', 'Canucks', 'Pacific', 'Western', '19701971', None, []),
+    (24, 'ANA', 'Anaheim Ducks', 'Anaheim', 'Ducks', 'Pacific', 'Western', '19931994', None, ['Mighty Ducks of Anaheim']),
+    (25, 'DAL', 'Dallas Stars', 'Dallas', 'Stars', 'Central', 'Western', '19931994', None, []),
+    (26, 'LAK', 'Los Angeles Kings', 'Los Angeles', 'Kings', 'Pacific', 'Western', '19671968', None, ['L.A', 'LA']),
+    (28, 'SJS', 'San Jose Sharks', 'San Jose', 'Sharks', 'Pacific', 'Western', '19911992', None, ['S.J', 'SJ']),
+    (29, 'CBJ', 'Columbus Blue Jackets', 'Columbus', 'Blue Jackets', 'Metropolitan', 'Eastern', '20002001', None, []),
+    (30, 'MIN', 'Minnesota Wild', 'Minnesota', 'Wild', 'Central', 'Western', '20002001', None, []),
+    (52, 'WPG', 'Winnipeg Jets', 'Winnipeg', 'Jets', 'Central', 'Western', '20112012', None, []),
+    (53, 'ARI', 'Arizona Coyotes', 'Arizona', 'Coyotes', 'Central', 'Western', '19961997', '20232024', ['PHX', 'Phoenix Coyotes']),
+    (54, 'VGK', 'Vegas Golden Knights', 'Vegas', 'Golden Knights', 'Pacific', 'Western', '20172018', None, []),
+    (55, 'SEA', 'Seattle Kraken', 'Seattle', 'Kraken', 'Pacific', 'Western', '20212022', None, []),
+    (59, 'UTA', 'Utah Hockey Club', 'Utah', 'Hockey Club', 'Central', 'Western', '20242025', None, []),
+]
+
+_FIELDS = ['id', 'abbreviation', 'name', 'location', 'team_name', 'division',
+           'conference', 'first_season', 'last_season', 'aliases']
+
+# id -> team record, and lower cased identifier -> id
+_by_id = {}
+_lookup = {}
+_lock = threading.Lock()
+
+
+def _key(identifier):
+    return ' '.join(str(identifier).lower().split())
+
+
+def _register(record):
+    # (re)adds a team record; called with _lock held (or at import)
+    _by_id[record['id']] = record
+    for identifier in [record['abbreviation'], record['name'], record['team_name'],
+                       *record['aliases']]:
+        if identifier:
+            _lookup[_key(identifier)] = record['id']
+
+
+for _team in _TEAMS:
+    _register(dict(zip(_FIELDS, _team)))
+
+
+def resolve(team):
+    """
+    Returns the id of `team`.
+
+    Parameters
+    ----------
+    team : int or str
+        Team id, numeric string (e.g. '10' or '1'), triCode, full or short name,
+        or alias (e.g. 'L.A', 'PHX'); case insensitive.
+
+    Returns
+    -------
+    team_id : int
+        Ids aren't checked against the registry, so teams it doesn't know yet
+        can still be passed by id.
+    """
+    if isinstance(team, int):
+        return team
+
+    key = _key(team)
+    if key.isdigit():
+        return int(key)
+
+    try:
+        return _lookup[key]
+    except KeyError:
+        raise KeyError(f'unknown team {team!r}') from None
+
+
+def get(team):
+    """
+    Returns the registry record (a dict with keys id, abbreviation, name,
+    location, team_name, division, conference, first_season, last_season and
+    aliases) of `team` (see resolve for the forms it can take).
+    """
+    team_id = resolve(team)
+    try:
+        return _by_id[team_id]
+    except KeyError:
+        raise KeyError(f'unknown team id {team_id}') from None
+
+
+def abbreviation(team):
+    """
+    Returns the triCode of `team`.
+    """
+    return get(team)['abbreviation']
+
+
+def name(team):
+    """
+    Returns the full name of `team`.
+    """
+    return get(team)['name']
+
+
+def seasons(team):
+    """
+    Returns the seasons (of SEASON_DATES) in which `team` played.
+    """
+    record = get(team)
+    last = record['last_season'] or max(SEASON_DATES)
+
+    return [season for season in SEASON_DATES
+            if record['first_season'] <= season <= last]
+
+
+def teams(active=True, season=None):
+    """
+    Returns the team records, sorted by id.
+
+    Parameters
+    ----------
+    active : bool (default : True)
+        If True, only return teams still playing (ignored if season is given).
+
+    season : str (default : None)
+        Only return the teams that played in `season` ('YYYYYYYY').
+    """
+    records = [_by_id[team_id] for team_id in sorted(_by_id)]
+    if season is not None:
+        season = str(season)
+        return [r for r in records
+                if r['first_season'] <= season <= (r['last_season'] or '99999999')]
+    if active:
+        return [r for r in records if r['last_season'] is None]
+
+    return records
+
+
+def team_map():
+    """
+    Returns a dict mapping every lower cased identifier (triCode, names and
+    aliases) to its team id.
+    """
+    return dict(_lookup)
+
+
+def season_dates(season):
+    """
+    Returns the (first day, last day) of `season` ('YYYYYYYY'); see
+    nhl.seasons.SEASON_DATES.
+    """
+    return SEASON_DATES[str(season)]
+
+
+def refresh(base_url=None, client=None):
+    """
+    Updates the registry from the API's /teams endpoint (every team, active or
+    not), e.g. to pick up a new team; aliases are kept.
+
+    Parameters
+    ----------
+    base_url : str (default : None)
+        Base url to the NHL API; defaults to the client's base url.
+
+    client : nhl.client.NhlClient (default : None)
+        Client to make requests with; defaults to the module-wide client.
+
+    Returns
+    -------
+    teams : list(dicts)
+        The updated records of every team returned by the API.
+    """
+    # nhl.api resolves teams through the registry
+    from nhl import api
+
+    data = api._get('/teams?expand=team.all', base_url, client, cache=False)['teams']
+
+    updated = []
+    with _lock:
+        for team in data:
+            old = _by_id.get(team['id'], {})
+            first = team.get('firstYearOfPlay')
+            first = f'{first}{int(first) + 1}' if first else old.get('first_season')
+            # a team turning inactive played up to the latest season we know
+            # of, unless the api says otherwise
+            last = team.get('lastYearOfPlay')
+            last = (f'{last}{int(last) + 1}' if last
+                    else old.get('last_season') or max(SEASON_DATES))
+            record = {
+                'id': team['id'],
+                'abbreviation': team.get('abbreviation', old.get('abbreviation')),
+                'name': team.get('name', old.get('name')),
+                'location': team.get('locationName', old.get('location')),
+                'team_name': team.get('teamName', old.get('team_name')),
+                'division': team.get('division', {}).get('name', old.get('division')),
+                'conference': team.get('conference', {}).get('name', old.get('conference')),
+                'first_season': first,
+                'last_season': None if team.get('active', True) else last,
+                'aliases': old.get('aliases', []),
+            }
+            _register(record)
+            updated.append(record)
+
+    return updated
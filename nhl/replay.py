@@ -0,0 +1,496 @@
+# replay.py
+"""
+Local replay of recorded NHL API data, for testing against without touching the
+real API.
+
+ReplayServer serves recorded live feeds (e.g. saved with json.dump, see
+Game.from_file) of completed games as if they were being played: every
+`interval` seconds, `plays_per_interval` more of each game's plays become
+visible. Both /game/<id>/feed/live and the incremental
+/game/<id>/feed/live/diffPatch?startTimecode= endpoints are served, so anything
+taking a base_url can be pointed at it:
+
+    with ReplayServer([feed], interval=0.5) as server:
+        game = LiveGame(feed['gamePk'], base_url=server.base_url)
+        game.run(interval=0.5)
+
+The other endpoints nhl.api uses (/teams, /teams/<id>/roster, /schedule,
+/game/<id>/boxscore, /people/<id>/stats and /seasons/current) are served from
+recorded `responses` where given, and otherwise derived from the feeds (and the
+team registry). With live=False every feed is served complete from the start,
+e.g. to pull a whole season through it. Latency, jitter, server errors and rate
+limiting (429 responses with a Retry-After header) can be injected to see how
+a client holds up under load (see benchmarks/load.py):
+
+    server = ReplayServer(feeds, live=False, latency=0.05, jitter=0.02,
+                          error_rate=0.01, throttle_rate=0.02, seed=0)
+    with server:
+        client = NhlClient(base_url=server.base_url, retries=3)
+        ingest_season(store, '20192020', client=client)
+"""
+import datetime
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+# timecode of a replayed feed showing k plays is _EPOCH + k seconds
+_EPOCH = datetime.datetime(2000, 1, 1)
+_TIMECODE = '%Y%m%d_%H%M%S'
+
+# statuses of injected server errors
+ERRORS = [500, 502, 503, 504]
+
+# routes whose responses are always derived from the replayed feeds
+_LIVE_ROUTES = ['diff', 'feed']
+
+
+class ReplayServer:
+
+    def __init__(self, feeds, interval=1.0, plays_per_interval=10, start_plays=1,
+                 host='127.0.0.1', port=0, prefix='/api/v1', responses=None, live=True,
+                 latency=0.0, jitter=0.0, error_rate=0.0, throttle_rate=0.0, retry_after=1,
+                 seed=None):
+        """
+        HTTP server replaying recorded live feeds.
+
+        Parameters
+        ----------
+        feeds : list(dicts)
+            Full /feed/live responses (with gamePk, metaData, gameData and
+            liveData) of completed games.
+
+        interval : float (default : 1.0)
+            Seconds between two increments of the replay.
+
+        plays_per_interval : int (default : 10)
+            Number of plays of each game revealed per increment.
+
+        start_plays : int (default : 1)
+            Number of plays visible when the replay starts.
+
+        host : str (default : '127.0.0.1')
+
+        port : int (default : 0)
+            Port to listen on; 0 picks a free one.
+
+        prefix : str (default : '/api/v1')
+            Path prefix of every endpoint (i.e. the path of the base url).
+
+        responses : dict (default : None)
+            Maps endpoints (relative to the prefix, e.g. '/teams/10/roster' or
+            '/schedule?season=20192020') to recorded responses. A request is
+            answered with the response recorded for its path and query (in any
+            order) or, failing that, for its path alone; recorded responses
+            take precedence over derived ones, except for the live feeds.
+
+        live : bool (default : True)
+            If False, every feed is served complete (i.e. final) from the
+            start instead of being replayed.
+
+        latency : float (default : 0.0)
+            Seconds every response is delayed by.
+
+        jitter : float (default : 0.0)
+            Maximum random deviation (in seconds, either way) from `latency`.
+
+        error_rate : float (default : 0.0)
+            Fraction of requests answered with a server error (one of ERRORS).
+
+        throttle_rate : float (default : 0.0)
+            Fraction of requests answered with 429 Too Many Requests.
+
+        retry_after : float (default : 1)
+            Seconds sent in the Retry-After header of 429 responses.
+
+        seed : int (default : None)
+            Seed of the random jitter and injected failures.
+
+        Attributes
+        ----------
+        base_url : str
+            Base url to pass to NhlClient (or any base_url argument).
+
+        requests : dict
+            Number of requests served per route ('recorded' for recorded
+            responses without a route).
+
+        faults : dict
+            Number of injected failures per status code.
+        """
+        self.feeds = {int(feed['gamePk']): feed for feed in feeds}
+        self.interval = interval
+        self.plays_per_interval = plays_per_interval
+        self.start_plays = start_plays
+        self.prefix = prefix.rstrip('/')
+        self.live = live
+
+        self.responses = {_key(*endpoint.partition('?')[::2]): body
+                          for endpoint, body in (responses or {}).items()}
+
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+
+        self.requests = {}
+        self.faults = {}
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._offset = 0
+        self._started = None
+
+        # (name, pattern, handler); handlers take (match, query) and return
+        # (status, body)
+        self.routes = [
+            ('diff', re.compile(r'/game/(\d+)/feed/live/diffPatch'), self._diff),
+            ('feed', re.compile(r'/game/(\d+)/feed/live'), self._feed),
+            ('boxscore', re.compile(r'/game/(\d+)/boxscore'), self._boxscore),
+            ('schedule', re.compile(r'/schedule'), self._schedule),
+            ('roster', re.compile(r'/teams/(\d+)/roster'), self._roster),
+            ('teams', re.compile(r'/teams(?:/(\d+))?'), self._teams),
+            ('stats', re.compile(r'/people/(\d+)/stats'), self._stats),
+            ('season', re.compile(r'/seasons/current'), self._season),
+        ]
+
+        self._server = ThreadingHTTPServer((host, port), _handler(self))
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f'http://{host}:{port}{self.prefix}'
+
+    def start(self):
+        """
+        Starts serving (from a background thread) and starts the replay clock.
+        """
+        self._started = time.monotonic()
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+
+        return self
+
+    def stop(self):
+        """
+        Stops serving.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def advance(self, increments=1):
+        """
+        Moves the replay forward by `increments` increments without waiting.
+        """
+        with self._lock:
+            self._offset += increments
+
+    def visible(self, game_id):
+        """
+        Returns the number of plays of game `game_id` currently visible.
+        """
+        elapsed = 0 if self._started is None else time.monotonic() - self._started
+        increments = int(elapsed // self.interval) if self.interval else 0
+        with self._lock:
+            increments += self._offset
+
+        total = len(self.feeds[int(game_id)]['liveData']['plays']['allPlays'])
+        if not self.live:
+            return total
+
+        return min(total, self.start_plays + increments * self.plays_per_interval)
+
+    def handle(self, path, query):
+        """
+        Routes a request; returns (status, json-like body).
+        """
+        if not path.startswith(self.prefix):
+            return 404, {'message': 'Object not found'}
+        path = path[len(self.prefix):]
+
+        for name, pattern, handler in self.routes:
+            match = pattern.fullmatch(path)
+            if match:
+                break
+        else:
+            name = match = handler = None
+
+        recorded = None
+        if name not in _LIVE_ROUTES:
+            recorded = self._recorded(path, query)
+            if recorded is not None and name is None:
+                name = 'recorded'
+
+        if name is None:
+            return 404, {'message': 'Object not found'}
+
+        with self._lock:
+            self.requests[name] = self.requests.get(name, 0) + 1
+
+        if recorded is not None:
+            return 200, recorded
+
+        return handler(match, query)
+
+    def fault(self):
+        """
+        Waits out the latency of a request; returns the (status, body, headers)
+        of the failure to answer it with, or None to serve it.
+        """
+        with self._lock:
+            delay = self.latency + self._random.uniform(-self.jitter, self.jitter)
+            draw = self._random.random()
+
+        if delay > 0:
+            time.sleep(delay)
+
+        if draw < self.throttle_rate:
+            status, body = 429, {'message': 'Too Many Requests'}
+            headers = {'Retry-After': str(self.retry_after)}
+        elif draw < self.throttle_rate + self.error_rate:
+            with self._lock:
+                status = self._random.choice(ERRORS)
+            body, headers = {'message': 'Server error'}, {}
+        else:
+            return None
+
+        with self._lock:
+            self.faults[status] = self.faults.get(status, 0) + 1
+
+        return status, body, headers
+
+    def _recorded(self, path, query):
+        key = _key(path, query)
+        if key in self.responses:
+            return self.responses[key]
+
+        return self.responses.get(_key(path, {}))
+
+    def _game(self, match):
+        return self.feeds.get(int(match.group(1)))
+
+    def _feed(self, match, query):
+        feed = self._game(match)
+        if feed is None:
+            return 404, {'message': 'Game data couldn\'t be found'}
+
+        return 200, self._snapshot(feed, self.visible(feed['gamePk']))
+
+    def _diff(self, match, query):
+        feed = self._game(match)
+        if feed is None:
+            return 404, {'message': 'Game data couldn\'t be found'}
+
+        try:
+            start = _plays_at(query['startTimecode'][0])
+        except (KeyError, ValueError):
+            return 400, {'message': 'Invalid startTimecode'}
+
+        k = self.visible(feed['gamePk'])
+        if start >= k:
+            return 200, []
+
+        snapshot = self._snapshot(feed, k)
+        plays = snapshot['liveData']['plays']
+        teams = snapshot['liveData']['linescore']['teams']
+
+        diff = [{'op': 'add', 'path': f'/liveData/plays/allPlays/{i}',
+                 'value': plays['allPlays'][i]} for i in range(start, k)]
+        diff += [{'op': 'replace', 'path': '/liveData/plays/currentPlay',
+                  'value': plays['currentPlay']},
+                 {'op': 'replace', 'path': '/metaData/timeStamp',
+                  'value': snapshot['metaData']['timeStamp']},
+                 {'op': 'replace', 'path': '/gameData/status',
+                  'value': snapshot['gameData']['status']},
+                 {'op': 'replace', 'path': '/liveData/linescore/teams/home/goals',
+                  'value': teams['home']['goals']},
+                 {'op': 'replace', 'path': '/liveData/linescore/teams/away/goals',
+                  'value': teams['away']['goals']}]
+
+        return 200, [{'diff': diff}]
+
+    def _boxscore(self, match, query):
+        feed = self._game(match)
+        if feed is None:
+            return 404, {'message': 'Game data couldn\'t be found'}
+
+        return 200, feed['liveData']['boxscore']
+
+    def _schedule(self, match, query):
+        # every game of the feeds, filtered as the api does, with its status
+        # and score as currently replayed
+        season = query.get('season', [None])[0]
+        start = query.get('startDate', [None])[0]
+        end = query.get('endDate', [None])[0]
+        team_ids = {int(t) for value in query.get('teamId', []) for t in value.split(',')}
+        game_types = {t for value in query.get('gameType', []) for t in value.split(',')}
+
+        dates = {}
+        for game_id, feed in self.feeds.items():
+            game_data = feed['gameData']
+            date = game_data['datetime']['dateTime'][:10]
+            teams = {side: game_data['teams'][side] for side in ['home', 'away']}
+            if ((season and str(game_data['game'].get('season')) != season)
+                    or (start and date < start) or (end and date > end)
+                    or (team_ids and not team_ids & {team['id'] for team in teams.values()})
+                    or (game_types and game_data['game'].get('type') not in game_types)):
+                continue
+
+            status, goals = _state(feed, self.visible(game_id))
+            dates.setdefault(date, []).append({
+                'gamePk': game_id, 'link': f'{self.prefix}/game/{game_id}/feed/live',
+                'gameType': game_data['game'].get('type'),
+                'season': game_data['game'].get('season'),
+                'gameDate': game_data['datetime']['dateTime'], 'status': status,
+                'teams': {side: {'team': team, 'score': goals[side]}
+                          for side, team in teams.items()}})
+
+        dates = [{'date': date, 'totalGames': len(games), 'games': games}
+                 for date, games in sorted(dates.items())]
+
+        return 200, {'totalGames': sum(date['totalGames'] for date in dates), 'dates': dates}
+
+    def _team(self, record, query):
+        team = {'id': record['id'], 'name': record['name'],
+                'link': f"{self.prefix}/teams/{record['id']}",
+                'abbreviation': record['abbreviation'], 'teamName': record['team_name'],
+                'locationName': record['location'],
+                'firstYearOfPlay': record['first_season'][:4],
+                'division': {'name': record['division']},
+                'conference': {'name': record['conference']},
+                'active': record['last_season'] is None}
+        if 'team.roster' in ','.join(query.get('expand', [])):
+            roster = self._recorded(f"/teams/{record['id']}/roster", {}) or {'roster': []}
+            team['roster'] = {'roster': roster['roster']}
+
+        return team
+
+    def _teams(self, match, query):
+        # team metadata comes from the registry
+        from nhl import registry
+
+        if match.group(1) is not None:
+            try:
+                records = [registry.get(int(match.group(1)))]
+            except KeyError:
+                return 404, {'message': 'Object not found'}
+        elif 'season' in query:
+            records = registry.teams(active=False, season=query['season'][0])
+        else:
+            records = registry.teams()
+
+        return 200, {'teams': [self._team(record, query) for record in records]}
+
+    def _roster(self, match, query):
+        # only recorded rosters are known
+        return 200, {'roster': []}
+
+    def _stats(self, match, query):
+        # only recorded stats are known; anyone else has no splits
+        report_type = query.get('stats', ['statsSingleSeason'])[0]
+        return 200, {'stats': [{'type': {'displayName': report_type}, 'splits': []}]}
+
+    def _season(self, match, query):
+        # the latest season of the feeds
+        seasons = [str(feed['gameData']['game'].get('season')) for feed in self.feeds.values()]
+        seasons = [season for season in seasons if season != 'None']
+        if not seasons:
+            return 404, {'message': 'Object not found'}
+
+        return 200, {'seasons': [{'seasonId': max(seasons)}]}
+
+    def _snapshot(self, feed, k):
+        # the feed as it looked with only its first k plays
+        live = feed['liveData']
+        plays = live['plays']['allPlays']
+        status, goals = _state(feed, k)
+        current = plays[k - 1] if k else {}
+        linescore = live['linescore']
+        teams = {side: {**linescore['teams'][side], 'goals': goals[side]}
+                 for side in ['home', 'away']}
+
+        snapshot_plays = {**live['plays'], 'allPlays': plays[:k], 'currentPlay': current}
+        for key in ['scoringPlays', 'penaltyPlays']:
+            snapshot_plays[key] = [i for i in live['plays'].get(key, []) if i < k]
+
+        return {**feed,
+                'metaData': {**feed.get('metaData', {}), 'timeStamp': _timecode(k)},
+                'gameData': {**feed['gameData'], 'status': status},
+                'liveData': {**live, 'plays': snapshot_plays,
+                             'linescore': {**linescore, 'teams': teams}}}
+
+
+def _state(feed, k):
+    # (status, goals) of a feed showing only its first k plays
+    plays = feed['liveData']['plays']['allPlays']
+
+    status = feed['gameData']['status']
+    if k < len(plays):
+        status = {**status, 'abstractGameState': 'Live', 'codedGameState': '3',
+                  'detailedState': 'In Progress', 'statusCode': '3'}
+
+    current = plays[k - 1] if k else {}
+    goals = current.get('about', {}).get('goals', {'home': 0, 'away': 0})
+
+    return status, goals
+
+
+def _key(path, query):
+    # lookup key of a request (the query either a string or parsed)
+    if isinstance(query, str):
+        query = parse_qs(query)
+
+    return path, tuple(sorted((name, tuple(values)) for name, values in query.items()))
+
+
+def _timecode(k):
+    return (_EPOCH + datetime.timedelta(seconds=k)).strftime(_TIMECODE)
+
+
+def _plays_at(timecode):
+    # inverse of _timecode
+    delta = datetime.datetime.strptime(timecode, _TIMECODE) - _EPOCH
+
+    return int(delta.total_seconds())
+
+
+def _handler(server):
+
+    class Handler(BaseHTTPRequestHandler):
+
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            fault = server.fault()
+            if fault is not None:
+                status, body, headers = fault
+            else:
+                status, body = server.handle(url.path, parse_qs(url.query))
+                headers = {}
+
+            data = json.dumps(body).encode('utf-8')
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
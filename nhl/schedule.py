@@ -0,0 +1,156 @@
+# schedule.py
+"""
+In-memory index over a league-wide schedule.
+
+A single /schedule request (without a teamId) returns every game of a season (or
+of a date range). ScheduleIndex organizes those games by team, date, game type
+and status, so any team's schedule or list of game ids is a dictionary lookup
+instead of another request.
+"""
+from nhl import registry
+
+
+class ScheduleIndex:
+
+    def __init__(self, dates):
+        """
+        Index over the games of a league-wide schedule.
+
+        Parameters
+        ----------
+        dates : list(dicts)
+            The 'dates' list of a /schedule response (see the bottom of
+            nhl/api.py for its structure).
+
+        Attributes
+        ----------
+        games : list(dicts)
+            Every game in the schedule, in date order.
+
+        by_id : dict
+            Maps game id (gamePk) to position in self.games.
+
+        by_team : dict
+            Maps team id (int) to the positions of the team's games.
+
+        by_date : dict
+            Maps date ('YYYY-MM-DD') to the positions of that day's games.
+
+        by_type : dict
+            Maps game type ('PR', 'R', 'P', 'A') to the positions of those games.
+
+        by_status : dict
+            Maps detailed game state ('Final', 'Scheduled', ...) to the positions
+            of those games.
+        """
+        self.games = []
+        self.dates = []
+        self.by_id = {}
+        self.by_team = {}
+        self.by_date = {}
+        self.by_type = {}
+        self.by_status = {}
+
+        for date in dates:
+            for game in date['games']:
+                pos = len(self.games)
+                self.games.append(game)
+                self.dates.append(date['date'])
+
+                self.by_id[game['gamePk']] = pos
+                for side in ['home', 'away']:
+                    team_id = game['teams'][side]['team']['id']
+                    self.by_team.setdefault(team_id, []).append(pos)
+                self.by_date.setdefault(date['date'], []).append(pos)
+                self.by_type.setdefault(game['gameType'], []).append(pos)
+                status = game['status']['detailedState']
+                self.by_status.setdefault(status, []).append(pos)
+
+    def __len__(self):
+        return len(self.games)
+
+    @property
+    def final(self):
+        """
+        True if every game in the schedule has been completed.
+        """
+        return len(self.games) > 0 and len(self.by_status.get('Final', [])) == len(self.games)
+
+    def positions(self, team_id=None, include_pre=False, include_post=False,
+                  include_future=True):
+        """
+        Positions (in self.games) of the games matching the filters; see
+        schedule for the parameters.
+        """
+        if team_id is None:
+            positions = range(len(self.games))
+        else:
+            positions = self.by_team.get(registry.resolve(team_id), [])
+
+        # filter out preseason/postseason/future games based on parameters
+        excluded = set()
+        if not include_pre:
+            excluded.update(self.by_type.get('PR', []))
+        if not include_post:
+            excluded.update(self.by_type.get('P', []))
+        if not include_future:
+            final = set(self.by_status.get('Final', []))
+            excluded.update(pos for pos in positions if pos not in final)
+
+        return [pos for pos in positions if pos not in excluded]
+
+    def schedule(self, team_id=None, include_pre=False, include_post=False,
+                 include_future=True):
+        """
+        Returns a schedule in the same format as nhl.api.getSchedule, i.e. one
+        'dates' entry per game.
+
+        Parameters
+        ----------
+        team_id : str or int (default : None)
+            Team's NHL API id number, triCode or name (see nhl.registry.resolve);
+            if None, every game in the league.
+
+        include_pre : bool (default: False)
+            Whether to include preseason games.
+
+        include_post : bool (default: False)
+            Whether to include postseason games.
+
+        include_future : bool (default : True)
+            Whether to include future (i.e. unplayed/unfinished) games.
+
+        Returns
+        -------
+        schedule : list(dicts)
+        """
+        positions = self.positions(team_id, include_pre=include_pre,
+                                   include_post=include_post,
+                                   include_future=include_future)
+
+        return [{'date': self.dates[pos], 'totalItems': 1, 'totalEvents': 0,
+                 'totalGames': 1, 'totalMatches': 0, 'games': [self.games[pos]],
+                 'events': [], 'matches': []} for pos in positions]
+
+    def game_ids(self, team_id=None, include_pre=False, include_post=False,
+                 include_future=True):
+        """
+        Returns the game ids (gamePk) matching the filters; see schedule.
+        """
+        positions = self.positions(team_id, include_pre=include_pre,
+                                   include_post=include_post,
+                                   include_future=include_future)
+
+        return [self.games[pos]['gamePk'] for pos in positions]
+
+    def games_on(self, date):
+        """
+        Returns the games played on `date` ('YYYY-MM-DD').
+        """
+        return [self.games[pos] for pos in self.by_date.get(date, [])]
+
+    def game(self, game_id):
+        """
+        Returns the schedule entry of game `game_id`.
+        """
+        return self.games[self.by_id[int(game_id)]]
@@ -0,0 +1,205 @@
+# schema.py
+"""
+Compact, typed schema for the event tables built by Game.makeDataFrames (shots,
+hits, penalties, turnovers and the full event table).
+
+    categorical     -   event, secondary type (shot type / penalty), player roles,
+                        team triCodes and player names (interned once per table)
+    int8            -   period, home/away goals
+    int16           -   team ids
+    int32           -   game id
+    Int32           -   player ids (nullable; no more float promotion)
+    float32         -   x, y
+    datetime64      -   date
+
+Columns renamed by makeDataFrames(relabel=True) (e.g. 'penalty_on', 'hitter_id')
+get the type of the column they were renamed from.
+"""
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+
+# every event kept by nhl.parse.extract_events
+EVENTS = ['faceoff', 'hit', 'giveaway', 'takeaway', 'shot', 'missed_shot',
+          'blocked_shot', 'goal', 'penalty']
+
+# every team triCode, past and present
+TEAMS = ['ANA', 'ARI', 'ATL', 'BOS', 'BUF', 'CAR', 'CBJ', 'CGY', 'CHI', 'COL',
+         'DAL', 'DET', 'EDM', 'FLA', 'LAK', 'MIN', 'MTL', 'NJD', 'NSH', 'NYI',
+         'NYR', 'OTT', 'PHI', 'PHX', 'PIT', 'SEA', 'SJS', 'STL', 'TBL', 'TOR',
+         'UTA', 'VAN', 'VGK', 'WPG', 'WSH']
+
+ROLES = ['Assist', 'Blocker', 'DrewBy', 'Goalie', 'Hittee', 'Hitter', 'Loser',
+         'PenaltyOn', 'PlayerID', 'Scorer', 'ServedBy', 'Shooter', 'Unknown', 'Winner']
+
+# (name column, id column) pairs, including relabeled names
+PLAYER_COLUMNS = [('player_one', 'player_one_id'), ('player_two', 'player_two_id'),
+                  ('penalty_on', 'penalty_on_id'), ('drew_by', 'drew_by_id'),
+                  ('hitter', 'hitter_id'), ('hittee', 'hittee_id')]
+
+# column -> dtype; 'category' columns have open-ended categories, lists are fixed
+# categories (extended if a value outside of them shows up)
+COLUMN_TYPES = {
+    'event': EVENTS,
+    'secondary_type': 'category',
+    'penalty': 'category',
+    'player_one_role': ROLES,
+    'player_two_role': ROLES,
+    'x': 'float32',
+    'y': 'float32',
+    'period': 'int8',
+    'home_goals': 'int8',
+    'away_goals': 'int8',
+    'home_team_id': 'int16',
+    'away_team_id': 'int16',
+    'game_id': 'int32',
+    'game_winning': 'boolean',
+    'empty_net': 'boolean',
+    'date': 'datetime64[ns]',
+}
+for _column in ['player_one_team', 'player_two_team', 'home_team', 'away_team',
+                'winning_team', 'penalty_team', 'drew_by_team', 'hitter_team',
+                'hittee_team', 'other_team']:
+    COLUMN_TYPES[_column] = TEAMS
+for _name, _id in PLAYER_COLUMNS:
+    COLUMN_TYPES[_name] = 'category'
+    COLUMN_TYPES[_id] = 'Int32'
+
+
+def _categorical(values, categories):
+    # fixed categories keep tables from different games directly comparable;
+    # anything unexpected extends them rather than silently becoming NaN
+    values = pd.Series(values)
+    seen = set(values.dropna().unique())
+    if not seen.issubset(categories):
+        categories = sorted(set(categories) | seen)
+
+    return values.astype(pd.CategoricalDtype(categories))
+
+
+def to_schema(df):
+    """
+    Converts every known column of an event table to its compact type (see
+    COLUMN_TYPES). Unknown columns are left alone.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+
+    Returns
+    -------
+    df : pd.DataFrame
+        New DataFrame with the same index and columns.
+    """
+    df = df.copy()
+    for column, dtype in COLUMN_TYPES.items():
+        if column not in df.columns:
+            continue
+        if isinstance(dtype, list):
+            df[column] = _categorical(df[column].values, dtype).values
+        elif dtype == 'Int32' and df[column].dtype != 'Int32':
+            # float ids (NaN for missing) -> nullable integers
+            df[column] = pd.array(df[column].to_numpy(dtype='float64'), dtype='Int32')
+        elif dtype == 'datetime64[ns]':
+            df[column] = pd.to_datetime(df[column])
+        else:
+            df[column] = df[column].astype(dtype)
+
+    return df
+
+
+def concat(frames, **kwargs):
+    """
+    Concatenates event tables, keeping categorical columns categorical even when
+    the tables' categories differ (pd.concat would fall back to object).
+
+    Parameters
+    ----------
+    frames : list of pd.DataFrame
+        Tables with the same columns (e.g. one shot table per game).
+
+    **kwargs
+        Passed on to pd.concat.
+
+    Returns
+    -------
+    df : pd.DataFrame
+    """
+    frames = list(frames)
+    if not frames:
+        return pd.DataFrame()
+
+    df = pd.concat(frames, **kwargs)
+    for column in frames[0].columns:
+        if not isinstance(frames[0][column].dtype, pd.CategoricalDtype):
+            continue
+        if isinstance(df[column].dtype, pd.CategoricalDtype):
+            continue
+        parts = [frame[column] for frame in frames
+                 if isinstance(frame[column].dtype, pd.CategoricalDtype)]
+        if len(parts) == len(frames):
+            # all-missing columns have no categories (of whatever dtype); skip them
+            parts = [part for part in parts if len(part.cat.categories)] or parts[:1]
+            categories = union_categoricals(parts, sort_categories=True).categories
+            df[column] = df[column].astype(pd.CategoricalDtype(categories))
+
+    return df
+
+
+def player_names(df):
+    """
+    Builds the interned {player id: name} dictionary of an event table.
+
+    Parameters
+    ----------
+    df : pd.DataFrame
+        Event table with (some of) the name/id columns in PLAYER_COLUMNS.
+
+    Returns
+    -------
+    names : dict
+    """
+    names = {}
+    for name, id_ in PLAYER_COLUMNS:
+        if name not in df.columns or id_ not in df.columns:
+            continue
+        pairs = df[[id_, name]].dropna().drop_duplicates(id_)
+        names.update(zip(pairs[id_].astype('int64'), pairs[name].astype(str)))
+
+    return names
+
+
+def read_legacy_csv(path, **kwargs):
+    """
+    Reads an event table saved as csv by the original makeDataFrames (e.g.
+    data/all_penalties.csv or data/by_team/TOR/TOR_shots.csv), splitting the
+    'coords' strings (e.g. '[ 29. -35.]') into x/y columns and converting to
+    the compact schema.
+
+    Parameters
+    ----------
+    path : str
+
+    **kwargs
+        Passed on to pd.read_csv.
+
+    Returns
+    -------
+    df : pd.DataFrame
+    """
+    df = pd.read_csv(path, index_col=0, **kwargs)
+
+    if 'coords' in df.columns:
+        coords = df['coords'].astype('string').str.strip('[]').str.split(expand=True)
+        x = np.full(len(df), np.nan)
+        y = np.full(len(df), np.nan)
+        if coords.shape[1] >= 2:
+            x = pd.to_numeric(coords[0], errors='coerce').to_numpy(dtype='float64')
+            y = pd.to_numeric(coords[1], errors='coerce').to_numpy(dtype='float64')
+
+        loc = df.columns.get_loc('coords')
+        df = df.drop(columns='coords')
+        df.insert(loc, 'x', x)
+        df.insert(loc + 1, 'y', y)
+
+    return to_schema(df)
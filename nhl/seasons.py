@@ -0,0 +1,214 @@
+# seasons.py
+"""
+Resolves the current NHL season.
+
+Every function that defaults to the current season goes through a single,
+process-wide SeasonResolver, so the /seasons/current endpoint is requested at
+most once per `ttl` seconds no matter how many teams/players/games are looped
+over. The resolver can optionally use the offline season calendar below, in
+which case no request is made at all (seasons after the calendar's last one are
+derived from the date).
+"""
+import datetime
+import threading
+import time
+
+# (first day of the regular season, last day of the season - i.e. the final
+# game of the Stanley Cup Final) for each season; for seasons not over yet, the
+# last day is the latest the Final is scheduled to end
+SEASON_DATES = {
+    '20052006': ('2005-10-05', '2006-06-19'),
+    '20062007': ('2006-10-04', '2007-06-06'),
+    '20072008': ('2007-09-29', '2008-06-04'),
+    '20082009': ('2008-10-04', '2009-06-12'),
+    '20092010': ('2009-10-01', '2010-06-09'),
+    '20102011': ('2010-10-07', '2011-06-15'),
+    '20112012': ('2011-10-06', '2012-06-11'),
+    '20122013': ('2013-01-19', '2013-06-24'),
+    '20132014': ('2013-10-01', '2014-06-13'),
+    '20142015': ('2014-10-08', '2015-06-15'),
+    '20152016': ('2015-10-07', '2016-06-12'),
+    '20162017': ('2016-10-12', '2017-06-11'),
+    '20172018': ('2017-10-04', '2018-06-07'),
+    '20182019': ('2018-10-03', '2019-06-12'),
+    '20192020': ('2019-10-02', '2020-09-28'),
+    '20202021': ('2021-01-13', '2021-07-07'),
+    '20212022': ('2021-10-12', '2022-06-26'),
+    '20222023': ('2022-10-07', '2023-06-13'),
+    '20232024': ('2023-10-10', '2024-06-24'),
+    '20242025': ('2024-10-04', '2025-06-17'),
+    '20252026': ('2025-10-07', '2026-06-30'),
+    '20262027': ('2026-10-06', '2027-06-30'),
+}
+
+# month from which a season after the calendar's last one is expected to have
+# started (seasons run from October to June)
+SEASON_START_MONTH = 9
+
+
+def season_for_date(date, calendar=SEASON_DATES):
+    """
+    Finds the season that is "current" on `date` according to `calendar`.
+
+    As with the NHL API, during the offseason the most recently completed season
+    is considered current. Past the calendar's last season, that season stays
+    current until SEASON_START_MONTH of the year it ended; from then on the
+    season is derived from the date (seasons run from October to June).
+
+    Parameters
+    ----------
+    date : str ('YYYY-MM-DD') or datetime.date
+
+    calendar : dict (default : SEASON_DATES)
+        Maps season ('YYYYYYYY') to a (start_date, end_date) pair.
+
+    Returns
+    -------
+    season : str ('YYYYYYYY') or None
+        None if `date` is before the first season in the calendar (or the
+        calendar is empty), in which case the calendar can't tell.
+    """
+    date = str(date)[:10]
+
+    current = None
+    for season, (start, end) in sorted(calendar.items(), key=lambda item: item[1]):
+        if date < start:
+            # offseason before `season`; the previous season is still current
+            return current
+        current = season
+        if date <= end:
+            return season
+
+    if current is None:
+        return None
+
+    # after the end of the last season we know about: it is current until the
+    # next one is expected to start, after which the date tells the season
+    year, month = int(date[:4]), int(date[5:7])
+    if (year, month) < (int(current[4:]), SEASON_START_MONTH):
+        return current
+    if month < SEASON_START_MONTH:
+        year -= 1
+
+    return f'{year}{year + 1}'
+
+
+class SeasonResolver:
+
+    def __init__(self, ttl=6*3600, calendar=None):
+        """
+        Time-bounded, thread-safe resolver for the current season.
+
+        Parameters
+        ----------
+        ttl : float (default : 6 hours)
+            Number of seconds the current season is remembered before it is
+            looked up again.
+
+        calendar : dict (default : None)
+            Offline season calendar (see SEASON_DATES). If given, the current
+            season is taken from the calendar and the API is only queried when
+            the calendar can't tell.
+        """
+        self.ttl = ttl
+        self.calendar = calendar
+
+        # maps base url -> (season, time it was resolved)
+        self._seasons = {}
+        self._lock = threading.Lock()
+
+    def current(self, base_url=None, client=None):
+        """
+        Returns the current season ('YYYYYYYY').
+
+        Parameters
+        ----------
+        base_url : str (default : None)
+            Base url to the NHL API; defaults to the client's base url.
+
+        client : nhl.client.NhlClient (default : None)
+            Client to make requests with; defaults to the module-wide client.
+        """
+        from nhl import api
+
+        if client is None:
+            client = api.get_client()
+        key = client.url('', base_url)
+
+        # the lock also ensures concurrent callers trigger only one request
+        with self._lock:
+            now = time.monotonic()
+            if key in self._seasons:
+                season, resolved = self._seasons[key]
+                if now - resolved < self.ttl:
+                    return season
+
+            season = None
+            if self.calendar is not None:
+                season = season_for_date(datetime.date.today(), self.calendar)
+
+            if season is None:
+                season = api._get('/seasons/current', base_url, client)['seasons']
+                season = season[0]['seasonId']
+
+            self._seasons[key] = (season, now)
+
+        return season
+
+    def resolve(self, season, base_url=None, client=None):
+        """
+        Returns `season` unchanged, unless it is None, in which case the current
+        season is returned.
+        """
+        if season is None:
+            return self.current(base_url=base_url, client=client)
+
+        return season
+
+    def clear(self):
+        """
+        Forgets every resolved season.
+        """
+        with self._lock:
+            self._seasons.clear()
+
+
+# resolver shared by the whole package
+_resolver = SeasonResolver()
+
+
+def get_resolver():
+    """
+    Returns the process-wide SeasonResolver.
+    """
+    return _resolver
+
+
+def set_resolver(resolver):
+    """
+    Sets the process-wide SeasonResolver, e.g. SeasonResolver(calendar=SEASON_DATES)
+    to resolve the current season offline.
+
+    Returns
+    -------
+    previous : SeasonResolver
+        The resolver that was previously in use.
+    """
+    global _resolver
+    previous, _resolver = _resolver, resolver
+
+    return previous
+
+
+def current_season(base_url=None, client=None):
+    """
+    Returns the current season ('YYYYYYYY') from the process-wide resolver.
+    """
+    return _resolver.current(base_url=base_url, client=client)
+
+
+def resolve_season(season, base_url=None, client=None):
+    """
+    Returns `season`, or the current season if `season` is None.
+    """
+    return _resolver.resolve(season, base_url=base_url, client=client)
@@ -0,0 +1,361 @@
+# store.py
+"""
+Partitioned, compressed columnar store for event and game tables.
+
+Every event is written exactly once (instead of once under each team, like the
+old data/by_team csv tree), as parquet files partitioned by table and season:
+
+    root/
+        shots/season=20192020/part-<id>.parquet
+        hits/season=20192020/...
+        penalties/...
+        turnovers/...
+        games/...           (one row per team per game, i.e. Game.agg_stats)
+
+Reads only touch the partitions, columns and row groups they need: `columns`
+projects, and the `season`, `team`, `game_id`, `player_id` and `date` filters
+are pushed down into the parquet scan. A team's view of a table is just a read
+filtered on home_team/away_team.
+"""
+import os
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from nhl import schema
+
+TABLES = ['shots', 'hits', 'penalties', 'turnovers', 'games']
+
+# partition directories are named season=YYYYYYYY
+_partitioning = ds.partitioning(pa.schema([('season', pa.string())]), flavor='hive')
+
+
+def season_of(game_id):
+    """
+    Returns the season ('YYYYYYYY') a game id (YYYYTTNNNN) belongs to.
+    """
+    year = int(str(game_id)[:4])
+
+    return f'{year}{year + 1}'
+
+
+def game_tables(game):
+    """
+    Returns {table: DataFrame} with every table of a nhl.game.Game (each built
+    from the game's event table on first access).
+    """
+    return {'shots': game.shot_data, 'hits': game.hit_data,
+            'penalties': game.penalty_data, 'turnovers': game.turnover_data,
+            'games': game.agg_stats.assign(game_id=int(game.game_id))}
+
+
+class EventStore:
+
+    def __init__(self, root, compression='zstd'):
+        """
+        Columnar store for event and game tables.
+
+        Parameters
+        ----------
+        root : str
+            Directory the store lives in; created if it does not exist.
+
+        compression : str (default : 'zstd')
+            Parquet compression codec.
+        """
+        self.root = os.path.expanduser(root)
+        self.compression = compression
+
+        os.makedirs(self.root, exist_ok=True)
+
+    def _check(self, table):
+        if table not in TABLES:
+            raise ValueError(f'unknown table {table!r}; must be one of {TABLES}')
+
+    def _stage(self, table, df, name):
+        # writes `df` (split by season) under temporary names; returns the
+        # (temporary path, final path) pairs
+        self._check(table)
+        if df.empty:
+            return []
+
+        df = schema.to_schema(df)
+        seasons = df['game_id'].map(season_of)
+
+        staged = []
+        for season, part in df.groupby(seasons.values, sort=True):
+            directory = os.path.join(self.root, table, f'season={season}')
+            os.makedirs(directory, exist_ok=True)
+
+            tmp = os.path.join(directory, '.' + name + '.tmp')
+            pq.write_table(pa.Table.from_pandas(part, preserve_index=True), tmp,
+                           compression=self.compression)
+            staged.append((tmp, os.path.join(directory, name)))
+
+        return staged
+
+    def write(self, table, df):
+        """
+        Appends `df` to `table`, split into one new file per season.
+
+        Each file is written under a temporary name and then renamed, so readers
+        never see partially written data.
+
+        Parameters
+        ----------
+        table : str
+            One of TABLES.
+
+        df : pd.DataFrame
+            Rows to append; must have a game_id column.
+
+        Returns
+        -------
+        files : list(str)
+            Paths of the files written.
+        """
+        staged = self._stage(table, df, f'part-{uuid.uuid4().hex}.parquet')
+        for tmp, file in staged:
+            os.replace(tmp, file)
+
+        return [file for _, file in staged]
+
+    def write_batch(self, tables):
+        """
+        Appends rows to several tables as a single batch.
+
+        Every file is fully written before any of them is moved into place, and
+        the games table is moved last; a batch whose games rows are missing (i.e.
+        one interrupted part way through) is removed by recover.
+
+        Parameters
+        ----------
+        tables : dict
+            Maps table name to the DataFrame to append; must include 'games'.
+
+        Returns
+        -------
+        files : list(str)
+            Paths of the files written.
+        """
+        if 'games' not in tables:
+            raise ValueError("a batch must include the 'games' table")
+
+        name = f'batch-{uuid.uuid4().hex}.parquet'
+        staged = {table: self._stage(table, df, name) for table, df in tables.items()}
+
+        files = []
+        for table in sorted(staged, key=lambda table: table == 'games'):
+            for tmp, file in staged[table]:
+                os.replace(tmp, file)
+                files.append(file)
+
+        return files
+
+    def write_game(self, game):
+        """
+        Appends every table of a nhl.game.Game as a single batch.
+
+        Returns
+        -------
+        files : list(str)
+            Paths of the files written.
+        """
+        return self.write_batch(game_tables(game))
+
+    def recover(self):
+        """
+        Removes leftovers of interrupted writes: temporary files, and files of
+        batches that never had their games rows moved into place.
+
+        Returns
+        -------
+        removed : list(str)
+            Paths of the files removed.
+        """
+        committed = set()
+        games = os.path.join(self.root, 'games')
+        for _, _, names in os.walk(games):
+            committed.update(n for n in names if n.startswith('batch-'))
+
+        removed = []
+        for table in TABLES:
+            for directory, _, names in os.walk(os.path.join(self.root, table)):
+                for name in names:
+                    stale = name.endswith('.tmp')
+                    stale |= name.startswith('batch-') and name not in committed
+                    if stale:
+                        os.remove(os.path.join(directory, name))
+                        removed.append(os.path.join(directory, name))
+
+        return removed
+
+    def dataset(self, table):
+        """
+        Returns the pyarrow dataset of `table` (None if nothing was written yet).
+        """
+        self._check(table)
+        path = os.path.join(self.root, table)
+        if not os.path.isdir(path):
+            return None
+
+        return ds.dataset(path, format='parquet', partitioning=_partitioning,
+                          exclude_invalid_files=True)
+
+    def _filter(self, dataset, season=None, team=None, game_id=None, player_id=None,
+                date=None):
+        names = set(dataset.schema.names)
+        conditions = []
+
+        if season is not None:
+            seasons = [season] if isinstance(season, (str, int)) else season
+            conditions.append(ds.field('season').isin([str(s) for s in seasons]))
+
+        if team is not None:
+            teams = [team] if isinstance(team, str) else list(team)
+            columns = [c for c in ['home_team', 'away_team', 'team'] if c in names]
+            conditions.append(_any([ds.field(c).isin(teams) for c in columns]))
+
+        if game_id is not None:
+            game_ids = [game_id] if isinstance(game_id, (str, int)) else game_id
+            conditions.append(ds.field('game_id').isin([int(g) for g in game_ids]))
+
+        if player_id is not None:
+            player_ids = [player_id] if isinstance(player_id, (str, int)) else player_id
+            player_ids = [int(p) for p in player_ids]
+            columns = [id_ for _, id_ in schema.PLAYER_COLUMNS if id_ in names]
+            conditions.append(_any([ds.field(c).isin(player_ids) for c in columns]))
+
+        if date is not None:
+            if isinstance(date, str):
+                start = end = date
+            else:
+                start, end = date
+            conditions.append(ds.field('date') >= pd.Timestamp(start).to_pydatetime())
+            conditions.append(ds.field('date') <= pd.Timestamp(end).to_pydatetime())
+
+        expression = None
+        for condition in conditions:
+            expression = condition if expression is None else expression & condition
+
+        return expression
+
+    def read(self, table, columns=None, season=None, team=None, game_id=None,
+             player_id=None, date=None):
+        """
+        Reads (part of) a table.
+
+        Parameters
+        ----------
+        table : str
+            One of TABLES.
+
+        columns : list(str) (default : None)
+            Columns to read; None reads every column.
+
+        season : str or list(str) (default : None)
+            Season(s) to read; only those partitions are opened.
+
+        team : str or list(str) (default : None)
+            Team triCode(s); keeps rows where any of them is home or away.
+
+        game_id : int or list(int) (default : None)
+            Game id(s) to keep.
+
+        player_id : int or list(int) (default : None)
+            Player id(s); keeps rows where any player id column matches.
+
+        date : str or (str, str) (default : None)
+            Date ('YYYY-MM-DD') or inclusive (start, end) range to keep.
+
+        Returns
+        -------
+        df : pd.DataFrame
+            Empty if nothing matches (or nothing was written yet).
+        """
+        dataset = self.dataset(table)
+        if dataset is None:
+            return pd.DataFrame(columns=columns)
+
+        expression = self._filter(dataset, season=season, team=team, game_id=game_id,
+                                  player_id=player_id, date=date)
+
+        if columns is not None:
+            # keep the stored index (if any) alongside the requested columns
+            columns = list(columns) + [c for c in dataset.schema.names
+                                       if c.startswith('__index_level_')]
+
+        data = dataset.to_table(columns=columns, filter=expression)
+
+        # column types (categoricals etc.) are restored from the stored metadata
+        return data.to_pandas()
+
+    def team(self, team, table, **kwargs):
+        """
+        Returns `team`'s view of `table`; same as read(table, team=team, ...).
+        """
+        return self.read(table, team=team, **kwargs)
+
+    def game_ids(self, season=None):
+        """
+        Returns the set of game ids stored in any table (games imported by
+        import_by_team only have event rows).
+        """
+        game_ids = set()
+        for table in TABLES:
+            df = self.read(table, columns=['game_id'], season=season)
+            game_ids.update(int(g) for g in df['game_id'].dropna().unique())
+
+        return game_ids
+
+    def import_by_team(self, by_team_root='data/by_team'):
+        """
+        Imports a data/by_team/<TEAM>/<TEAM>_<table>.csv tree (written by the
+        original data_extraction notebook), writing every event once.
+
+        Events appear under both the home and the away team in that tree; they
+        are deduplicated on (game_id, row index).
+
+        Parameters
+        ----------
+        by_team_root : str (default : 'data/by_team')
+
+        Returns
+        -------
+        counts : dict
+            Number of rows written to each table.
+        """
+        counts = {}
+        # the tree's game time series files have no game id to partition on, so
+        # only the event tables are imported (game_ids still sees these games)
+        for table in ['shots', 'hits', 'penalties', 'turnovers']:
+            frames = []
+            for team in sorted(os.listdir(by_team_root)):
+                path = os.path.join(by_team_root, team, f'{team}_{table}.csv')
+                if os.path.exists(path):
+                    frames.append(schema.read_legacy_csv(path))
+            if not frames:
+                continue
+
+            df = schema.concat(frames)
+            df = df[~pd.Series(list(zip(df['game_id'], df.index))).duplicated().values]
+
+            self.write(table, df)
+            counts[table] = len(df)
+
+        return counts
+
+
+def _any(conditions):
+    if not conditions:
+        # none of the columns exist in the table; nothing can match
+        return ds.scalar(False)
+
+    expression = conditions[0]
+    for condition in conditions[1:]:
+        expression = expression | condition
+
+    return expression
@@ -1,9 +1,73 @@
 # team.py
-from nhl import api
+from nhl import api, registry
+from nhl.seasons import resolve_season
+
+# position codes, forwards first
+POSITIONS = ['C', 'L', 'R', 'D', 'G']
+POSITION_TYPES = ['Forward', 'Defenseman', 'Goalie']
+
+
+def _categories(known, values):
+    # known categories, followed by any others that occur in `values`
+    return known + sorted({value for value in values if value is not None} - set(known))
+
+
+def roster_frame(roster):
+    """
+    Builds a typed table from a roster (see api.getTeamRoster).
+
+    Parameters
+    ----------
+    roster : list(dicts)
+        The roster entries, as returned by the NHL API.
+
+    Returns
+    -------
+    players : pd.DataFrame
+        Indexed by (id, jersey, position), with columns name and position_type;
+        e.g. players.xs('D', level='position') are the defensemen and
+        players.xs(34, level='jersey') the player wearing 34. Positions (and
+        position types) outside of POSITIONS (POSITION_TYPES) are kept as extra
+        categories.
+    """
+    import pandas as pd
+
+    ids = [p['person']['id'] for p in roster]
+    names = [p['person']['fullName'] for p in roster]
+    jerseys = [p.get('jerseyNumber') for p in roster]
+    positions = [p['position']['code'] for p in roster]
+    types = [p['position'].get('type') for p in roster]
+
+    index = pd.MultiIndex.from_arrays([
+        pd.array(ids, dtype='int32'),
+        pd.array(pd.to_numeric(pd.Series(jerseys, dtype=object), errors='coerce'), dtype='Int16'),
+        pd.Categorical(positions, categories=_categories(POSITIONS, positions))],
+        names=['id', 'jersey', 'position'])
+
+    types = pd.Categorical(types, categories=_categories(POSITION_TYPES, types))
+
+    return pd.DataFrame({'name': pd.array(names, dtype='string'), 'position_type': types},
+                        index=index)
+
+
+def load_rosters(season=None, client=None, base_url=None, refresh=False):
+    """
+    Returns the roster table (see roster_frame) of every team in `season`, all
+    from a single request (see api.getLeagueRosters).
+
+    Returns
+    -------
+    rosters : dict
+        Maps team id to the team's roster table.
+    """
+    rosters = api.getLeagueRosters(season, base_url=base_url, client=client, refresh=refresh)
+
+    return {team_id: roster_frame(roster) for team_id, roster in rosters.items()}
+
 
 class Team:
 
-    def __init__(self, team_id='10', season=None):
+    def __init__(self, team_id='10', season=None, client=None, base_url=None, roster=None):
         """
         Class providing an object-oriented approach to working with nhl team data.
 
@@ -13,15 +77,30 @@ class Team:
             If int, must be the NHL API's numeric code for the desired team.
 
             If str, can either be a string of the numeric code, or the team's full
-            name, or the team's three letter abbreviation; case insensitive. See
-            Additional Information for a complete list of active teams and codes.
+            name, or the team's three letter abbreviation; case insensitive (see
+            nhl.registry.resolve). See Additional Information for a complete list
+            of active teams and codes.
 
         season : str (default : None)
             The season to pull the team's roster from; if None, defaults to the
             current season.
 
+        client : nhl.client.NhlClient (default : None)
+            Client to make requests with; defaults to the module-wide client.
+
+        base_url : str (default : None)
+            Base url to the NHL API; defaults to the client's base url.
+
+        roster : list(dicts) (default : None)
+            The team's roster, as returned by the NHL API, if already at hand
+            (see Team.all); otherwise it is requested.
+
         Attributes
         ----------
+        self.players : pd.DataFrame
+            The roster as a table indexed by (id, jersey, position); see
+            roster_frame.
+
         self.roster : list of dicts
             Each dictionary maps a player's name to a tuple (id, number, position).
 
@@ -34,6 +113,10 @@ class Team:
         self.goalies : list of dicts
             Same format as self.roster, but contains exclusively goalies
 
+        self.other : list of dicts
+            Same format as self.roster, for any player whose position code isn't
+            one of POSITIONS
+
 
         Additional Information
         ----------------------
@@ -74,61 +157,52 @@ class Team:
                     | 'Vegas Golden Knights'  |  54  |  VGK  |
                     +-------------------------+------+-------+
         """
-        self._base_url = 'https://statsapi.web.nhl.com/api/v1'
+        self.client = client
+        self._base_url = base_url
         self.season = season
 
-        # case insensitive
-        self._team_map = {
-                        'new jersey devils': 1,         'njd': 1,
-                        'new york islanders': 2,        'nyi': 2,
-                        'new york rangers': 3,          'nyr': 3,
-                        'philadelphia flyers': 4,       'phi': 4,
-                        'pittsburgh penguins': 5,       'pit': 5,
-                        'boston bruins': 6,             'bos': 6,
-                        'buffalo sabres': 7,            'buf': 7,
-                        'montreal canadiens': 8,        'mtl': 8,
-                        'ottawa senators': 9,           'ott': 9,
-                        'toronto maple leafs': 10,      'tor': 10,
-                        'carolina hurricanes': 12,      'car': 12,
-                        'florida panthers': 13,         'fla': 13,
-                        'tampa bay lightning': 14,      'tbl': 14,
-                        'washington capitals': 15,      'wsh': 15,
-                        'chicago blackhawks': 16,       'chi': 16,
-                        'detroit red wings': 17,        'det': 17,
-                        'nashville predators': 18,      'nsh': 18,
-                        'st. louis blues': 19,          'stl': 19,
-                        'calgary flames': 20,           'cgy': 20,
-                        'colorado avalanche': 21,       'col': 21,
-                        'edmonton oilers': 22,          'edm': 22,
-                        'vancouver canucks': 23,        'van': 23,
-                        'anaheim ducks': 24,            'ana': 24,
-                        'dallas stars': 25,             'dal': 25,
-                        'los angeles kings': 26,        'lak': 26,
-                        'san jose sharks': 28,          'sjs': 28,
-                        'columbus blue jackets': 29,    'cbj': 29,
-                        'minnesota wild': 30,           'min': 30,
-                        'winnipeg jets': 52,            'wpg': 52,
-                        'arizona coyotes': 53,          'ari': 53,
-                        'vegas golden knights': 54,     'vgk': 54
-                        }
-
-        # convert teamID to proper format and save as attribute
-        if type(team_id) is int:
-            self.team_id = str(team_id)
-        elif len(team_id) > 2:
-            self.team_id = str(self._team_map[team_id.lower()])
-
-        # request the roster and save as attribute
-        self.roster = api.getTeamRoster(self.team_id, season=self.season,
-                                        base_url=self._base_url)
-        # reformat to be pretty
-        self.roster = [{p['person']['fullName']: (p['person']['id'],
-                        p['jerseyNumber'], p['position']['code'])} for p in self.roster]
-
-        # define forward, defense, and goalie attributes
-        self.offense = [player for player in self.roster if list(player.values())[0][2] in 'LCR']
-        self.defense = [player for player in self.roster if list(player.values())[0][2]=='D']
-        self.goalies = [player for player in self.roster if list(player.values())[0][2]=='G']
+        # any form of team identifier, resolved offline
+        self.team_id = str(registry.resolve(team_id))
+
+        if roster is None:
+            roster = api.getTeamRoster(self.team_id, season=self.season,
+                                       base_url=self._base_url, client=self.client)
+        self.players = roster_frame(roster)
+
+        # the list views, all from a single pass over the roster; jersey numbers
+        # are kept as the API's strings here (e.g. '00', which the table can't tell
+        # from '0')
+        self.roster = []
+        self.offense = []
+        self.defense = []
+        self.goalies = []
+        self.other = []
+        groups = {'C': self.offense, 'L': self.offense, 'R': self.offense,
+                  'D': self.defense, 'G': self.goalies}
+        for p in roster:
+            position = p['position']['code']
+            player = {p['person']['fullName']: (p['person']['id'], p.get('jerseyNumber'),
+                                                position)}
+            self.roster.append(player)
+            groups.get(position, self.other).append(player)
+
+    @classmethod
+    def all(cls, season=None, client=None, base_url=None):
+        """
+        Builds every team of `season` from a single roster request (see
+        load_rosters) instead of one per team.
+
+        Returns
+        -------
+        teams : dict
+            Maps team id to Team.
+        """
+        season = resolve_season(season, base_url=base_url, client=client)
+        rosters = api.getLeagueRosters(season, base_url=base_url, client=client)
+
+        return {team_id: cls(team_id, season=season, client=client, base_url=base_url,
+                             roster=roster)
+                for team_id, roster in rosters.items()}
 
     def getSeasonData(self, season):
         """
@@ -0,0 +1,60 @@
+# test_ingest.py
+import os
+import sys
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+pytest.importorskip('pyarrow')
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'benchmarks'))
+
+from fixtures import Fixtures  # noqa: E402
+from nhl import api  # noqa: E402
+from nhl.client import NhlClient  # noqa: E402
+from nhl.game import Game  # noqa: E402
+from nhl.ingest import ingest_season  # noqa: E402
+from nhl.replay import ReplayServer  # noqa: E402
+from nhl.store import EventStore, game_tables  # noqa: E402
+
+EVENT_TABLES = ['shots', 'hits', 'penalties', 'turnovers']
+
+
+def _write_by_team(root, feeds):
+    # a data/by_team tree as the data_extraction notebook wrote it: every event
+    # under both the home and the away team
+    frames = {}
+    for feed in feeds:
+        game = Game.from_live_data(feed)
+        tables = game_tables(game)
+        for team in [game.home, game.away]:
+            for table in EVENT_TABLES:
+                frames.setdefault((team, table), []).append(tables[table])
+
+    for (team, table), dfs in frames.items():
+        os.makedirs(os.path.join(root, team), exist_ok=True)
+        pd.concat(dfs).to_csv(os.path.join(root, team, f'{team}_{table}.csv'))
+
+
+def test_ingest_after_import_adds_nothing(tmp_path):
+    fixtures = Fixtures.generate(n_games=4, n_teams=4, n_plays=120, pool=4)
+    feeds = [fixtures.feed(game_id) for game_id in fixtures.game_ids]
+    season = str(fixtures.games[0]['season'])
+
+    by_team = str(tmp_path / 'by_team')
+    _write_by_team(by_team, feeds)
+
+    store = EventStore(str(tmp_path / 'store'))
+    counts = store.import_by_team(by_team)
+    assert store.game_ids(season=season) == set(fixtures.game_ids)
+
+    api._schedules.clear()
+    with ReplayServer(feeds, live=False) as server:
+        client = NhlClient(base_url=server.base_url)
+        summary = ingest_season(store, season, client=client)
+
+    assert summary['new'] == []
+    for table in EVENT_TABLES:
+        assert len(store.read(table)) == counts.get(table, 0)